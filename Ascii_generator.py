@@ -11,10 +11,12 @@ from tkinter import filedialog
 from PIL import Image, ImageEnhance
 import tkinter as tk
 import platform
+import Echo_thumbnails
 
 # ---------- CONFIG ----------
 DEFAULT_WIDTH = 700
 DEFAULT_HEIGHT = 1000
+MAX_ART_WIDTH = 250  # Widest setting of the width slider
 
 # --- UPDATE THESE PATHS ---
 DEFAULT_PREVIEW_IMAGE_PATH = os.path.join("Engine_editor", "Icons", "Echo_engine", "Echo_engine_transparent.png")
@@ -137,9 +139,17 @@ def start_conversion():
         show_custom_message("Error", f"Failed to start conversion:\n{e}", is_error=True)
         reset_buttons()
 
+def load_preview_image(image_path):
+    """The default preview comes pre-scaled to the widest art from the thumbnail cache."""
+    if image_path == DEFAULT_PREVIEW_IMAGE_PATH:
+        image = Echo_thumbnails.get_thumbnail(image_path, max_size=(MAX_ART_WIDTH, MAX_ART_WIDTH * 10))
+        if image is not None:
+            return image
+    return Image.open(image_path)
+
 def run_conversion_thread(image_path, style_chars, width, contrast_factor, invert):
     try:
-        image = Image.open(image_path)
+        image = load_preview_image(image_path)
         ascii_art = convert_to_ascii(image, style_chars, width, contrast_factor, invert)
         if ascii_art:
             app.after(0, update_ui_with_result, ascii_art)
@@ -202,7 +212,7 @@ def return_to_hub():
 def initial_conversion_if_default_exists():
     if DEFAULT_PREVIEW_IMAGE_PATH and os.path.exists(DEFAULT_PREVIEW_IMAGE_PATH):
         try:
-            image = Image.open(DEFAULT_PREVIEW_IMAGE_PATH)
+            image = load_preview_image(DEFAULT_PREVIEW_IMAGE_PATH)
             ascii_art = convert_to_ascii(
                 image,
                 ASCII_STYLES["Standard"],
@@ -283,7 +293,7 @@ ctk.CTkLabel(width_container, text="Width (Chars):").pack(side="left", padx=(0,
 def update_width_label(value):
     width_value_label.configure(text=f"{int(value)}")
 
-width_slider = ctk.CTkSlider(width_container, from_=50, to=250, number_of_steps=200, command=update_width_label)
+width_slider = ctk.CTkSlider(width_container, from_=50, to=MAX_ART_WIDTH, number_of_steps=200, command=update_width_label)
 width_slider.set(100)
 width_slider.pack(side="left", fill="x", expand=True)
 width_value_label = ctk.CTkLabel(width_container, text="100", width=30)
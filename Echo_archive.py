@@ -0,0 +1,703 @@
+# Jack Murray
+# Nova Foundry / Echo Archive
+# v1.4.0
+
+import os
+import io
+import bz2
+import json
+import base64
+import time
+import zlib
+import struct
+import hashlib
+import zipfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# ---------- CONFIG ----------
+DEFAULT_JOBS = min(8, os.cpu_count() or 1)
+DEFLATE_LEVEL = 6
+# How many members may be compressed ahead of the writer; bounds memory use
+WINDOW_PER_JOB = 4
+# General purpose flag bit 1: LZMA data carries an end-of-stream marker
+LZMA_EOS_FLAG = 0x02
+# Local file header: fixed 30 bytes, then file name and extra field
+LOCAL_HEADER_SIZE = 30
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+# Shared on-disk caches (export manifests, indexes) live here, relative to the hub
+CACHE_DIR = "Cache"
+EXPORT_MANIFEST_DIR = "Export_manifests"
+EXPORT_MANIFEST_VERSION = 1
+# Incremental export skips reading a file whose size, mtime and (on POSIX) ctime match the
+# last export. utime can restore an mtime but never a ctime; Windows reports creation time
+# as ctime, so there only size and mtime are compared
+TRUST_CTIME = os.name == "posix"
+# Small metadata member stored first in every .echo so tools can peek without extracting
+PROJECT_MANIFEST_NAME = "Echo_manifest.json"
+JOURNAL_SUFFIX = ".journal"  # The editor's crash journals, <name>.journal and its segments <name>.journal.<n>
+PROJECT_MANIFEST_VERSION = 1
+PROJECT_TITLE_PATH = "Text/Misc/Title.txt"
+PROJECT_ICON_PATH = "Icons/Icon.png"
+ROOMS_PREFIX = "Text/Room_descriptions/"
+THUMBNAIL_SIZE = 64
+# Fixed timestamp for the manifest member keeps exports byte-for-byte reproducible
+MANIFEST_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+CRC_INDEX_DIR = "Crc_index"
+CRC_INDEX_VERSION = 1
+CRC_CHUNK_SIZE = 1024 * 1024
+
+# ---------- Compression Policy ----------
+# A policy maps a lowercase file extension to (compress_type, level). "*" is the
+# fallback, and "large_text" (when present) applies to text files of at least
+# LARGE_TEXT_BYTES. Level None means the method's own default.
+STORE = (zipfile.ZIP_STORED, None)
+# Already-compressed media: deflating these wastes CPU for ~0% gain
+PACKED_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".ico", ".mp3", ".ogg", ".zip", ".echo")
+# Shrinks a little, but costs most of the export time
+HEAVY_EXTENSIONS = (".ttf", ".otf", ".wav", ".dll", ".exe", ".pdb")
+TEXT_EXTENSIONS = (".txt", ".json", ".cs", ".csproj", ".md", ".xml", ".cache", ".editorconfig")
+LARGE_TEXT_BYTES = 1024 * 1024
+COMPRESSION_PRESETS = {
+    "fastest": {
+        "*": (zipfile.ZIP_DEFLATED, 1),
+        **{ext: STORE for ext in PACKED_EXTENSIONS + HEAVY_EXTENSIONS},
+    },
+    "balanced": {
+        "*": (zipfile.ZIP_DEFLATED, DEFLATE_LEVEL),
+        **{ext: STORE for ext in PACKED_EXTENSIONS + (".ttf", ".otf", ".wav")},
+        **{ext: (zipfile.ZIP_DEFLATED, 1) for ext in (".dll", ".exe", ".pdb")},
+    },
+    "smallest": {
+        "*": (zipfile.ZIP_DEFLATED, 9),
+        **{ext: STORE for ext in PACKED_EXTENSIONS},
+        "large_text": (zipfile.ZIP_LZMA, None),
+    },
+}
+DEFAULT_PRESET = "balanced"
+
+def make_policy(preset=DEFAULT_PRESET, overrides=None):
+    """Returns a copy of a preset policy with optional {extension: (compress_type, level)} overrides."""
+    if preset not in COMPRESSION_PRESETS:
+        raise ValueError(f"Unknown compression preset '{preset}'. Choose from: {', '.join(COMPRESSION_PRESETS)}")
+    policy = dict(COMPRESSION_PRESETS[preset])
+    for ext, rule in (overrides or {}).items():
+        policy[ext.lower()] = rule
+    return policy
+
+def member_type(arcname):
+    ext = os.path.splitext(arcname)[1].lower()
+    return ext or "(none)"
+
+def choose_compression(arcname, size, policy):
+    ext = os.path.splitext(arcname)[1].lower()
+    if "large_text" in policy and ext in TEXT_EXTENSIONS and size >= LARGE_TEXT_BYTES:
+        return policy["large_text"]
+    return policy.get(ext, policy["*"])
+
+# ---------- Helper Functions ----------
+def is_journal(arcname):
+    """True for an editor journal or journal segment, editor state that never leaves the machine."""
+    name = arcname.rpartition("/")[2]
+    base, _, number = name.rpartition(".")
+    return name.endswith(JOURNAL_SUFFIX) or (number.isdigit() and base.endswith(JOURNAL_SUFFIX))
+
+def remove_journals(root_dir):
+    """Deletes the editor journals under root_dir, after its rooms were replaced from elsewhere,
+    so the editor does not replay edits made to the old rooms on top of the new ones."""
+    for root, dirs, files in os.walk(root_dir):
+        for file in files:
+            if is_journal(file):
+                os.remove(os.path.join(root, file))
+
+def collect_members(source_dir):
+    """Returns (full_path, arcname) pairs for every file under source_dir, in archive order.
+
+    The project manifest and editor journals are left out."""
+    members = []
+    for root, dirs, files in os.walk(source_dir):
+        dirs.sort()
+        for file in sorted(files):
+            full_path = os.path.join(root, file)
+            arcname = os.path.relpath(full_path, source_dir).replace(os.sep, "/")
+            if arcname == PROJECT_MANIFEST_NAME:
+                continue  # Written by export itself, never taken from the tree
+            if is_journal(arcname):
+                continue
+            members.append((full_path, arcname))
+    return members
+
+def make_zip_info(full_path, arcname, compress_type):
+    zinfo = zipfile.ZipInfo.from_file(full_path, arcname, strict_timestamps=False)
+    zinfo.compress_type = compress_type
+    return zinfo
+
+def compress_bytes(raw, compress_type, level=None):
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(DEFLATE_LEVEL if level is None else level, zlib.DEFLATED, -15)
+        return compressor.compress(raw) + compressor.flush()
+    if compress_type == zipfile.ZIP_BZIP2:
+        return bz2.compress(raw, 9 if level is None else level)
+    if compress_type == zipfile.ZIP_LZMA:
+        compressor = zipfile.LZMACompressor()
+        return compressor.compress(raw) + compressor.flush()
+    return raw
+
+def compress_member(full_path, arcname, policy, raw=None):
+    """Reads and compresses one file according to policy. Runs on worker threads.
+
+    Returns (zinfo, data, digest). Members that would not shrink are stored instead.
+    """
+    if raw is None:
+        with open(full_path, "rb") as f:
+            raw = f.read()
+    compress_type, level = choose_compression(arcname, len(raw), policy)
+    zinfo = make_zip_info(full_path, arcname, compress_type)
+    zinfo.file_size = len(raw)
+    zinfo.CRC = zlib.crc32(raw)
+    data = compress_bytes(raw, compress_type, level)
+    if compress_type != zipfile.ZIP_STORED and len(data) >= len(raw):
+        zinfo.compress_type = zipfile.ZIP_STORED
+        data = raw
+    if zinfo.compress_type == zipfile.ZIP_LZMA:
+        zinfo.flag_bits |= LZMA_EOS_FLAG
+    zinfo.compress_size = len(data)
+    return zinfo, data, hashlib.sha256(raw).hexdigest()
+
+def prepare_member(full_path, arcname, policy, previous=None):
+    """Worker step for one member: reuse the previous export's entry or compress afresh.
+
+    Returns (zinfo, data, entry, seconds). data is None when the file is unchanged
+    since the previous export and its compressed bytes can be copied from there.
+    Whenever the stat does not prove that (see same_stat), content hashes decide.
+    """
+    started = time.perf_counter()
+    st = os.stat(full_path)
+    rule = list(choose_compression(arcname, st.st_size, policy))
+    entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "ctime_ns": st.st_ctime_ns, "rule": rule}
+    raw = None
+    if previous and previous.get("rule") == rule and previous.get("size") == st.st_size:
+        if not same_stat(previous, st):
+            with open(full_path, "rb") as f:
+                raw = f.read()
+        if raw is None or hashlib.sha256(raw).hexdigest() == previous.get("sha256"):
+            zinfo = make_zip_info(full_path, arcname, rule[0])
+            entry.update(sha256=previous["sha256"], crc=previous["crc"])
+            return zinfo, None, entry, time.perf_counter() - started
+    zinfo, data, digest = compress_member(full_path, arcname, policy, raw)
+    entry.update(sha256=digest, crc=zinfo.CRC)
+    return zinfo, data, entry, time.perf_counter() - started
+
+def same_stat(previous, st):
+    """True if st matches the previous export's entry closely enough to skip reading the file.
+    A whole-second mtime (FAT, many network shares, tools that set timestamps) is too
+    coarse to tell a quick rewrite apart, so it never counts."""
+    if previous.get("mtime_ns") != st.st_mtime_ns or st.st_mtime_ns % 1_000_000_000 == 0:
+        return False
+    return not TRUST_CTIME or previous.get("ctime_ns") == st.st_ctime_ns
+
+def read_raw_member(zip_ref, zinfo):
+    """Returns a member's stored (still compressed) bytes without decompressing them."""
+    zip_ref.fp.seek(zinfo.header_offset)
+    header = zip_ref.fp.read(LOCAL_HEADER_SIZE)
+    if len(header) != LOCAL_HEADER_SIZE or header[:4] != LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local header for {zinfo.filename}")
+    name_len, extra_len = struct.unpack("<2H", header[26:30])
+    zip_ref.fp.seek(zinfo.header_offset + LOCAL_HEADER_SIZE + name_len + extra_len)
+    return zip_ref.fp.read(zinfo.compress_size)
+
+def write_raw_member(zip_ref, zinfo, data):
+    """Appends an already-compressed member; ZipFile writes the central directory on close."""
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+    zinfo.header_offset = zip_ref.fp.tell()
+    zip_ref.fp.write(zinfo.FileHeader(zip64))
+    zip_ref.fp.write(data)
+    zip_ref.filelist.append(zinfo)
+    zip_ref.NameToInfo[zinfo.filename] = zinfo
+    zip_ref.start_dir = zip_ref.fp.tell()
+    zip_ref._didModify = True
+
+# ---------- Export Summary ----------
+def new_summary():
+    return {"files": 0, "reused": 0, "seconds": 0.0, "types": {}, "content_hash": None}
+
+def record_member(summary, zinfo, seconds, reused=False):
+    stats = summary["types"].setdefault(member_type(zinfo.filename),
+                                        {"files": 0, "reused": 0, "raw": 0, "compressed": 0, "seconds": 0.0})
+    stats["files"] += 1
+    stats["raw"] += zinfo.file_size
+    stats["compressed"] += zinfo.compress_size
+    stats["seconds"] += seconds
+    summary["files"] += 1
+    if reused:
+        stats["reused"] += 1
+        summary["reused"] += 1
+
+def format_size(num_bytes):
+    for unit in ("B", "KB", "MB"):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+def format_summary(summary, limit=None):
+    """One line per member type, most expensive first: size, ratio and compression time."""
+    rows = sorted(summary["types"].items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+    lines = []
+    for ext, stats in rows[:limit]:
+        ratio = stats["compressed"] / stats["raw"] * 100 if stats["raw"] else 100.0
+        reused = f", {stats['reused']} reused" if stats["reused"] else ""
+        lines.append(f"{ext}: {stats['files']} files{reused}, {format_size(stats['raw'])} -> "
+                     f"{format_size(stats['compressed'])} ({ratio:.0f}%), {stats['seconds']:.2f}s")
+    return "\n".join(lines)
+
+# ---------- Export Manifest ----------
+def write_json_atomic(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def cache_key(path):
+    return hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+
+def export_manifest_path(zip_path, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, EXPORT_MANIFEST_DIR, f"{cache_key(zip_path)}.json")
+
+def load_export_manifest(zip_path, cache_dir=CACHE_DIR):
+    """Returns the member entries of the last export to zip_path, or {} if that archive
+    is missing or was changed by something else since."""
+    manifest = read_json(export_manifest_path(zip_path, cache_dir))
+    if not manifest or manifest.get("version") != EXPORT_MANIFEST_VERSION:
+        return {}
+    try:
+        st = os.stat(zip_path)
+    except OSError:
+        return {}
+    if manifest.get("archive") != {"size": st.st_size, "mtime_ns": st.st_mtime_ns}:
+        return {}
+    return manifest.get("members", {})
+
+def save_export_manifest(zip_path, members, cache_dir=CACHE_DIR):
+    st = os.stat(zip_path)
+    write_json_atomic(export_manifest_path(zip_path, cache_dir), {
+        "version": EXPORT_MANIFEST_VERSION,
+        "archive": {"size": st.st_size, "mtime_ns": st.st_mtime_ns},
+        "members": members,
+    })
+
+# ---------- Project Manifest ----------
+def count_rooms(arcnames):
+    """Returns {"Tutorial": n, "Floor_1": n, ...} from room folder paths."""
+    rooms = {}
+    for arcname in arcnames:
+        if not arcname.startswith(ROOMS_PREFIX):
+            continue
+        parts = arcname[len(ROOMS_PREFIX):].split("/")
+        if parts[0] == "Tutorial" and len(parts) >= 3:
+            rooms.setdefault("Tutorial", set()).add(parts[1])
+        elif parts[0] == "Main" and len(parts) >= 4:
+            rooms.setdefault(parts[1], set()).add(parts[2])
+    return {area: len(names) for area, names in sorted(rooms.items())}
+
+def clean_title(text):
+    return text.strip() or "Untitled Project"
+
+def make_thumbnail(path, size=THUMBNAIL_SIZE):
+    """Returns a base64 PNG no larger than size x size, or None without Pillow or an icon."""
+    if not os.path.exists(path):
+        return None
+    try:
+        from PIL import Image  # Imported here so callers that never build thumbnails skip Pillow
+    except ImportError:  # Thumbnails are optional; headless tools may run without Pillow
+        return None
+    try:
+        with Image.open(path) as image:
+            image.thumbnail((size, size), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, "PNG")
+        return base64.b64encode(buffer.getvalue()).decode("ascii")
+    except Exception as e:
+        print(f"Could not build thumbnail: {e}")
+        return None
+
+def build_project_manifest(source_dir, members, engine_version=None):
+    """Metadata stored at the front of the archive. content_hash is filled in once
+    every member has been hashed (see patch_stored_member)."""
+    title_path = os.path.join(source_dir, *PROJECT_TITLE_PATH.split("/"))
+    title = "Untitled Project"
+    if os.path.exists(title_path):
+        with open(title_path, "r", encoding="utf-8") as f:
+            title = clean_title(f.read())
+    arcnames = [arcname for _, arcname in members]
+    return {
+        "version": PROJECT_MANIFEST_VERSION,
+        "title": title,
+        "engine_version": engine_version,
+        "rooms": count_rooms(arcnames),
+        "files": len(members),
+        "total_size": sum(os.path.getsize(full_path) for full_path, _ in members),
+        "content_hash": "0" * 64,
+        "thumbnail": make_thumbnail(os.path.join(source_dir, *PROJECT_ICON_PATH.split("/"))),
+    }
+
+def encode_manifest(manifest):
+    return json.dumps(manifest, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+def content_hash(entries):
+    """Hash over every member's path and SHA-256, in archive order."""
+    digest = hashlib.sha256()
+    for arcname, entry in entries.items():
+        digest.update(f"{arcname}\0{entry['sha256']}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+def write_stored_member(zip_ref, arcname, data, date_time=MANIFEST_DATE_TIME):
+    zinfo = zipfile.ZipInfo(arcname, date_time)
+    zinfo.compress_type = zipfile.ZIP_STORED
+    zinfo.external_attr = 0o644 << 16
+    zinfo.file_size = zinfo.compress_size = len(data)
+    zinfo.CRC = zlib.crc32(data)
+    write_raw_member(zip_ref, zinfo, data)
+    return zinfo
+
+def patch_stored_member(zip_ref, zinfo, data):
+    """Rewrites a stored member in place before the archive is closed; data must keep its length."""
+    if len(data) != zinfo.file_size:
+        raise ValueError(f"Patched {zinfo.filename} must stay {zinfo.file_size} bytes")
+    end = zip_ref.fp.tell()
+    zinfo.CRC = zlib.crc32(data)
+    zip_ref.fp.seek(zinfo.header_offset)
+    zip_ref.fp.write(zinfo.FileHeader(False))
+    zip_ref.fp.write(data)
+    zip_ref.fp.seek(end)
+
+def read_project_info(zip_path):
+    """Reads project metadata from a .echo using only the central directory and the
+    manifest member. Archives from before the manifest fall back to scanning member
+    names plus the title file. info["has_manifest"] tells the two apart."""
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        if PROJECT_MANIFEST_NAME in zip_ref.NameToInfo:
+            info = json.loads(zip_ref.read(PROJECT_MANIFEST_NAME).decode("utf-8"))
+            info["has_manifest"] = True
+            return info
+        files = [info for info in zip_ref.infolist() if not info.is_dir()]
+        title = "Untitled Project"
+        if PROJECT_TITLE_PATH in zip_ref.NameToInfo:
+            title = clean_title(zip_ref.read(PROJECT_TITLE_PATH).decode("utf-8", errors="replace"))
+        return {
+            "version": None,
+            "title": title,
+            "engine_version": None,
+            "rooms": count_rooms(info.filename for info in files),
+            "files": len(files),
+            "total_size": sum(info.file_size for info in files),
+            "content_hash": None,
+            "thumbnail": None,
+            "has_manifest": False,
+        }
+
+def format_project_info(info):
+    rooms = sum(info.get("rooms", {}).values())
+    floors = sum(1 for area in info.get("rooms", {}) if area != "Tutorial")
+    engine = f", engine {info['engine_version']}" if info.get("engine_version") else ""
+    return (f"'{info['title']}': {rooms} rooms on {floors} floor(s), "
+            f"{info['files']} files, {format_size(info['total_size'])}{engine}")
+
+# ---------- Export ----------
+def export_archive(source_dir, zip_path, progress=None, jobs=None, policy=None,
+                   incremental=True, cache_dir=CACHE_DIR, engine_version=None):
+    """Builds a .echo archive from source_dir, compressing members in parallel.
+
+    Members are written in sorted path order, so identical inputs give an identical
+    archive regardless of which worker finishes first. progress(arcname, count, total)
+    is called from the calling thread after each member is written. policy defaults
+    to the DEFAULT_PRESET compression policy.
+
+    With incremental set, a manifest of the last export to zip_path is kept under
+    cache_dir, and members unchanged since then are copied from the previous archive
+    as raw compressed bytes instead of being recompressed. The new archive is built
+    beside zip_path and swapped in when complete.
+
+    A project manifest (PROJECT_MANIFEST_NAME) is stored as the first member so
+    read_project_info can describe the archive without extracting it.
+    Returns a summary dict (see format_summary); summary["files"] is 0 if nothing was found.
+    """
+    summary = new_summary()
+    members = collect_members(source_dir)
+    total = len(members)
+    if not total:
+        return summary
+    policy = policy or make_policy()
+    jobs = max(1, jobs or DEFAULT_JOBS)
+    window = jobs * WINDOW_PER_JOB
+    previous = load_export_manifest(zip_path, cache_dir) if incremental else {}
+    previous_zip = None
+    if previous:
+        try:
+            previous_zip = zipfile.ZipFile(zip_path, "r")
+        except (OSError, zipfile.BadZipFile):
+            previous = {}
+    new_entries = {}
+    pending = deque()
+    queued = iter(members)
+    tmp_path = zip_path + ".tmp"
+    started = time.perf_counter()
+    manifest = build_project_manifest(source_dir, members, engine_version)
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool, \
+                zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+            manifest_info = write_stored_member(zip_ref, PROJECT_MANIFEST_NAME, encode_manifest(manifest))
+            def fill():
+                while len(pending) < window:
+                    item = next(queued, None)
+                    if item is None:
+                        return
+                    full_path, arcname = item
+                    pending.append((full_path, arcname, pool.submit(
+                        prepare_member, full_path, arcname, policy, previous.get(arcname))))
+            fill()
+            count = 0
+            while pending:
+                full_path, arcname, future = pending.popleft()
+                zinfo, data, entry, seconds = future.result()
+                reused = data is None
+                if reused:
+                    # The previous manifest matched the archive's size and mtime, so its
+                    # entry describes this member; only a missing one needs compressing
+                    old = previous_zip.NameToInfo.get(arcname)
+                    if old is not None:
+                        zinfo.compress_type = old.compress_type
+                        zinfo.flag_bits = old.flag_bits
+                        zinfo.file_size = old.file_size
+                        zinfo.compress_size = old.compress_size
+                        zinfo.CRC = old.CRC
+                        data = read_raw_member(previous_zip, old)
+                    else:
+                        reused = False
+                        zinfo, data, digest = compress_member(full_path, arcname, policy)
+                        entry.update(sha256=digest, crc=zinfo.CRC)
+                write_raw_member(zip_ref, zinfo, data)
+                record_member(summary, zinfo, seconds, reused)
+                new_entries[arcname] = entry
+                count += 1
+                if progress:
+                    progress(arcname, count, total)
+                fill()
+            manifest["content_hash"] = content_hash(new_entries)
+            patch_stored_member(zip_ref, manifest_info, encode_manifest(manifest))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        if previous_zip is not None:
+            previous_zip.close()
+    os.replace(tmp_path, zip_path)
+    if incremental:
+        save_export_manifest(zip_path, new_entries, cache_dir)
+    summary["seconds"] = time.perf_counter() - started
+    summary["content_hash"] = manifest["content_hash"]
+    return summary
+
+# ---------- Working Directory CRC Index ----------
+def file_crc(path):
+    crc = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CRC_CHUNK_SIZE)
+            if not chunk:
+                return crc
+            crc = zlib.crc32(chunk, crc)
+
+def crc_index_path(root_dir, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, CRC_INDEX_DIR, f"{cache_key(root_dir)}.json")
+
+def build_crc_index(root_dir, cache_dir=CACHE_DIR):
+    """Returns {arcname: {"size", "mtime_ns", "crc"}} for every file under root_dir.
+
+    CRCs are cached by (size, mtime), so only files touched since the last call are read.
+    """
+    cached = read_json(crc_index_path(root_dir, cache_dir)) or {}
+    if cached.get("version") != CRC_INDEX_VERSION:
+        cached = {}
+    cached_files = cached.get("files", {})
+    files = {}
+    for full_path, arcname in collect_members(root_dir):
+        st = os.stat(full_path)
+        entry = cached_files.get(arcname)
+        if not entry or entry["size"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+            entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "crc": file_crc(full_path)}
+        files[arcname] = entry
+    save_crc_index(root_dir, files, cache_dir)
+    return files
+
+def save_crc_index(root_dir, files, cache_dir=CACHE_DIR):
+    write_json_atomic(crc_index_path(root_dir, cache_dir), {"version": CRC_INDEX_VERSION, "files": files})
+
+# ---------- Verification ----------
+def unsafe_name_reason(name):
+    """Why a member name could write outside the destination, or None if it is safe."""
+    if not name or "\0" in name:
+        return "empty or NUL in name"
+    if "\\" in name:
+        return "backslash in name"
+    if name.startswith("/") or (len(name) > 1 and name[1] == ":"):
+        return "absolute path"
+    if ".." in name.split("/"):
+        return "'..' in path"
+    return None
+
+def check_members(zip_path, names, on_member=None):
+    """Reads names in full, which makes zipfile check each CRC. Returns [(name, error)]."""
+    errors = []
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for name in names:
+            try:
+                with zip_ref.open(name) as member:
+                    while member.read(CRC_CHUNK_SIZE):
+                        pass
+            except (zipfile.BadZipFile, zlib.error, EOFError, NotImplementedError, OSError) as e:
+                errors.append((name, str(e)))
+            if on_member:
+                on_member(name)
+    return errors
+
+def verify_archive(zip_path, jobs=None, progress=None):
+    """Checks a .echo without extracting anything.
+
+    The central directory is read once, member names are checked for path traversal
+    and duplicates, then every member is decompressed and CRC-checked by jobs worker
+    threads, each with its own file handle. Returns {"members", "bytes", "seconds",
+    "errors": [(name, reason), ...]}; the archive is sound when errors is empty.
+    progress(description, count, total) is called after each member is checked.
+    Raises zipfile.BadZipFile if there is no readable central directory.
+    """
+    started = time.perf_counter()
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        infos = [info for info in zip_ref.infolist() if not info.is_dir()]
+    errors = []
+    seen = set()
+    for info in infos:
+        reason = unsafe_name_reason(info.filename)
+        if reason:
+            errors.append((info.filename, reason))
+        elif info.filename in seen:
+            errors.append((info.filename, "duplicate entry"))
+        seen.add(info.filename)
+    if not errors:
+        # Spread members over the workers by size, largest first, so they finish together
+        jobs = max(1, min(jobs or DEFAULT_JOBS, len(infos)))
+        buckets = [[0, []] for _ in range(jobs)]
+        for info in sorted(infos, key=lambda i: i.file_size, reverse=True):
+            bucket = min(buckets, key=lambda b: b[0])
+            bucket[0] += info.compress_size + info.file_size
+            bucket[1].append(info.filename)
+        lock = threading.Lock()
+        checked = [0]
+        def on_member(name):
+            with lock:
+                checked[0] += 1
+                count = checked[0]
+            if progress:
+                progress(f"Verifying {name}", count, len(infos))
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for result in pool.map(lambda b: check_members(zip_path, b[1], on_member), buckets):
+                errors.extend(result)
+    return {"members": len(infos), "bytes": sum(i.file_size for i in infos),
+            "seconds": time.perf_counter() - started, "errors": errors}
+
+def format_verify_errors(errors, limit=5):
+    names = errors if limit is None else errors[:limit]
+    lines = [f"  {name}: {reason}" for name, reason in names]
+    if len(errors) > len(names):
+        lines.append(f"  ... {len(errors) - len(names)} more")
+    return "\n".join(lines)
+
+# ---------- Delta Import ----------
+def plan_delta_import(zip_ref, index):
+    """Compares archive members with a CRC index of the destination.
+
+    Returns {"added", "changed", "removed": [arcname, ...], "unchanged": count}.
+    """
+    plan = {"added": [], "changed": [], "removed": [], "unchanged": 0}
+    names = set()
+    for info in zip_ref.infolist():
+        if info.is_dir() or info.filename == PROJECT_MANIFEST_NAME or is_journal(info.filename):
+            continue  # Journals in archives made before they were left out are ignored too
+        names.add(info.filename)
+        entry = index.get(info.filename)
+        if entry is None:
+            plan["added"].append(info.filename)
+        elif entry["size"] != info.file_size or entry["crc"] != info.CRC:
+            plan["changed"].append(info.filename)
+        else:
+            plan["unchanged"] += 1
+    plan["removed"] = sorted(name for name in index if name not in names)
+    return plan
+
+def remove_empty_dirs(root_dir, arcnames):
+    """Removes directories left empty by deleting arcnames, walking up towards root_dir."""
+    root_dir = os.path.abspath(root_dir)
+    for arcname in arcnames:
+        parent = os.path.dirname(os.path.join(root_dir, *arcname.split("/")))
+        while parent != root_dir and os.path.isdir(parent) and not os.listdir(parent):
+            os.rmdir(parent)
+            parent = os.path.dirname(parent)
+
+def delta_import(zip_path, dest_dir, progress=None, cache_dir=CACHE_DIR):
+    """Brings dest_dir in line with the archive, touching only files that differ.
+
+    New and changed members are extracted, files not in the archive are deleted.
+    progress(description, count, total) is called after each file operation.
+    Returns the plan from plan_delta_import.
+    """
+    os.makedirs(dest_dir, exist_ok=True)
+    index = build_crc_index(dest_dir, cache_dir)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        plan = plan_delta_import(zip_ref, index)
+        for arcname in plan["added"] + plan["changed"]:
+            if unsafe_name_reason(arcname):
+                raise ValueError(f"Refusing to extract '{arcname}': {unsafe_name_reason(arcname)}")
+        total = len(plan["added"]) + len(plan["changed"]) + len(plan["removed"])
+        count = 0
+        for arcname in plan["added"] + plan["changed"]:
+            info = zip_ref.getinfo(arcname)
+            extracted = zip_ref.extract(info, dest_dir)
+            st = os.stat(extracted)
+            index[arcname] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "crc": info.CRC}
+            count += 1
+            if progress:
+                progress(f"Extracting {arcname}", count, total)
+        for arcname in plan["removed"]:
+            full_path = os.path.join(dest_dir, *arcname.split("/"))
+            if os.path.exists(full_path):
+                os.unlink(full_path)
+            index.pop(arcname, None)
+            count += 1
+            if progress:
+                progress(f"Deleting {arcname}", count, total)
+    remove_empty_dirs(dest_dir, plan["removed"])
+    remove_journals(dest_dir)
+    save_crc_index(dest_dir, index, cache_dir)
+    return plan
+
+def format_delta_plan(plan, limit=5):
+    """Short human-readable account of what a delta import changed."""
+    lines = [f"{len(plan['added'])} added, {len(plan['changed'])} changed, "
+             f"{len(plan['removed'])} removed, {plan['unchanged']} unchanged"]
+    for label in ("added", "changed", "removed"):
+        names = plan[label]
+        if names:
+            shown = ", ".join(names[:limit])
+            more = f" (+{len(names) - limit} more)" if limit is not None and len(names) > limit else ""
+            lines.append(f"{label.capitalize()}: {shown}{more}")
+    return "\n".join(lines)
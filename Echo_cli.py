@@ -0,0 +1,269 @@
+# Jack Murray
+# Nova Foundry / Echo CLI
+# v1.4.0
+"""Headless Echo Hub: echo-hub new|import|export|clear|verify.
+
+Progress and results are written to stdout as JSON lines, one object per line with an
+"event" key ("progress", "result" or "error"). Anything the engine code prints goes to
+stderr so stdout stays machine-readable. Exit codes: 0 success, 1 failure, 2 bad usage.
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+import Echo_archive
+import Echo_process
+import Echo_snapshots
+import Echo_workspace
+
+# ---------- CONFIG ----------
+VERSION = "3"  # Keep in step with Echo_hub.VERSION
+RUNTIME_SOURCE = "Engine_base"
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+
+stdout = sys.stdout
+quiet = False
+
+class UsageError(Exception):
+    """Arguments argparse accepts but that cannot work together, exits with EXIT_USAGE."""
+
+# ---------- Output ----------
+def emit(event, **fields):
+    if quiet and event == "progress":
+        return
+    stdout.write(json.dumps({"event": event, **fields}) + "\n")
+    stdout.flush()
+
+def progress_reporter(command):
+    def report(item, count, total):
+        emit("progress", command=command, item=item, count=count, total=total)
+    return report
+
+def close_runners(dest):
+    result = Echo_process.terminate_roles(("runner",), root_dir=dest)
+    if result["remaining"]:
+        raise RuntimeError(f"Could not close running processes: {result['remaining']}")
+
+def snapshot(dest, reason, enabled):
+    if not enabled:
+        return None
+    workspace = Echo_workspace.get_active() if dest == Echo_workspace.WORKSPACE_ROOT else dest
+    snapshot_id = Echo_snapshots.take_snapshot(dest, reason, workspace=workspace)
+    if snapshot_id:
+        emit("progress", command=reason, item=f"Snapshot {snapshot_id}", count=0, total=0)
+    return snapshot_id
+
+# ---------- Commands ----------
+def cmd_new(args):
+    dest = args.dest
+    if os.path.exists(dest) and os.listdir(dest) and not args.force:
+        raise RuntimeError(f"'{dest}' contains project files, pass --force to replace them")
+    close_runners(dest)
+    snapshot(dest, "new-project", args.snapshot)
+    if os.path.exists(dest):
+        shutil.rmtree(dest)
+    members = Echo_archive.collect_members(RUNTIME_SOURCE)
+    report = progress_reporter("new")
+    for count, (full_path, arcname) in enumerate(members, start=1):
+        target = os.path.join(dest, *arcname.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(full_path, target)
+        report(arcname, count, len(members))
+    emit("result", command="new", dest=dest, files=len(members))
+
+def cmd_import(args):
+    # Every CRC and member path is checked before the working project is touched
+    result = Echo_archive.verify_archive(args.archive, jobs=args.jobs, progress=progress_reporter("import"))
+    if result["errors"]:
+        raise ValueError("The archive is damaged or unsafe, nothing was changed:\n"
+                         + Echo_archive.format_verify_errors(result["errors"]))
+    close_runners(args.dest)
+    info = Echo_archive.read_project_info(args.archive)
+    snapshot(args.dest, "import", args.snapshot)
+    plan = Echo_archive.delta_import(args.archive, args.dest, progress=progress_reporter("import"))
+    emit("result", command="import", archive=args.archive, dest=args.dest, title=info.get("title"),
+         added=len(plan["added"]), changed=len(plan["changed"]), removed=len(plan["removed"]),
+         unchanged=plan["unchanged"])
+
+def export_one(source, output, policy, jobs, incremental, report):
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    summary = Echo_archive.export_archive(source, output, progress=report, jobs=jobs, policy=policy,
+                                          incremental=incremental, engine_version=VERSION)
+    if not summary["files"]:
+        raise RuntimeError(f"No project found in '{source}'")
+    return summary
+
+def cmd_export(args):
+    policy = Echo_archive.make_policy(args.preset)
+    if args.batch:
+        pairs = [(source, os.path.join(args.out_dir, os.path.basename(os.path.normpath(source)) + ".echo"))
+                 for source in args.batch]
+        # Two sources with the same folder name would race on one archive
+        outputs = {}
+        for source, output in pairs:
+            key = os.path.normcase(output)
+            if key in outputs and outputs[key] != source:
+                raise UsageError(f"'{outputs[key]}' and '{source}' would both be exported to '{output}', "
+                                 f"export them separately")
+            outputs[key] = source
+        pairs = list(dict(pairs).items())  # The same source given twice is exported once
+        os.makedirs(args.out_dir, exist_ok=True)
+    elif args.output:
+        pairs = [(args.source, args.output)]
+    else:
+        raise RuntimeError("export needs an OUTPUT path or --batch SOURCE... --out-dir DIR")
+    # Split the job budget: whole projects in parallel first, the rest per archive
+    parallel = max(1, min(args.jobs, len(pairs)))
+    per_archive = max(1, args.jobs // parallel)
+    def run(pair):
+        source, output = pair
+        def report(arcname, count, total):
+            emit("progress", command="export", archive=output, item=arcname, count=count, total=total)
+        summary = export_one(source, output, policy, per_archive, not args.full, report)
+        emit("result", command="export", source=source, archive=output, files=summary["files"],
+             reused=summary["reused"], seconds=round(summary["seconds"], 3),
+             size=os.path.getsize(output), content_hash=summary["content_hash"])
+    failures = 0
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        for pair, future in [(pair, pool.submit(run, pair)) for pair in pairs]:
+            try:
+                future.result()
+            except Exception as e:
+                failures += 1
+                emit("error", command="export", source=pair[0], archive=pair[1], message=str(e))
+    if failures:
+        raise RuntimeError(f"{failures} of {len(pairs)} exports failed")
+
+def cmd_clear(args):
+    if not os.path.exists(args.dest):
+        emit("result", command="clear", dest=args.dest, files=0)
+        return
+    close_runners(args.dest)
+    snapshot(args.dest, "clear", args.snapshot)
+    members = Echo_archive.collect_members(args.dest)
+    shutil.rmtree(args.dest)
+    os.makedirs(args.dest)
+    emit("result", command="clear", dest=args.dest, files=len(members))
+
+def verify_one(archive, jobs):
+    result = Echo_archive.verify_archive(archive, jobs=jobs)
+    if result["errors"]:
+        name, reason = result["errors"][0]
+        more = f" (+{len(result['errors']) - 1} more)" if len(result["errors"]) > 1 else ""
+        raise ValueError(f"{name}: {reason}{more}")
+    return result, Echo_archive.read_project_info(archive)
+
+def cmd_verify(args):
+    archives = list(args.archives)
+    if args.library:
+        import Echo_library
+        for folder in Echo_library.load_settings()["folders"]:
+            archives.extend(path for path, size, mtime_ns in Echo_library.find_projects(folder))
+    if not archives:
+        raise RuntimeError("verify needs ARCHIVE paths or --library")
+    # Same split as batch export: whole archives in parallel, the rest of the budget per archive
+    parallel = max(1, min(args.jobs, len(archives)))
+    per_archive = max(1, args.jobs // parallel)
+    failures = 0
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        futures = [(archive, pool.submit(verify_one, archive, per_archive)) for archive in archives]
+        for count, (archive, future) in enumerate(futures, start=1):
+            try:
+                result, info = future.result()
+                emit("result", command="verify", archive=archive, ok=True, title=info.get("title"),
+                     members=result["members"], seconds=round(result["seconds"], 3))
+            except Exception as e:
+                failures += 1
+                emit("result", command="verify", archive=archive, ok=False, message=str(e))
+            emit("progress", command="verify", item=archive, count=count, total=len(futures))
+    if failures:
+        raise RuntimeError(f"{failures} of {len(futures)} archives failed verification")
+
+# ---------- Entry Point ----------
+def build_parser():
+    parser = argparse.ArgumentParser(prog="echo-hub", description="Headless Echo Hub operations.")
+    parser.add_argument("--root", default=".", help="Echo Hub directory (default: current directory)")
+    parser.add_argument("--jobs", type=int, default=Echo_archive.DEFAULT_JOBS,
+                        help=f"parallel workers (default: {Echo_archive.DEFAULT_JOBS})")
+    parser.add_argument("--quiet", action="store_true", help="only print results and errors")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_snapshot_flag(sub):
+        sub.add_argument("--no-snapshot", dest="snapshot", action="store_false",
+                         help="skip the automatic snapshot of the files being replaced")
+
+    new = commands.add_parser("new", help="create a project from Engine_base")
+    new.add_argument("--dest")
+    new.add_argument("--force", action="store_true", help="replace an existing project")
+    add_snapshot_flag(new)
+    new.set_defaults(func=cmd_new)
+
+    imp = commands.add_parser("import", help="import a .echo archive")
+    imp.add_argument("archive")
+    imp.add_argument("--dest")
+    add_snapshot_flag(imp)
+    imp.set_defaults(func=cmd_import)
+
+    exp = commands.add_parser("export", help="export one or more projects to .echo archives")
+    exp.add_argument("output", nargs="?", help="archive to write")
+    exp.add_argument("--source")
+    exp.add_argument("--batch", nargs="+", metavar="SOURCE", help="export each SOURCE to --out-dir")
+    exp.add_argument("--out-dir")
+    exp.add_argument("--preset", default=Echo_archive.DEFAULT_PRESET, choices=sorted(Echo_archive.COMPRESSION_PRESETS))
+    exp.add_argument("--full", action="store_true", help="recompress everything instead of reusing the last export")
+    exp.set_defaults(func=cmd_export)
+
+    clear = commands.add_parser("clear", help="delete the contents of the working directory")
+    clear.add_argument("--dest")
+    add_snapshot_flag(clear)
+    clear.set_defaults(func=cmd_clear)
+
+    verify = commands.add_parser("verify", help="check .echo archives for corruption")
+    verify.add_argument("archives", nargs="*")
+    verify.add_argument("--library", action="store_true", help="also check every archive in the library folders")
+    verify.set_defaults(func=cmd_verify)
+    return parser
+
+PATH_ARGS = ("archive", "archives", "output", "batch", "dest", "source", "out_dir")
+
+def resolve_paths(args):
+    """Makes paths given on the command line absolute before changing to --root, then fills
+    in the defaults, which are relative to the hub directory."""
+    for name in PATH_ARGS:
+        value = getattr(args, name, None)
+        if isinstance(value, list):
+            setattr(args, name, [os.path.abspath(v) for v in value])
+        elif value is not None:
+            setattr(args, name, os.path.abspath(value))
+    os.chdir(args.root)
+    for name in ("dest", "source"):
+        if hasattr(args, name) and getattr(args, name) is None:
+            setattr(args, name, Echo_workspace.WORKSPACE_ROOT)
+    if hasattr(args, "out_dir") and args.out_dir is None:
+        args.out_dir = os.getcwd()
+
+def main(argv=None):
+    global quiet
+    args = build_parser().parse_args(argv)
+    quiet = args.quiet
+    try:
+        resolve_paths(args)
+        # Engine code reports through print(), keep that off the JSON stream
+        with contextlib.redirect_stdout(sys.stderr):
+            args.func(args)
+    except UsageError as e:
+        emit("error", command=args.command, message=str(e))
+        return EXIT_USAGE
+    except Exception as e:
+        emit("error", command=args.command, message=str(e))
+        return EXIT_FAILED
+    return EXIT_OK
+
+if __name__ == "__main__":
+    sys.exit(main())
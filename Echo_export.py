@@ -0,0 +1,120 @@
+# Jack Murray
+# Nova Foundry / Echo Export
+# v1.4.0
+
+import os
+import shutil
+import fnmatch
+import Echo_archive
+
+# ---------- CONFIG ----------
+# A profile decides what goes into an exported game. Paths are relative to the project
+# root with '/' separators and matched with fnmatch, where '*' also crosses '/'.
+#   include: files considered at all, anything else is left out as "Not in profile"
+#   exclude: {category: patterns} left out of the export and reported per category
+#   reset:   {category: patterns} shipped as empty files, so the runner finds the file
+#            but none of the author's play-testing state
+EDITOR_LEFTOVERS = ["*.tmp", "*.bak", "*.orig", "*.swp", "*~", "*.part", "*.runtime",
+                    "*/.DS_Store", ".DS_Store", "*/Thumbs.db", "Thumbs.db", ".gitkeep", "*/.gitkeep"]
+EXPORT_PROFILES = {
+    "release": {
+        "include": ["*"],
+        "exclude": {
+            "Debug symbols": ["*.pdb"],
+            "Intermediate build": ["obj/*"],
+            "Engine sources": ["Echo_runner.cs", "Echo_runner.csproj", "Runtime_manifest.txt"],
+            "Editor leftovers": EDITOR_LEFTOVERS,
+        },
+        "reset": {
+            "Player saves": ["Save/*"],
+        },
+    },
+    "debug": {
+        "include": ["*"],
+        "exclude": {
+            "Editor leftovers": EDITOR_LEFTOVERS,
+        },
+        "reset": {},
+    },
+}
+DEFAULT_PROFILE = "release"
+RUNNER_NAMES = ("Echo_runner.exe", "Echo_runner")
+
+# ---------- Plan ----------
+def matches(arcname, patterns):
+    return any(fnmatch.fnmatchcase(arcname, pattern) for pattern in patterns)
+
+def classify(arcname, profile):
+    """Returns ("copy", None), ("reset", category) or ("exclude", category) for arcname."""
+    if not matches(arcname, profile["include"]):
+        return "exclude", "Not in profile"
+    for category, patterns in profile["exclude"].items():
+        if matches(arcname, patterns):
+            return "exclude", category
+    for category, patterns in profile["reset"].items():
+        if matches(arcname, patterns):
+            return "reset", category
+    return "copy", None
+
+def plan_export(source_dir, profile):
+    """Sorts every file of source_dir by what profile does with it.
+
+    Returns {"copy": [(full_path, arcname, size), ...], "reset": [...], "excluded": [...],
+    "saved": {category: [count, bytes]}}. Reset files count towards saved as well, since
+    their contents are left behind.
+    """
+    plan = {"copy": [], "reset": [], "excluded": [], "saved": {}}
+    for full_path, arcname in Echo_archive.collect_members(source_dir):
+        action, category = classify(arcname, profile)
+        size = os.path.getsize(full_path)
+        plan["excluded" if action == "exclude" else action].append((full_path, arcname, size))
+        if category:
+            saved = plan["saved"].setdefault(category, [0, 0])
+            saved[0] += 1
+            saved[1] += size
+    return plan
+
+# ---------- Export ----------
+def export_game_files(source_dir, dest_dir, profile=DEFAULT_PROFILE, progress=None):
+    """Copies the files of source_dir that profile keeps into dest_dir.
+
+    profile is a name from EXPORT_PROFILES or a profile dict. progress(arcname, count,
+    total) is called after each file. Returns {"profile", "files", "bytes", "saved"} where
+    saved is {category: [count, bytes]}. Raises ValueError, before
+    anything is copied, if no Echo_runner would be exported, since the game could not start.
+    """
+    name = profile if isinstance(profile, str) else "custom"
+    if isinstance(profile, str):
+        if profile not in EXPORT_PROFILES:
+            raise ValueError(f"Unknown export profile '{profile}'")
+        profile = EXPORT_PROFILES[profile]
+    plan = plan_export(source_dir, profile)
+    kept = {arcname.rpartition("/")[2] for _, arcname, _ in plan["copy"]}
+    if not kept.intersection(RUNNER_NAMES):
+        left_out = {arcname.rpartition("/")[2] for _, arcname, _ in plan["excluded"]}
+        if left_out.intersection(RUNNER_NAMES):
+            raise ValueError(f"The {name} profile leaves out every Echo_runner, the exported game "
+                             "would not start. Export with the debug profile instead.")
+        raise ValueError("No Echo_runner was found in the game folder, build the runner before exporting.")
+    total = len(plan["copy"]) + len(plan["reset"])
+    work = [(entry, True) for entry in plan["copy"]] + [(entry, False) for entry in plan["reset"]]
+    for count, ((full_path, arcname, size), copy) in enumerate(work, start=1):
+        target = os.path.join(dest_dir, *arcname.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        if copy:
+            shutil.copy2(full_path, target)
+        else:
+            open(target, "wb").close()
+        if progress:
+            progress(arcname, count, total)
+    return {"profile": name, "files": total, "bytes": sum(size for _, _, size in plan["copy"]),
+            "saved": plan["saved"]}
+
+def format_export_report(summary):
+    """Short human-readable account of what an export left out."""
+    saved_bytes = sum(size for _, size in summary["saved"].values())
+    lines = [f"{summary['files']} files, {Echo_archive.format_size(summary['bytes'])} "
+             f"({summary['profile']} profile, {Echo_archive.format_size(saved_bytes)} saved)"]
+    for category, (count, size) in sorted(summary["saved"].items(), key=lambda item: -item[1][1]):
+        lines.append(f"  {category}: {count} files, {Echo_archive.format_size(size)}")
+    return "\n".join(lines)
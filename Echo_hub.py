@@ -2,26 +2,33 @@
 # Nova Foundry / Echo Hub
 # v1.4.0
 
+import time
+STARTUP_STARTED = time.perf_counter()  # Taken before any other import, for the startup timing report
 import os
 import sys
+import json
 import shutil
-import webbrowser
-import zipfile
 import threading
 import subprocess
+import platform
+STARTUP_MARKS = [("stdlib imports", time.perf_counter() - STARTUP_STARTED)]
 import customtkinter as ctk
 from tkinter import filedialog
-from PIL import Image
-import urllib.request
-import json
 import tkinter as tk
-import platform
+STARTUP_MARKS.append(("customtkinter", time.perf_counter() - STARTUP_STARTED))
+import Echo_archive
+import Echo_workspace
+STARTUP_MARKS.append(("Echo modules", time.perf_counter() - STARTUP_STARTED))
+# PIL, zipfile, webbrowser and the other Echo_* modules are imported where they are first
+# used, so none of them are paid for before the first frame.
 
 # ---------- CONFIG ----------
-IMPORT_DESTINATION = r"Working_game"
-EXPORT_SOURCE = r"Working_game"
+RUNTIME_SOURCE = r"Engine_base"
+IMPORT_DESTINATION = Echo_workspace.WORKSPACE_ROOT  # Always the active workspace, see Echo_workspace
+EXPORT_SOURCE = Echo_workspace.WORKSPACE_ROOT
+EXPORT_COMPRESSION_PRESET = "balanced"  # "fastest", "balanced" or "smallest" (see Echo_archive.COMPRESSION_PRESETS)
 DEFAULT_WIDTH = 600
-DEFAULT_HEIGHT = 750
+DEFAULT_HEIGHT = 910
 PROGRESS_AREA_HEIGHT = 70
 VERSION = "3"
 GITURL = "https://github.com/DirectedHunt42/EchoEngine"
@@ -29,42 +36,44 @@ WINDOWS_UPDATE_ASSET = "Echo_Editor_Setup.exe"
 UBUNTU_UPDATE_ASSET = "Echo_Editor_Setup.run"
 OTHER_LINUX_UPDATE_ASSET = "Echo_Editor_Setup.run"
 DARWIN_UPDATE_ASSET = "Echo_Editor_Setup.dmg"
+STARTUP_TIMING_ENV = "ECHO_HUB_TIMING"  # Set to 1 to print a startup timing report
+STARTUP_TIMING_LOG = os.path.join(Echo_archive.CACHE_DIR, "Startup_timing.jsonl")
+TIME_TO_INTERACTIVE_TARGET = 0.5  # Seconds from process start until the hub accepts input
 
 os_name = platform.system().lower()
 ASCII_ART_GENERATOR_PATH = "Ascii_generator.exe" if os_name == "windows" else "Ascii_generator"
 EDITOR_PATH = "Engine_editor/Echo_editor.exe" if os_name == "windows" else "Engine_editor/Echo_editor"
-ENGINE_BASE_PROCESS = "Engine_base.exe" if os_name == "windows" else "Engine_base"
 
 # ---------- Helper Functions ----------
-def show_custom_message(title, message, is_error=False):
+def show_custom_message(title, message, is_error=False, width=320, height=160):
     dialog = ctk.CTkToplevel(app)
     dialog.title(title)
-    dialog.geometry("320x160")
+    dialog.geometry(f"{width}x{height}")
     dialog.resizable(False, False)
     dialog.transient(app)
     dialog.update_idletasks()
-    x = app.winfo_x() + (app.winfo_width() // 2) - 160
-    y = app.winfo_y() + (app.winfo_height() // 2) - 80
-    dialog.geometry(f"320x160+{x}+{y}")
+    x = app.winfo_x() + (app.winfo_width() // 2) - width // 2
+    y = app.winfo_y() + (app.winfo_height() // 2) - height // 2
+    dialog.geometry(f"{width}x{height}+{x}+{y}")
     dialog.grab_set()
-    label = ctk.CTkLabel(dialog, text=message, wraplength=280,
+    label = ctk.CTkLabel(dialog, text=message, wraplength=width - 40,
                          text_color="red" if is_error else "white")
     label.pack(pady=20, padx=20)
     btn = ctk.CTkButton(dialog, text="OK", command=dialog.destroy, width=100)
     btn.pack(pady=10)
 
-def ask_confirmation(title, message):
+def ask_confirmation(title, message, width=360, height=180):
     dialog = ctk.CTkToplevel(app)
     dialog.title(title)
-    dialog.geometry("360x180")
+    dialog.geometry(f"{width}x{height}")
     dialog.resizable(False, False)
     dialog.transient(app)
     dialog.update_idletasks()
-    x = app.winfo_x() + (app.winfo_width() // 2) - 180
-    y = app.winfo_y() + (app.winfo_height() // 2) - 90
-    dialog.geometry(f"360x180+{x}+{y}")
+    x = app.winfo_x() + (app.winfo_width() // 2) - width // 2
+    y = app.winfo_y() + (app.winfo_height() // 2) - height // 2
+    dialog.geometry(f"{width}x{height}+{x}+{y}")
     dialog.grab_set()
-    label = ctk.CTkLabel(dialog, text=message, wraplength=320)
+    label = ctk.CTkLabel(dialog, text=message, wraplength=width - 40)
     label.pack(pady=20, padx=20)
     response = {"confirmed": False}
     def on_yes():
@@ -79,16 +88,13 @@ def ask_confirmation(title, message):
     dialog.wait_window()
     return response["confirmed"]
 
-def load_resized_image(path, max_size=64):
-    if os.path.exists(path):
-        try:
-            image = Image.open(path)
-            ratio = min(max_size / image.width, max_size / image.height)
-            resized_image = image.resize(
-                (int(image.width * ratio), int(image.height * ratio)), Image.LANCZOS)
-            return ctk.CTkImage(light_image=resized_image, dark_image=resized_image, size=resized_image.size)
-        except Exception as e:
-            print(f"Could not load image: {e}")
+def resize_image(path, max_size=64):
+    """Loads a pre-scaled copy from the shared thumbnail cache. Safe to call off the main thread."""
+    try:
+        import Echo_thumbnails
+        return Echo_thumbnails.get_thumbnail(path, max_size=max_size)
+    except Exception as e:
+        print(f"Could not load image: {e}")
     return None
 
 def version_tuple(v):
@@ -108,21 +114,28 @@ def get_game_title():
     return "No Project Loaded"
 
 def close_engine_processes():
-    global os_name, ENGINE_BASE_PROCESS
-    while True:
-        if os_name == 'windows':
-            output = subprocess.run(['tasklist'], capture_output=True, text=True).stdout
-            if ENGINE_BASE_PROCESS not in output:
-                break
-            subprocess.run(['taskkill', '/F', '/IM', ENGINE_BASE_PROCESS], capture_output=True, check=False)
-        else:  # Linux or Darwin (Mac)
-            try:
-                pid_output = subprocess.check_output(['pgrep', '-f', ENGINE_BASE_PROCESS]).decode().strip()
-                if not pid_output:
-                    break
-                subprocess.run(['pkill', '-f', ENGINE_BASE_PROCESS], check=False)
-            except subprocess.CalledProcessError:
-                break  # pgrep returns non-zero if no process found
+    """Closes runners started from the hub or editor (and, on Linux, anything running from
+    the working directory). Returns at once when none are running."""
+    import Echo_process
+    result = Echo_process.terminate_roles(("runner",), root_dir=IMPORT_DESTINATION)
+    if result["closed"] or result["killed"]:
+        print(f"[Echo Hub] Closed {result['closed']} runner(s), forced {result['killed']}")
+    if result["remaining"]:
+        print(f"[Echo Hub] Could not close processes: {result['remaining']}")
+
+# ---------- Snapshots ----------
+def take_snapshot(reason):
+    """Snapshots the active workspace before a risky operation. A failed snapshot is
+    reported but never blocks the operation."""
+    import Echo_snapshots
+    try:
+        snapshot_id = Echo_snapshots.take_snapshot(IMPORT_DESTINATION, reason,
+                                                   workspace=Echo_workspace.get_active(),
+                                                   title=get_game_title())
+        if snapshot_id:
+            print(f"[Echo Hub] Snapshot {snapshot_id} taken before {reason}")
+    except Exception as e:
+        print(f"[Echo Hub] Could not take a snapshot before {reason}: {e}")
 
 # ---------- Progress Bar Logic ----------
 def show_progress_indicators():
@@ -159,11 +172,11 @@ def run_with_progress(task_name, actions):
         app.after(0, task_done)
     def task_done():
         hide_progress_indicators()
-        for btn in (copy_btn, import_btn, export_btn, open_btn, clear_btn):
+        for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
             btn.configure(state='normal')
         update_project_title()
         show_custom_message("Success", f"{task_name} completed successfully!")
-    for btn in (copy_btn, import_btn, export_btn, open_btn, clear_btn):
+    for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
         btn.configure(state='disabled')
     status_label.configure(text=f"{task_name}...")
     show_progress_indicators()
@@ -191,6 +204,7 @@ def clear_folder(folder_path):
     close_engine_processes()
     actions = get_clear_actions(folder_path)
     if actions:
+        actions.insert(0, (lambda: take_snapshot("clear"), "Taking snapshot"))
         run_with_progress("Clearing working directory", actions)
     else:
         show_custom_message("Info", "Directory is already empty.")
@@ -201,6 +215,7 @@ def copy_folder_with_progress(src, dest):
         if not ask_confirmation("Overwrite Project",
                                 f"The working directory '{dest}' contains project files.\nOverwrite its contents?"):
             return []
+        actions.append((lambda: take_snapshot("new-project"), "Taking snapshot"))
         actions.extend(get_clear_actions(dest))
     # Collect directory creation actions
     for root, dirs, _ in os.walk(src):
@@ -239,103 +254,128 @@ def import_zip():
     import_project(zip_path)
 
 def import_project(zip_path):
+    import zipfile
+    import Echo_library
+    try:
+        # Reads only the central directory and the embedded manifest, nothing is extracted
+        project_info = Echo_archive.read_project_info(zip_path)
+    except Exception as e:
+        show_custom_message("Error", f"Not a valid Echo project:\n{e}", is_error=True)
+        return
     if os.path.exists(IMPORT_DESTINATION):
         if not ask_confirmation("Overwrite Project",
-                                f"The working directory '{IMPORT_DESTINATION}' contains project files.\nOverwrite its contents?"):
+                                f"Import {Echo_archive.format_project_info(project_info)}?\n\n"
+                                f"The working directory '{IMPORT_DESTINATION}' contains project files.\nOverwrite its contents? Only files that differ will be rewritten.",
+                                width=460, height=220):
             return
     close_engine_processes()
-    for btn in (copy_btn, import_btn, export_btn, open_btn, clear_btn):
+    for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
         btn.configure(state='disabled')
     status_label.configure(text="Importing project...")
     show_progress_indicators()
     def task_done(success=True, message="Project imported successfully!"):
         hide_progress_indicators()
-        for btn in (copy_btn, import_btn, export_btn, open_btn, clear_btn):
+        for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
             btn.configure(state='normal')
         if success:
             update_project_title()
-            show_custom_message("Success", message)
+            Echo_library.add_recent(zip_path)
+            show_custom_message("Success", message, width=460, height=220)
         else:
-            show_custom_message("Error", message, is_error=True)
+            show_custom_message("Error", message, is_error=True, width=460, height=220)
     def import_task():
         try:
-            os.makedirs(IMPORT_DESTINATION, exist_ok=True)
             with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                file_list = [info for info in zip_ref.infolist() if not info.is_dir()]
-                total_files = len(file_list)
-                if not total_files:
+                if not any(not info.is_dir() for info in zip_ref.infolist()):
                     app.after(0, task_done, True, "Empty project")
                     return
-                for i, info in enumerate(file_list, start=1):
-                    app.after(0, lambda f=info.filename, c=i, t=total_files: file_status_label.configure(text=f"Extracting {f} ({c}/{t})"))
-                    zip_ref.extract(info, IMPORT_DESTINATION)
-                    progress = i / total_files
-                    app.after(0, lambda p=progress: progress_bar.set(p))
-            app.after(0, task_done)
+            def on_progress(desc, count, total):
+                app.after(0, lambda d=desc, c=count, t=total: file_status_label.configure(text=f"{d} ({c}/{t})"))
+                app.after(0, lambda p=count / total: progress_bar.set(p))
+            # Every CRC and member path is checked before the working directory is touched
+            result = Echo_archive.verify_archive(zip_path, progress=on_progress)
+            if result["errors"]:
+                print("[Echo Hub] Archive failed verification:")
+                print(Echo_archive.format_verify_errors(result["errors"], limit=None))
+                message = (f"The archive is damaged or unsafe, nothing was changed.\n\n"
+                           f"{Echo_archive.format_verify_errors(result['errors'], limit=3)}")
+                app.after(0, task_done, False, message)
+                return
+            app.after(0, lambda: file_status_label.configure(text="Taking snapshot..."))
+            take_snapshot("import")
+            app.after(0, lambda: file_status_label.configure(text="Comparing with working directory..."))
+            # Delta import: only new or changed members are extracted, stale files are removed
+            plan = Echo_archive.delta_import(zip_path, IMPORT_DESTINATION, progress=on_progress)
+            print("[Echo Hub] Import changes:")
+            print(Echo_archive.format_delta_plan(plan, limit=None))
+            message = f"Project imported successfully!\n\n{Echo_archive.format_delta_plan(plan, limit=3)}"
+            app.after(0, task_done, True, message)
         except Exception as e:
             app.after(0, task_done, False, str(e))
     threading.Thread(target=import_task, daemon=True).start()
 
 def export_zip():
+    import Echo_library
     zip_path = filedialog.asksaveasfilename(defaultextension=".echo",
                                             filetypes=[("Echo Project", "*.echo")])
     if not zip_path:
         return
-    for btn in (copy_btn, import_btn, export_btn, open_btn, clear_btn):
+    for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
         btn.configure(state='disabled')
     status_label.configure(text="Exporting project...")
     show_progress_indicators()
     def task_done(success=True, message="Project exported successfully!"):
         hide_progress_indicators()
-        for btn in (copy_btn, import_btn, export_btn, open_btn, clear_btn):
+        for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
             btn.configure(state='normal')
         if success:
-            show_custom_message("Success", message)
+            show_custom_message("Success", message, width=460, height=220)
         else:
             show_custom_message("Error", message, is_error=True)
     def export_task():
         try:
-            file_paths = []
-            for root, _, files in os.walk(EXPORT_SOURCE):
-                for file in files:
-                    full_path = os.path.join(root, file)
-                    arcname = os.path.relpath(full_path, EXPORT_SOURCE)
-                    file_paths.append((full_path, arcname))
-            total_files = len(file_paths)
-            if not total_files:
+            def on_progress(arcname, count, total):
+                app.after(0, lambda a=arcname, c=count, t=total: file_status_label.configure(text=f"Adding {a} ({c}/{t})"))
+                app.after(0, lambda p=count / total: progress_bar.set(p))
+            policy = Echo_archive.make_policy(EXPORT_COMPRESSION_PRESET)
+            summary = Echo_archive.export_archive(EXPORT_SOURCE, zip_path, progress=on_progress, policy=policy,
+                                                  engine_version=VERSION)
+            if not summary["files"]:
                 app.after(0, task_done, True, "No project found")
                 return
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_ref:
-                for i, (full_path, arcname) in enumerate(file_paths, start=1):
-                    app.after(0, lambda a=arcname, c=i, t=total_files: file_status_label.configure(text=f"Adding {a} ({c}/{t})"))
-                    zip_ref.write(full_path, arcname)
-                    progress = i / total_files
-                    app.after(0, lambda p=progress: progress_bar.set(p))
-            app.after(0, task_done)
+            print(f"[Echo Hub] Export summary ({EXPORT_COMPRESSION_PRESET}, {summary['seconds']:.2f}s, "
+                  f"{summary['reused']}/{summary['files']} members reused from the previous export):")
+            print(Echo_archive.format_summary(summary))
+            Echo_library.add_recent(zip_path)
+            message = (f"Project exported successfully in {summary['seconds']:.1f}s!\n\n"
+                       f"{Echo_archive.format_summary(summary, limit=3)}")
+            app.after(0, task_done, True, message)
         except Exception as e:
             app.after(0, task_done, False, str(e))
     threading.Thread(target=export_task, daemon=True).start()
 
 def open_project():
     global EDITOR_PATH
+    import Echo_process
     if not os.path.exists(EDITOR_PATH):
         show_custom_message("Error", f"Editor not found at:\n{EDITOR_PATH}", is_error=True)
         return
     try:
-        subprocess.Popen(EDITOR_PATH)
+        Echo_process.launch([EDITOR_PATH], "editor")
         app.destroy()
     except Exception as e:
         show_custom_message("Error", str(e), is_error=True)
 
 def open_ascii_generator():
     global ASCII_ART_GENERATOR_PATH
+    import Echo_process
     if not os.path.exists(ASCII_ART_GENERATOR_PATH):
         show_custom_message("Error", f"ASCII Art Generator not found at:\n{ASCII_ART_GENERATOR_PATH}", is_error=True)
         return
     try:
         # Launch the executable without waiting for it to finish
         full_path = os.path.abspath(ASCII_ART_GENERATOR_PATH)
-        subprocess.Popen([full_path])
+        Echo_process.launch([full_path], "ascii")
         app.destroy()
     except Exception as e:
         show_custom_message("Error", f"Failed to open ASCII Art Generator: {str(e)}", is_error=True)
@@ -344,96 +384,347 @@ def open_ascii_generator():
 def check_for_update():
     def check_task():
         try:
-            url = "https://api.github.com/repos/DirectedHunt42/EchoEngine/releases/latest"
-            req = urllib.request.Request(url, headers={'User-Agent': 'EchoHub', 'Accept': 'application/vnd.github.v3+json'})
-            with urllib.request.urlopen(req) as response:
-                data = json.loads(response.read().decode('utf-8'))
+            import Echo_updater
+            # Cached on disk with a TTL, then revalidated with ETag/Last-Modified
+            data, source = Echo_updater.fetch_latest_release()
+            print(f"[Echo Hub] Update check: {source}")
             app.after(0, lambda d=data: do_update_confirm(d))
-        except:
-            pass
+        except Exception as e:
+            print(f"[Echo Hub] Update check failed: {e}")
     threading.Thread(target=check_task, daemon=True).start()
 
 def do_update_confirm(data):
+    import Echo_updater
     try:
-        title = data.get('name', '')
-        if title.startswith("Release "):
-            new_ver = title[len("Release "):].strip()
-        else:
+        new_ver = Echo_updater.release_version(data)
+        if not new_ver:
             return
         current_ver = VERSION
         current_t = version_tuple(current_ver)
         new_t = version_tuple(new_ver)
         if new_t > current_t:
             if ask_confirmation("Update Available", f"New version {new_ver} available (current {current_ver}).\nDownload and install?"):
-                export_zip()  # Auto-export current project before updating
                 download_and_install(data)
     except:
         pass
 
 def download_and_install(data):
     global os_name
+    import Echo_updater
     asset_name = None
-    run_command = None
     needs_chmod = False
 
     if os_name == 'windows':
         asset_name = WINDOWS_UPDATE_ASSET
-        run_command = [setup_file]
     elif os_name == 'darwin':
         asset_name = DARWIN_UPDATE_ASSET
-        run_command = ['open', setup_file]
     elif os_name == 'linux':
-        if shutil.which('dpkg'):
-            asset_name = UBUNTU_UPDATE_ASSET
-            run_command = ['xdg-open', setup_file]  # Opens .deb with installer
-        else:
-            asset_name = OTHER_LINUX_UPDATE_ASSET
-            run_command = ['sh', setup_file]
-            needs_chmod = True
+        asset_name = UBUNTU_UPDATE_ASSET if shutil.which('dpkg') else OTHER_LINUX_UPDATE_ASSET
+        needs_chmod = not shutil.which('dpkg')
     else:
         show_custom_message("Error", "Unsupported operating system.", is_error=True)
         return
 
-    assets = data.get('assets', [])
-    download_url = None
-    for asset in assets:
-        if asset['name'] == asset_name:
-            download_url = asset['browser_download_url']
-            break
-    if not download_url:
+    asset = next((a for a in data.get('assets', []) if a['name'] == asset_name), None)
+    if not asset:
         show_custom_message("Error", f"Update file '{asset_name}' not found for your OS.", is_error=True)
         return
 
     setup_file = os.path.join(os.path.dirname(sys.argv[0]), asset_name)
-    for btn in (copy_btn, import_btn, export_btn, open_btn, clear_btn):
+    if os_name == 'windows':
+        run_command = [setup_file]
+    elif os_name == 'darwin':
+        run_command = ['open', setup_file]
+    elif not needs_chmod:
+        run_command = ['xdg-open', setup_file]  # Opens .deb with installer
+    else:
+        run_command = ['sh', setup_file]
+    for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
         btn.configure(state='disabled')
     status_label.configure(text="Downloading update...")
     show_progress_indicators()
+    def task_failed(message):
+        hide_progress_indicators()
+        show_custom_message("Error", message, is_error=True)
+        for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
+            btn.configure(state='normal')
     def download_task():
         try:
-            def reporthook(count, block_size, total_size):
-                if total_size <= 0:
-                    app.after(0, file_status_label.configure(text="Downloading..."))
+            sha256 = Echo_updater.asset_sha256(data, asset)
+            if not sha256:
+                app.after(0, task_failed, f"No published checksum for '{asset_name}', the update was not installed.")
+                return
+            app.after(0, lambda: file_status_label.configure(text="Taking snapshot..."))
+            take_snapshot("update")  # Deduplicated, so usually only changed files are stored
+            def on_progress(done, total):
+                mb_done = done / (1024 ** 2)
+                if not total:
+                    app.after(0, lambda m=mb_done: file_status_label.configure(text=f"Downloading ({m:.2f} MB)"))
                     return
-                progress = min(1.0, float(count * block_size) / total_size)
-                mb_done = (count * block_size) / (1024 ** 2)
-                mb_total = total_size / (1024 ** 2)
-                app.after(0, file_status_label.configure(text=f"Downloading ({mb_done:.2f}/{mb_total:.2f} MB)"))
-                app.after(0, lambda p=progress: progress_bar.set(p))
-            urllib.request.urlretrieve(download_url, setup_file, reporthook)
+                mb_total = total / (1024 ** 2)
+                app.after(0, lambda m=mb_done, t=mb_total: file_status_label.configure(text=f"Downloading ({m:.2f}/{t:.2f} MB)"))
+                app.after(0, lambda p=min(1.0, done / total): progress_bar.set(p))
+            # Resumes a .part left by an interrupted download and checks the SHA-256 before anything runs
+            Echo_updater.download_file(asset['browser_download_url'], setup_file, sha256=sha256, progress=on_progress)
             if needs_chmod:
                 os.chmod(setup_file, 0o755)
             app.after(0, hide_progress_indicators)
-            app.after(0, lambda: show_custom_message("Update Ready", "Update downloaded. Installing..."))
+            app.after(0, lambda: show_custom_message("Update Ready", "Update downloaded and verified. Installing..."))
             subprocess.Popen(run_command)
             app.after(100, app.destroy)
         except Exception as e:
-            app.after(0, hide_progress_indicators)
-            app.after(0, lambda: show_custom_message("Error", str(e), is_error=True))
-            for btn in (copy_btn, import_btn, export_btn, open_btn, clear_btn):
-                btn.configure(state='normal')
+            app.after(0, task_failed, str(e))
     threading.Thread(target=download_task, daemon=True).start()
 
+# ---------- Workspaces ----------
+def switch_workspace(name):
+    if name == Echo_workspace.get_active():
+        return
+    close_engine_processes()
+    try:
+        Echo_workspace.switch_workspace(name)
+    except Exception as e:
+        show_custom_message("Error", f"Could not switch workspace:\n{e}", is_error=True)
+    refresh_workspaces()
+    update_project_title()
+
+def new_workspace():
+    dialog = ctk.CTkInputDialog(title="New Workspace", text="Workspace name:")
+    name = dialog.get_input()
+    if not name:
+        return
+    try:
+        Echo_workspace.create_workspace(name.strip())
+    except Exception as e:
+        show_custom_message("Error", str(e), is_error=True)
+        return
+    switch_workspace(name.strip())
+
+def refresh_workspaces():
+    names = Echo_workspace.list_workspaces()
+    workspace_menu.configure(values=names)
+    workspace_menu.set(names[0])
+
+# ---------- Project Library ----------
+def open_library():
+    import Echo_library
+    win = ctk.CTkToplevel(app)
+    win.title("Project Library")
+    win.geometry("560x620")
+    win.transient(app)
+    ctk.CTkLabel(win, text="Recent Projects", font=("Segoe UI", 14, "bold")).pack(pady=(15, 5))
+    recent_frame = ctk.CTkFrame(win, fg_color="transparent")
+    recent_frame.pack(fill="x", padx=20)
+    folders_header = ctk.CTkFrame(win, fg_color="transparent")
+    folders_header.pack(fill="x", padx=20, pady=(15, 5))
+    ctk.CTkLabel(folders_header, text="Library Folders", font=("Segoe UI", 14, "bold")).pack(side="left")
+    folders_frame = ctk.CTkFrame(win, fg_color="transparent")
+    folders_frame.pack(fill="x", padx=20)
+    projects_frame = ctk.CTkScrollableFrame(win)
+    projects_frame.pack(expand=True, fill="both", padx=20, pady=10)
+    library_status = ctk.CTkLabel(win, text="", font=("Segoe UI", 10), text_color="gray")
+    library_status.pack(pady=(0, 10))
+
+    def open_entry(path):
+        win.destroy()
+        import_project(path)
+
+    def add_project_button(parent, entry):
+        ctk.CTkButton(parent, text=Echo_library.format_entry(entry), anchor="w",
+                      command=lambda p=entry["path"]: open_entry(p),
+                      height=30, corner_radius=8, fg_color=btn_color,
+                      state="normal" if "info" in entry else "disabled").pack(fill="x", pady=2)
+
+    def show_recent():
+        for child in recent_frame.winfo_children():
+            child.destroy()
+        entries = Echo_library.recent_entries()
+        if not entries:
+            ctk.CTkLabel(recent_frame, text="No recent projects", text_color="gray").pack()
+        for entry in entries:
+            add_project_button(recent_frame, entry)
+
+    def show_folders():
+        for child in folders_frame.winfo_children():
+            child.destroy()
+        folders = Echo_library.load_settings()["folders"]
+        if not folders:
+            ctk.CTkLabel(folders_frame, text="Add a folder to list the projects inside it",
+                         text_color="gray").pack()
+        for folder in folders:
+            row = ctk.CTkFrame(folders_frame, fg_color="transparent")
+            row.pack(fill="x")
+            ctk.CTkLabel(row, text=folder, anchor="w").pack(side="left", fill="x", expand=True)
+            ctk.CTkButton(row, text="Remove", width=70, height=24,
+                          command=lambda f=folder: (Echo_library.remove_folder(f), show_folders(), rescan())).pack(side="right")
+
+    def show_projects(entries, stats):
+        if not win.winfo_exists():
+            return
+        for child in projects_frame.winfo_children():
+            child.destroy()
+        for entry in entries:
+            add_project_button(projects_frame, entry)
+        library_status.configure(text=f"{stats['found']} projects ({stats['read']} read, "
+                                      f"{stats['found'] - stats['read']} cached) in {stats['seconds']:.2f}s")
+
+    def rescan():
+        folders = Echo_library.load_settings()["folders"]
+        library_status.configure(text="Scanning...")
+        def scan_task():
+            try:
+                entries, stats = Echo_library.scan_library(folders)
+                app.after(0, show_projects, entries, stats)
+            except Exception as e:
+                app.after(0, lambda m=str(e): library_status.configure(text=f"Scan failed: {m}"))
+        threading.Thread(target=scan_task, daemon=True).start()
+
+    def add_folder():
+        folder = filedialog.askdirectory(parent=win)
+        if folder:
+            Echo_library.add_folder(folder)
+            show_folders()
+            rescan()
+
+    ctk.CTkButton(folders_header, text="Rescan", width=80, command=rescan).pack(side="right", padx=(5, 0))
+    ctk.CTkButton(folders_header, text="Add Folder", width=90, command=add_folder).pack(side="right")
+    show_recent()
+    show_folders()
+    rescan()
+
+# ---------- Runtime Repair ----------
+def repair_runtime():
+    import Echo_runtime
+    if not os.path.isdir(IMPORT_DESTINATION):
+        show_custom_message("Info", f"'{IMPORT_DESTINATION}' does not exist.")
+        return
+    for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
+        btn.configure(state='disabled')
+    status_label.configure(text="Checking runtime...")
+    show_progress_indicators()
+    def task_done(success=True, message="Runtime is up to date."):
+        hide_progress_indicators()
+        for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
+            btn.configure(state='normal')
+        if success:
+            show_custom_message("Success", message, width=460, height=220)
+        else:
+            show_custom_message("Error", message, is_error=True)
+    def repair_task(plan):
+        try:
+            app.after(0, lambda: file_status_label.configure(text="Taking snapshot..."))
+            take_snapshot("runtime-repair")
+            def on_progress(desc, count, total):
+                app.after(0, lambda d=desc, c=count, t=total: file_status_label.configure(text=f"{d} ({c}/{t})"))
+                app.after(0, lambda p=count / total: progress_bar.set(p))
+            Echo_runtime.repair_runtime(RUNTIME_SOURCE, IMPORT_DESTINATION, progress=on_progress, plan=plan)
+            print("[Echo Hub] Runtime repair:")
+            print(Echo_runtime.format_runtime_plan(plan, limit=None))
+            app.after(0, task_done, True, f"Runtime updated!\n\n{Echo_runtime.format_runtime_plan(plan, limit=3)}")
+        except Exception as e:
+            app.after(0, task_done, False, str(e))
+    def confirm(plan):
+        if not (plan["missing"] or plan["changed"] or plan["obsolete"]):
+            task_done(True, f"Runtime is up to date ({plan['unchanged']} files checked).")
+            return
+        if not ask_confirmation("Repair / Upgrade Runtime",
+                                f"{Echo_runtime.format_runtime_plan(plan, limit=3)}\n\n"
+                                "Update these engine files? Project content is not touched.",
+                                width=460, height=300):
+            task_done(True, "Runtime repair cancelled.")
+            return
+        close_engine_processes()
+        status_label.configure(text="Updating runtime...")
+        threading.Thread(target=repair_task, args=(plan,), daemon=True).start()
+    def plan_task():
+        try:
+            plan = Echo_runtime.plan_runtime_repair(RUNTIME_SOURCE, IMPORT_DESTINATION)
+            app.after(0, confirm, plan)
+        except Exception as e:
+            app.after(0, task_done, False, str(e))
+    threading.Thread(target=plan_task, daemon=True).start()
+
+# ---------- Snapshot Browser ----------
+def open_snapshots():
+    import Echo_snapshots
+    win = ctk.CTkToplevel(app)
+    win.title("Snapshots")
+    win.geometry("620x520")
+    win.transient(app)
+    ctk.CTkLabel(win, text="Snapshots", font=("Segoe UI", 14, "bold")).pack(pady=(15, 5))
+    snapshots_frame = ctk.CTkScrollableFrame(win)
+    snapshots_frame.pack(expand=True, fill="both", padx=20, pady=10)
+    footer = ctk.CTkFrame(win, fg_color="transparent")
+    footer.pack(fill="x", padx=20, pady=(0, 15))
+    snapshot_status = ctk.CTkLabel(footer, text="", font=("Segoe UI", 10), text_color="gray")
+    snapshot_status.pack(side="left")
+
+    def show_snapshots():
+        for child in snapshots_frame.winfo_children():
+            child.destroy()
+        snapshots = Echo_snapshots.list_snapshots()
+        if not snapshots:
+            ctk.CTkLabel(snapshots_frame, text="No snapshots yet", text_color="gray").pack()
+        for manifest in snapshots:
+            row = ctk.CTkFrame(snapshots_frame, fg_color="transparent")
+            row.pack(fill="x", pady=2)
+            ctk.CTkLabel(row, text=Echo_snapshots.format_snapshot(manifest), anchor="w",
+                         font=("Segoe UI", 11)).pack(side="left", fill="x", expand=True)
+            ctk.CTkButton(row, text="Restore", width=70, height=24,
+                          command=lambda m=manifest: restore(m)).pack(side="right")
+        snapshot_status.configure(text=f"{len(snapshots)} snapshots")
+
+    def restore(manifest):
+        if not ask_confirmation("Restore Snapshot",
+                                f"Restore {Echo_snapshots.format_snapshot(manifest)}\ninto the active workspace?\n\n"
+                                "A snapshot of the current files is taken first.", width=520, height=220):
+            return
+        win.destroy()
+        restore_snapshot(manifest["id"])
+
+    def prune():
+        if not ask_confirmation("Prune Snapshots",
+                                f"Keep only the newest {Echo_snapshots.DEFAULT_KEEP} snapshots and delete the rest?"):
+            return
+        result = Echo_snapshots.prune_snapshots(Echo_snapshots.DEFAULT_KEEP)
+        show_snapshots()
+        snapshot_status.configure(text=f"Removed {result['snapshots']} snapshots, "
+                                       f"freed {Echo_archive.format_size(result['freed'])}")
+
+    ctk.CTkButton(footer, text="Prune", width=80, command=prune).pack(side="right")
+    show_snapshots()
+
+def restore_snapshot(snapshot_id):
+    import Echo_snapshots
+    close_engine_processes()
+    for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
+        btn.configure(state='disabled')
+    status_label.configure(text="Restoring snapshot...")
+    show_progress_indicators()
+    def task_done(success=True, message="Snapshot restored successfully!"):
+        hide_progress_indicators()
+        for btn in (copy_btn, import_btn, library_btn, export_btn, runtime_btn, open_btn, clear_btn, workspace_menu):
+            btn.configure(state='normal')
+        update_project_title()
+        if success:
+            show_custom_message("Success", message)
+        else:
+            show_custom_message("Error", message, is_error=True)
+    def restore_task():
+        try:
+            app.after(0, lambda: file_status_label.configure(text="Taking snapshot..."))
+            take_snapshot("restore")
+            def on_progress(desc, count, total):
+                app.after(0, lambda d=desc, c=count, t=total: file_status_label.configure(text=f"{d} ({c}/{t})"))
+                app.after(0, lambda p=count / total: progress_bar.set(p))
+            result = Echo_snapshots.restore_snapshot(snapshot_id, IMPORT_DESTINATION, progress=on_progress)
+            message = (f"Snapshot restored successfully!\n\n{result['restored']} restored, "
+                       f"{result['removed']} removed, {result['unchanged']} unchanged")
+            app.after(0, task_done, True, message)
+        except Exception as e:
+            app.after(0, task_done, False, str(e))
+    threading.Thread(target=restore_task, daemon=True).start()
+
 # ---------- Startup File Handling ----------
 def check_startup_file():
     if len(sys.argv) > 1:
@@ -444,6 +735,65 @@ def check_startup_file():
                 import_project(file_path)
             app.after(100, do_import)
 
+# ---------- Startup Timing ----------
+first_frame_seen = False
+
+def mark_startup(label):
+    STARTUP_MARKS.append((label, time.perf_counter() - STARTUP_STARTED))
+
+def report_startup():
+    """Prints the startup marks and logs them to Cache/Startup_timing.jsonl when
+    ECHO_HUB_TIMING is set. Per-module import costs come from `python -X importtime`."""
+    if not os.environ.get(STARTUP_TIMING_ENV):
+        return
+    marks = dict(STARTUP_MARKS)
+    tti = marks.get("interactive")
+    print("[Echo Hub] Startup timing:")
+    previous = 0.0
+    for label, seconds in STARTUP_MARKS:
+        print(f"  {label:<16} {seconds * 1000:8.1f} ms  (+{(seconds - previous) * 1000:.1f} ms)")
+        previous = seconds
+    if tti is not None:
+        verdict = "within" if tti <= TIME_TO_INTERACTIVE_TARGET else "OVER"
+        print(f"  Time to interactive {tti * 1000:.1f} ms, {verdict} the {TIME_TO_INTERACTIVE_TARGET * 1000:.0f} ms target")
+    try:
+        os.makedirs(os.path.dirname(STARTUP_TIMING_LOG), exist_ok=True)
+        with open(STARTUP_TIMING_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": time.time(), "target": TIME_TO_INTERACTIVE_TARGET,
+                                "marks": {label: round(seconds, 4) for label, seconds in STARTUP_MARKS}}) + "\n")
+    except OSError as e:
+        print(f"Could not write startup timing log: {e}")
+
+def on_first_map(event=None):
+    # <Map> also fires for every child widget, only the first one matters
+    global first_frame_seen
+    if first_frame_seen:
+        return
+    first_frame_seen = True
+    mark_startup("first frame")
+    app.after_idle(finish_startup)
+
+def finish_startup():
+    """Runs once the first frame is drawn and the event loop is idle, so none of this
+    delays the window appearing."""
+    mark_startup("interactive")
+    def load_task():
+        icon = resize_image(label_icon_path)
+        logo = resize_image(bottom_logo_path, max_size=128)
+        app.after(0, show_startup_images, icon, logo)
+    threading.Thread(target=load_task, daemon=True).start()
+    check_for_update()
+    check_startup_file()
+
+def show_startup_images(icon, logo):
+    for label, image in ((icon_label, icon), (logo_label, logo)):
+        if image is None:
+            label.pack_forget()
+        else:
+            label.configure(image=ctk.CTkImage(light_image=image, dark_image=image, size=image.size))
+    mark_startup("images shown")
+    report_startup()
+
 # ---------- App Setup ----------
 ctk.set_appearance_mode("dark")
 ctk.set_default_color_theme("dark-blue")
@@ -473,13 +823,23 @@ app.geometry(f"{app.winfo_width()}x{app.winfo_height()}+{x}+{y}")
 frame = ctk.CTkFrame(app, corner_radius=15)
 frame.pack(expand=True, fill="both", padx=20, pady=20)
 
-icon_ctk = load_resized_image(label_icon_path)
-if icon_ctk:
-    ctk.CTkLabel(frame, image=icon_ctk, text="").pack(pady=(10, 5))
+# Images are decoded after the first frame (see finish_startup), the label reserves their space
+icon_label = ctk.CTkLabel(frame, text="", height=64)
+icon_label.pack(pady=(10, 5))
 
 ctk.CTkLabel(frame, text="Echo Hub", font=("Segoe UI", 20, "bold")).pack(pady=(5, 5))
 project_title_label = ctk.CTkLabel(frame, text=get_game_title(), font=("Segoe UI", 14), text_color="#90caf9")  # Light blue color
-project_title_label.pack(pady=(0, 20))
+project_title_label.pack(pady=(0, 10))
+
+workspace_frame = ctk.CTkFrame(frame, fg_color="transparent")
+workspace_frame.pack(pady=(0, 10))
+ctk.CTkLabel(workspace_frame, text="Workspace:", font=("Segoe UI", 12)).pack(side=tk.LEFT, padx=(0, 5))
+workspace_menu = ctk.CTkOptionMenu(workspace_frame, values=[Echo_workspace.DEFAULT_WORKSPACE],
+                                   command=switch_workspace, width=160)
+workspace_menu.pack(side=tk.LEFT, padx=5)
+ctk.CTkButton(workspace_frame, text="New", command=new_workspace, width=60).pack(side=tk.LEFT, padx=5)
+ctk.CTkButton(workspace_frame, text="Snapshots", command=open_snapshots, width=90).pack(side=tk.LEFT, padx=5)
+refresh_workspaces()
 
 def update_project_title():
     project_title_label.configure(text=get_game_title())
@@ -495,6 +855,10 @@ import_btn = ctk.CTkButton(frame, text="Import Project", command=import_zip,
                            width=btn_width, height=btn_height, corner_radius=10, fg_color=btn_color)
 import_btn.pack(pady=10)
 
+library_btn = ctk.CTkButton(frame, text="Project Library", command=open_library,
+                            width=btn_width, height=btn_height, corner_radius=10, fg_color=btn_color)
+library_btn.pack(pady=10)
+
 open_btn = ctk.CTkButton(frame, text="Open Project in Editor", command=open_project,
                          width=btn_width, height=btn_height, corner_radius=10, fg_color=btn_color)
 open_btn.pack(pady=10)
@@ -503,6 +867,10 @@ export_btn = ctk.CTkButton(frame, text="Export Project", command=export_zip,
                            width=btn_width, height=btn_height, corner_radius=10, fg_color=btn_color)
 export_btn.pack(pady=10)
 
+runtime_btn = ctk.CTkButton(frame, text="Repair / Upgrade Runtime", command=repair_runtime,
+                            width=btn_width, height=btn_height, corner_radius=10, fg_color=btn_color)
+runtime_btn.pack(pady=10)
+
 clear_btn = ctk.CTkButton(frame, text="Clear Working Directory",
                           command=lambda: clear_folder(IMPORT_DESTINATION),
                           width=btn_width, height=btn_height, corner_radius=10, fg_color=btn_color)
@@ -521,17 +889,15 @@ progress_bar = ctk.CTkProgressBar(progress_frame, height=15)
 file_status_label = ctk.CTkLabel(progress_frame, text="", font=("Segoe UI", 10), text_color="gray")
 
 bottom_logo_path = os.path.join("Engine_editor", "Icons", "Nova_foundry", "Nova_foundry_wide_transparent.png")
-logo_ctk = load_resized_image(bottom_logo_path, max_size=128)
-if logo_ctk:
-    progress_frame.pack(pady=10, fill="x")
-    logo_label = ctk.CTkLabel(frame, image=logo_ctk, text="")
-    logo_label.pack(pady=10)
+progress_frame.pack(pady=10, fill="x")
+logo_label = ctk.CTkLabel(frame, text="")
+logo_label.pack(pady=10)
 
 # --- HYPERLINK SETUP ---
 LINK_URL = "https://buymeacoffee.com/novafoundry"
 
 def open_link(event):
-    # This function uses the imported `webbrowser` module from earlier
+    import webbrowser
     webbrowser.open_new_tab(LINK_URL)
 
 bottom_frame = ctk.CTkFrame(frame, fg_color="transparent")
@@ -557,6 +923,6 @@ link_label.bind("<Button-1>", open_link)
 
 # ---------- Start ----------
 hide_progress_indicators()
-check_for_update()
-check_startup_file()
+mark_startup("widgets built")
+app.bind("<Map>", on_first_map, add="+")
 app.mainloop()
\ No newline at end of file
@@ -0,0 +1,131 @@
+# Jack Murray
+# Nova Foundry / Echo Library
+# v1.4.0
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import Echo_archive
+
+# ---------- CONFIG ----------
+LIBRARY_SETTINGS_PATH = "Library.json"
+LIBRARY_INDEX_PATH = os.path.join(Echo_archive.CACHE_DIR, "Library_index.json")
+LIBRARY_INDEX_VERSION = 1
+PROJECT_EXTENSION = ".echo"
+MAX_RECENT = 10
+DEFAULT_JOBS = 16  # Scanning is I/O bound (often a network share), so use more threads than cores
+
+# ---------- Settings ----------
+def load_settings(path=LIBRARY_SETTINGS_PATH):
+    """Returns {"folders": [...], "recent": [...]}."""
+    settings = Echo_archive.read_json(path) or {}
+    return {"folders": list(settings.get("folders", [])), "recent": list(settings.get("recent", []))}
+
+def save_settings(settings, path=LIBRARY_SETTINGS_PATH):
+    Echo_archive.write_json_atomic(path, settings)
+
+def add_folder(folder, path=LIBRARY_SETTINGS_PATH):
+    settings = load_settings(path)
+    folder = os.path.abspath(folder)
+    if folder not in settings["folders"]:
+        settings["folders"].append(folder)
+        save_settings(settings, path)
+    return settings
+
+def remove_folder(folder, path=LIBRARY_SETTINGS_PATH):
+    settings = load_settings(path)
+    settings["folders"] = [f for f in settings["folders"] if f != folder]
+    save_settings(settings, path)
+    return settings
+
+def add_recent(project_path, path=LIBRARY_SETTINGS_PATH):
+    """Moves project_path to the front of the recent-projects list."""
+    settings = load_settings(path)
+    project_path = os.path.abspath(project_path)
+    settings["recent"] = ([project_path] + [p for p in settings["recent"] if p != project_path])[:MAX_RECENT]
+    save_settings(settings, path)
+    return settings
+
+# ---------- Scanning ----------
+def find_projects(folder):
+    """Returns (path, size, mtime_ns) for every .echo file below folder."""
+    found = []
+    pending = [folder]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.lower().endswith(PROJECT_EXTENSION) and entry.is_file():
+                        st = entry.stat()
+                        found.append((os.path.abspath(entry.path), st.st_size, st.st_mtime_ns))
+        except OSError as e:
+            print(f"Could not scan {current}: {e}")
+    return found
+
+def read_entry(path, size, mtime_ns):
+    entry = {"path": path, "size": size, "mtime_ns": mtime_ns}
+    try:
+        info = Echo_archive.read_project_info(path)
+        info.pop("thumbnail", None)  # Keeps the index small; read on demand instead
+        entry["info"] = info
+    except Exception as e:
+        entry["error"] = str(e)
+    return entry
+
+def scan_library(folders, jobs=DEFAULT_JOBS, index_path=LIBRARY_INDEX_PATH):
+    """Scans folders in parallel and returns (entries, stats).
+
+    Entries are cached in a persistent index keyed by path, size and mtime, so only new
+    or changed archives are opened. Each entry has "path", "size", "mtime_ns" and either
+    "info" (see Echo_archive.read_project_info) or "error". stats reports how many
+    archives were found, how many were read and the time taken.
+    """
+    started = time.perf_counter()
+    index = Echo_archive.read_json(index_path) or {}
+    cached = index.get("projects", {}) if index.get("version") == LIBRARY_INDEX_VERSION else {}
+    jobs = max(1, jobs)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # Overlapping folders (one inside another) find the same archive more than once
+        found = {}
+        for result in pool.map(find_projects, folders):
+            for item in result:
+                found.setdefault(os.path.normcase(os.path.abspath(item[0])), item)
+        projects = {}
+        stale = []
+        for path, size, mtime_ns in found.values():
+            entry = cached.get(path)
+            if entry and entry["size"] == size and entry["mtime_ns"] == mtime_ns:
+                projects[path] = entry
+            else:
+                stale.append((path, size, mtime_ns))
+        for entry in pool.map(lambda item: read_entry(*item), stale):
+            projects[entry["path"]] = entry
+    # Anything not found this time (deleted, or its folder was removed) drops out of the index
+    Echo_archive.write_json_atomic(index_path, {"version": LIBRARY_INDEX_VERSION, "projects": projects})
+    entries = sorted(projects.values(), key=lambda e: ("info" not in e, e.get("info", {}).get("title", "").lower()))
+    stats = {"found": len(found), "read": len(stale), "seconds": time.perf_counter() - started}
+    return entries, stats
+
+def recent_entries(settings_path=LIBRARY_SETTINGS_PATH, index_path=LIBRARY_INDEX_PATH):
+    """Index entries for the recent projects, reading only those that changed since the last scan."""
+    index = Echo_archive.read_json(index_path) or {}
+    cached = index.get("projects", {}) if index.get("version") == LIBRARY_INDEX_VERSION else {}
+    entries = []
+    for path in load_settings(settings_path)["recent"]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue  # Moved or deleted since it was opened
+        entry = cached.get(path)
+        if not (entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns):
+            entry = read_entry(path, st.st_size, st.st_mtime_ns)
+        entries.append(entry)
+    return entries
+
+def format_entry(entry):
+    if "info" in entry:
+        return Echo_archive.format_project_info(entry["info"])
+    return f"{os.path.basename(entry['path'])}: unreadable ({entry.get('error', 'unknown error')})"
@@ -0,0 +1,597 @@
+# Jack Murray
+# Nova Foundry / Echo Model
+# v1.4.0
+
+import os
+import shutil
+from collections import deque
+
+# ---------- CONFIG ----------
+TUTORIAL_FIELDS = ("name", "desc", "findable_items")
+MAIN_FIELDS = TUTORIAL_FIELDS + ("usable_item", "item_used_text", "item_found", "damage_text")
+START_ROOM = (0, 0, 0)  # (floor, y, x) of the room every game starts in
+# Exit name and (floor, y, x) offset, in the order Exits.txt lists them
+EXITS = (("north", (0, -1, 0)), ("south", (0, 1, 0)), ("east", (0, 0, 1)), ("west", (0, 0, -1)),
+         ("up", (1, 0, 0)), ("down", (-1, 0, 0)))
+FLAT_EXITS = EXITS[:4]
+DESCRIPTION_SEPARATOR = "-----"
+# Files the runner reads from a room folder, the only ones saving writes or removes
+ROOM_FILES = ("Description.txt", "Items.txt", "Exits.txt", "Strange_occerance.txt", "Usable_Items.txt")
+
+# ---------- Room ----------
+class Room:
+    """The text of one room. Slots keep a few thousand of these small."""
+    __slots__ = MAIN_FIELDS
+
+    def __init__(self, name="Room", desc="", findable_items="", usable_item="", item_used_text="",
+                 item_found="", damage_text=""):
+        self.name = name
+        self.desc = desc
+        self.findable_items = findable_items
+        self.usable_item = usable_item
+        self.item_used_text = item_used_text
+        self.item_found = item_found
+        self.damage_text = damage_text
+
+    def get(self, field, default=""):
+        return getattr(self, field, default)
+
+    def copy(self):
+        return Room(*(getattr(self, field) for field in MAIN_FIELDS))
+
+    def is_complete(self, fields):
+        return all(getattr(self, field).strip() for field in fields)
+
+    def __eq__(self, other):
+        return isinstance(other, Room) and all(getattr(self, f) == getattr(other, f) for f in MAIN_FIELDS)
+
+    def __repr__(self):
+        return f"Room({self.name!r})"
+
+# ---------- Room Map ----------
+class RoomMap:
+    """Sparse rooms keyed by (floor, y, x), so cost follows the number of rooms, not grid area.
+
+    Listeners registered with subscribe are called as listener(event, key, room) after
+    every edit: "add", "remove" and "change" carry the room's key, "floors" (floors added,
+    removed or reordered) carries the floors below floor_count whose rooms moved, and
+    "reset" (everything replaced) carries None.
+    """
+
+    def __init__(self, fields=MAIN_FIELDS, vertical=True):
+        self.fields = fields
+        self.vertical = vertical  # Floors and up/down exits; the tutorial is a single floor
+        self.rooms = {}
+        self.by_floor = {}  # floor -> {(y, x), ...}
+        self.floor_count = 1
+        self.listeners = []
+
+    def subscribe(self, listener):
+        self.listeners.append(listener)
+        return listener
+
+    def unsubscribe(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def notify(self, event, key=None, room=None):
+        for listener in list(self.listeners):
+            listener(event, key, room)
+
+    def __len__(self):
+        return len(self.rooms)
+
+    def __contains__(self, key):
+        return key in self.rooms
+
+    def __iter__(self):
+        return iter(self.rooms)
+
+    def get(self, key):
+        return self.rooms.get(key)
+
+    def floor_rooms(self, floor):
+        """(y, x) of every room on floor."""
+        return self.by_floor.get(floor, ())
+
+    def add_room(self, key, room=None):
+        if key in self.rooms:
+            return self.rooms[key]
+        room = room or Room()
+        self.rooms[key] = room
+        self.by_floor.setdefault(key[0], set()).add(key[1:])
+        self.floor_count = max(self.floor_count, key[0] + 1)
+        self.notify("add", key, room)
+        return room
+
+    def remove_room(self, key):
+        room = self.rooms.pop(key, None)
+        if room is None:
+            return None
+        self.by_floor[key[0]].discard(key[1:])
+        self.notify("remove", key, room)
+        return room
+
+    def set_field(self, key, field, value):
+        """Sets one field of a room. Returns True if the value changed."""
+        room = self.rooms.get(key)
+        if room is None or getattr(room, field) == value:
+            return False
+        setattr(room, field, value)
+        self.notify("change", key, room)
+        return True
+
+    def exit_offsets(self):
+        return EXITS if self.vertical else FLAT_EXITS
+
+    def neighbours(self, key):
+        """(exit name, key) for every room reachable in one step from key."""
+        f, y, x = key
+        found = []
+        for name, (df, dy, dx) in self.exit_offsets():
+            other = (f + df, y + dy, x + dx)
+            if other in self.rooms:
+                found.append((name, other))
+        return found
+
+    def exits(self, key):
+        return [name for name, _ in self.neighbours(key)]
+
+    # ----- Floors -----
+    def rekey(self, mapping):
+        """Moves every room to mapping(floor), dropping rooms whose floor maps to None."""
+        rooms = {}
+        for (f, y, x), room in self.rooms.items():
+            new_floor = mapping(f)
+            if new_floor is not None:
+                rooms[(new_floor, y, x)] = room
+        self.rooms = rooms
+        self.by_floor = {}
+        for f, y, x in rooms:
+            self.by_floor.setdefault(f, set()).add((y, x))
+
+    def add_floor(self):
+        self.floor_count += 1
+        self.notify("floors", ())
+        return self.floor_count - 1
+
+    def remove_floors_from(self, floor):
+        """Removes floor and every floor above it, keeping at least one floor."""
+        floor = max(1, floor)
+        self.rekey(lambda f: f if f < floor else None)
+        self.floor_count = min(self.floor_count, floor)
+        self.notify("floors", ())
+
+    def move_floor(self, old, new):
+        if old == new:
+            return
+        order = list(range(self.floor_count))
+        order.insert(new, order.pop(old))
+        position = {floor: index for index, floor in enumerate(order)}
+        self.rekey(position.get)
+        self.notify("floors", tuple(range(min(old, new), max(old, new) + 1)))
+
+    def replace(self, rooms, floor_count=1):
+        """Replaces everything with rooms, a {key: Room} dict."""
+        self.rooms = {}
+        self.by_floor = {}
+        for key, room in rooms.items():
+            self.rooms[key] = room
+            self.by_floor.setdefault(key[0], set()).add(key[1:])
+        self.floor_count = max([floor_count] + [f + 1 for f, _, _ in rooms])
+        self.notify("reset")
+
+# ---------- Frontier ----------
+class Frontier:
+    """Empty cells a room can be added to: next to a room on the same floor ("adjacent")
+    or directly above or below one ("vertical").
+
+    Kept up to date from RoomMap notifications with a neighbour count per cell, so adding
+    or removing a room costs O(1). Cells whose kind changed since the last pop_changes
+    are collected there, so a view only redraws those.
+    """
+
+    def __init__(self, room_map):
+        self.room_map = room_map
+        self.counts = {}    # key -> [rooms beside it on its floor, rooms above and below]
+        self.by_floor = {}  # floor -> {(y, x): kind}
+        self.changed = set()
+        self.rebuild()
+        room_map.subscribe(self.on_event)
+
+    def kind(self, key):
+        """"adjacent", "vertical" or None if a room cannot be added at key."""
+        return self.by_floor.get(key[0], {}).get(key[1:])
+
+    def floor_cells(self, floor):
+        """{(y, x): kind} for every frontier cell on floor."""
+        return self.by_floor.get(floor, {})
+
+    def pop_changes(self):
+        changed, self.changed = self.changed, set()
+        return changed
+
+    def refresh(self, key):
+        counts = self.counts.get(key)
+        if key in self.room_map or not counts:
+            kind = None
+        else:
+            kind = "adjacent" if counts[0] else "vertical"
+        cells = self.by_floor.setdefault(key[0], {})
+        if cells.get(key[1:]) != kind:
+            if kind is None:
+                del cells[key[1:]]
+            else:
+                cells[key[1:]] = kind
+            self.changed.add(key)
+
+    def adjust(self, key, delta):
+        f, y, x = key
+        for _, (df, dy, dx) in self.room_map.exit_offsets():
+            other = (f + df, y + dy, x + dx)
+            counts = self.counts.setdefault(other, [0, 0])
+            counts[1 if df else 0] += delta
+            if counts == [0, 0]:
+                del self.counts[other]
+            self.refresh(other)
+        self.refresh(key)
+
+    def rebuild(self):
+        """Recounts from scratch, for edits that move many rooms at once."""
+        self.changed.update((f,) + cell for f, cells in self.by_floor.items() for cell in cells)
+        self.counts = {}
+        self.by_floor = {}
+        for f, y, x in self.room_map:
+            for _, (df, dy, dx) in self.room_map.exit_offsets():
+                self.counts.setdefault((f + df, y + dy, x + dx), [0, 0])[1 if df else 0] += 1
+        for key in self.counts:
+            self.refresh(key)
+
+    def on_event(self, event, key, room):
+        if event == "add":
+            self.adjust(key, 1)
+        elif event == "remove":
+            self.adjust(key, -1)
+        elif event in ("floors", "reset"):
+            self.rebuild()
+
+# ---------- Connectivity ----------
+def reachable(room_map, start=START_ROOM, without=None):
+    """Keys of the rooms reachable from start, treating without as if it were not there."""
+    if start not in room_map or start == without:
+        return set()
+    visited = {start}
+    queue = deque([start])
+    while queue:
+        for _, other in room_map.neighbours(queue.popleft()):
+            if other not in visited and other != without:
+                visited.add(other)
+                queue.append(other)
+    return visited
+
+def can_remove(room_map, key, start=START_ROOM):
+    """True if removing key leaves every other room reachable from start."""
+    if key == start or key not in room_map or len(room_map) <= 1:
+        return False
+    return len(reachable(room_map, start, without=key)) == len(room_map) - 1
+
+def articulation_points(room_map, start=START_ROOM):
+    """Tarjan's low-link DFS from start, iterative so large maps cannot hit the recursion
+    limit. Returns (rooms whose removal disconnects the map, rooms reachable from start)."""
+    if start not in room_map:
+        return set(), set()
+    disc = {start: 0}
+    low = {start: 0}
+    points = set()
+    root_children = 0
+    stack = [(start, None, iter(room_map.neighbours(start)))]
+    while stack:
+        node, parent, pending = stack[-1]
+        for _, other in pending:
+            if other == parent:
+                continue
+            if other in disc:
+                low[node] = min(low[node], disc[other])
+            else:
+                disc[other] = low[other] = len(disc)
+                stack.append((other, node, iter(room_map.neighbours(other))))
+                break
+        else:
+            stack.pop()
+            if parent is None:
+                continue
+            low[parent] = min(low[parent], low[node])
+            if parent == start:
+                root_children += 1
+            elif low[node] >= disc[parent]:
+                points.add(parent)
+    if root_children > 1:
+        points.add(start)
+    return points, set(disc)
+
+def removable_from(room_map, start, points, reached):
+    if len(room_map) <= 1 or start not in room_map:
+        return set()
+    unreachable = len(room_map) - len(reached)
+    if unreachable == 1:
+        return set(room_map) - reached  # Only removing the stray room reconnects the map
+    if unreachable:
+        return set()
+    return reached - points - {start}
+
+def removable_rooms(room_map, start=START_ROOM):
+    """Every key for which can_remove is True, in one O(rooms + exits) pass."""
+    points, reached = articulation_points(room_map, start)
+    return removable_from(room_map, start, points, reached)
+
+class Removability:
+    """removable_rooms kept current for a RoomMap.
+
+    A room added beside exactly one room of a connected map is a leaf: it becomes
+    removable and its neighbour stops being so, an O(1) update. Any other edit marks the
+    result stale and the next rooms() call recomputes it in one pass.
+    """
+
+    def __init__(self, room_map, start=START_ROOM):
+        self.room_map = room_map
+        self.start = start
+        self.removable = set()
+        self.connected = False
+        self.stale = True
+        room_map.subscribe(self.on_event)
+
+    def rooms(self):
+        if self.stale:
+            points, reached = articulation_points(self.room_map, self.start)
+            self.removable = removable_from(self.room_map, self.start, points, reached)
+            self.connected = bool(reached) and len(reached) == len(self.room_map)
+            self.stale = False
+        return self.removable
+
+    def on_event(self, event, key, room):
+        if event == "change":
+            return
+        if event == "add" and not self.stale and self.connected:
+            neighbours = self.room_map.neighbours(key)
+            if len(neighbours) == 1:
+                self.removable.add(key)
+                self.removable.discard(neighbours[0][1])
+                return
+        self.stale = True
+
+# ---------- Disk Layout ----------
+# Tutorial: <root>/y{Y}_x{X}/, main level: <root>/Floor_{F}/y{Y}_x{X}/, all 1-based. The map is
+# unbounded, so Y and X may have any number of digits and rooms north or west of the start
+# room come out as y0, y-1, ... which the runner builds the same way from its position
+def room_dir_name(y, x):
+    return f"y{y + 1}_x{x + 1}"
+
+def parse_room_dir_name(name):
+    """(y, x) from a y{Y}_x{X} folder name, or None."""
+    try:
+        y_str, x_str = name.split("_")
+        if y_str[:1] != "y" or x_str[:1] != "x":
+            return None
+        return int(y_str[1:]) - 1, int(x_str[1:]) - 1
+    except ValueError:
+        return None
+
+def floor_dir_name(floor):
+    return f"Floor_{floor + 1}"
+
+def room_path(root_dir, key, vertical):
+    f, y, x = key
+    if vertical:
+        return os.path.join(root_dir, floor_dir_name(f), room_dir_name(y, x))
+    return os.path.join(root_dir, room_dir_name(y, x))
+
+def read_text(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+def read_room_files(path):
+    """{file name: text} of the ROOM_FILES present in the room folder at path."""
+    files = {}
+    for name in ROOM_FILES:
+        file_path = os.path.join(path, name)
+        if os.path.exists(file_path):
+            files[name] = read_text(file_path)
+    return files
+
+def read_room(path, files=None):
+    files = read_room_files(path) if files is None else files
+    room = Room(name="")
+    if "Description.txt" in files:
+        content = files["Description.txt"].split(DESCRIPTION_SEPARATOR)
+        room.name = content[0].strip()
+        room.desc = DESCRIPTION_SEPARATOR.join(content[1:]).strip()
+    if "Items.txt" in files:
+        room.findable_items = ",".join(files["Items.txt"].splitlines())
+    if "Strange_occerance.txt" in files:
+        room.damage_text = files["Strange_occerance.txt"].strip()
+    if "Usable_Items.txt" in files:
+        # split, not splitlines, so empty trailing fields still count as lines
+        lines = files["Usable_Items.txt"].split("\n")
+        if len(lines) >= 3:
+            room.usable_item, room.item_used_text, room.item_found = lines[:3]
+    return room
+
+def room_files(room_map, key):
+    """{file name: text} the runner reads for the room at key. Files a room does not need
+    are left out rather than written empty."""
+    room = room_map.get(key)
+    files = {"Description.txt": f"{room.name}\n{DESCRIPTION_SEPARATOR}\n{room.desc}"}
+    if room.findable_items:
+        files["Items.txt"] = "\n".join(item.strip() for item in room.findable_items.split(","))
+    if room_map.vertical:
+        if room.damage_text:
+            files["Strange_occerance.txt"] = room.damage_text
+        if room.usable_item or room.item_used_text or room.item_found:
+            files["Usable_Items.txt"] = f"{room.usable_item}\n{room.item_used_text}\n{room.item_found}"
+    exits = room_map.exits(key)
+    if exits:
+        files["Exits.txt"] = "\n".join(exits)
+    return files
+
+def scan_rooms(root_dir, vertical, files=None):
+    """Returns ({key: Room}, floor_count) for the rooms saved under root_dir.
+
+    If files is a dict it is filled with {key: {file name: text}} as read from disk.
+    """
+    rooms = {}
+    floor_count = 1
+    if not os.path.isdir(root_dir):
+        return rooms, floor_count
+    if vertical:
+        floor_dirs = []
+        for name in os.listdir(root_dir):
+            if name.startswith("Floor_"):
+                try:
+                    floor_dirs.append((int(name.split("_")[1]) - 1, os.path.join(root_dir, name)))
+                except ValueError:
+                    pass
+    else:
+        floor_dirs = [(0, root_dir)]
+    for floor, floor_path in floor_dirs:
+        if floor < 0 or not os.path.isdir(floor_path):
+            continue
+        floor_count = max(floor_count, floor + 1)
+        for name in os.listdir(floor_path):
+            position = parse_room_dir_name(name)
+            path = os.path.join(floor_path, name)
+            if position and os.path.isdir(path):
+                key = (floor,) + position
+                room_files_read = read_room_files(path)
+                rooms[key] = read_room(path, room_files_read)
+                if files is not None:
+                    files[key] = room_files_read
+    return rooms, floor_count
+
+def load_rooms(room_map, root_dir, tracker=None):
+    """Loads the rooms under root_dir into room_map, and tells tracker what is on disk."""
+    files = {} if tracker else None
+    rooms, floor_count = scan_rooms(root_dir, room_map.vertical, files)
+    room_map.replace(rooms, floor_count)
+    if tracker:
+        tracker.loaded(files)
+
+# ---------- Incremental Save ----------
+class SaveTracker:
+    """Keeps the save folder of a RoomMap in step with it, touching only what changed.
+
+    disk mirrors the ROOM_FILES under the folder as {key: {file name: text}}, with None
+    for a room whose files are unknown. Edits mark rooms dirty, an add or remove also the
+    neighbours whose Exits.txt it changes. Floor edits move rooms between folders, so
+    they mark every room for comparison instead. Only files whose text differs from disk
+    are written and only removed rooms are deleted.
+    """
+    def __init__(self, room_map):
+        self.room_map = room_map
+        self.disk = {}
+        self.dirty = set()
+        self.full = True
+        room_map.subscribe(self.on_event)
+
+    def on_event(self, event, key, room):
+        if event in ("floors", "reset"):
+            self.full = True
+        elif event == "change":
+            self.dirty.add(key)
+        else:
+            self.dirty.add(key)
+            self.dirty.update(other for _, other in self.room_map.neighbours(key))
+
+    def loaded(self, files):
+        """Records files, as filled in by scan_rooms, as what is on disk now."""
+        self.disk = files
+        self.dirty.clear()
+        self.full = False
+
+    def take_changes(self):
+        """Everything that differs from disk, recorded as saved from here on.
+
+        Returns {"vertical", "floor_count", "rooms": {key: (files, old)}} where files is
+        None for a room to delete and old is what disk held, None if unknown. Pass the
+        result to write_changes(), and to failed() if that raises.
+        """
+        keys = set(self.room_map) | set(self.disk) if self.full else self.dirty
+        rooms = {}
+        for key in keys:
+            old = self.disk.get(key)
+            if key in self.room_map:
+                files = room_files(self.room_map, key)
+                if old == files:
+                    continue
+                self.disk[key] = files
+            elif key in self.disk:
+                files = None
+                del self.disk[key]
+            else:
+                continue
+            rooms[key] = (files, old)
+        self.dirty = set()
+        self.full = False
+        return {"vertical": self.room_map.vertical, "floor_count": self.room_map.floor_count, "rooms": rooms}
+
+    def failed(self, changes):
+        """Forgets what disk holds for the rooms of changes, so the next save redoes them."""
+        for key in changes["rooms"]:
+            self.disk[key] = None
+            self.dirty.add(key)
+
+    def save(self, root_dir, progress=None):
+        if not os.path.isdir(root_dir):
+            self.disk = {}
+            self.full = True
+        changes = self.take_changes()
+        try:
+            return write_changes(root_dir, changes, progress)
+        except Exception:
+            self.failed(changes)
+            raise
+
+def merge_changes(older, newer):
+    """One set of changes with the effect of writing older, then newer."""
+    rooms = dict(older["rooms"])
+    for key, (files, old) in newer["rooms"].items():
+        rooms[key] = (files, rooms[key][1] if key in rooms else old)
+    return {"vertical": newer["vertical"], "floor_count": newer["floor_count"], "rooms": rooms}
+
+def write_changes(root_dir, changes, progress=None):
+    """Applies SaveTracker.take_changes() output under root_dir.
+
+    progress(count, total) is called after each room. Returns {"rooms", "written",
+    "removed"}: rooms touched, files written and files or room folders removed.
+    """
+    vertical = changes["vertical"]
+    summary = {"rooms": len(changes["rooms"]), "written": 0, "removed": 0}
+    os.makedirs(root_dir, exist_ok=True)
+    if vertical:
+        for floor in range(changes["floor_count"]):
+            os.makedirs(os.path.join(root_dir, floor_dir_name(floor)), exist_ok=True)
+    for count, (key, (files, old)) in enumerate(sorted(changes["rooms"].items()), start=1):
+        path = room_path(root_dir, key, vertical)
+        if files is None:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+                summary["removed"] += 1
+        else:
+            os.makedirs(path, exist_ok=True)
+            for name, text in files.items():
+                if old is None or old.get(name) != text:
+                    with open(os.path.join(path, name), "w", encoding="utf-8") as out:
+                        out.write(text)
+                    summary["written"] += 1
+            for name in (ROOM_FILES if old is None else old):
+                if name not in files and os.path.exists(os.path.join(path, name)):
+                    os.remove(os.path.join(path, name))
+                    summary["removed"] += 1
+        if progress:
+            progress(count, len(changes["rooms"]))
+    if vertical:
+        # Floors past the end are left over from removed floors, their rooms are gone by now
+        for name in os.listdir(root_dir):
+            if name.startswith("Floor_") and name[6:].isdigit() and int(name[6:]) > changes["floor_count"]:
+                shutil.rmtree(os.path.join(root_dir, name))
+                summary["removed"] += 1
+    return summary
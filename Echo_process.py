@@ -0,0 +1,258 @@
+# Jack Murray
+# Nova Foundry / Echo Process
+# v1.4.0
+
+import os
+import sys
+import time
+import signal
+import subprocess
+import Echo_archive
+
+# ---------- CONFIG ----------
+# One small JSON file per launched process, so the hub, the editor and the runner they
+# start can share it without locking. Paths are relative to the hub directory.
+REGISTRY_DIR = os.path.join(Echo_archive.CACHE_DIR, "Processes")
+GRACE_TIMEOUT = 3.0  # Seconds a process gets to exit after a polite request
+KILL_TIMEOUT = 2.0
+POLL_INTERVAL = 0.05
+
+IS_WINDOWS = sys.platform.startswith("win")
+IS_LINUX = sys.platform.startswith("linux")
+STILL_ACTIVE = 259
+PROCESS_TERMINATE = 0x0001
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
+children = {}  # pid -> Popen for processes launched by this process, so they get reaped
+
+# ---------- Platform Probes ----------
+if IS_WINDOWS:
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+
+    def open_process(pid, access):
+        return kernel32.OpenProcess(access, False, pid)
+
+    def windows_pids():
+        """Every PID on the system, from EnumProcesses rather than spawning tasklist."""
+        size = 1024
+        while True:
+            pids = (wintypes.DWORD * size)()
+            needed = wintypes.DWORD()
+            if not kernel32.K32EnumProcesses(pids, ctypes.sizeof(pids), ctypes.byref(needed)):
+                return []
+            count = needed.value // ctypes.sizeof(wintypes.DWORD)
+            if count < size:
+                return list(pids[:count])
+            size *= 2
+
+    def windows_exe(pid):
+        """Full path of pid's executable, or None if it is gone or not ours to query."""
+        handle = open_process(pid, PROCESS_QUERY_LIMITED_INFORMATION)
+        if not handle:
+            return None
+        try:
+            buffer = ctypes.create_unicode_buffer(32768)
+            size = wintypes.DWORD(len(buffer))
+            if not kernel32.QueryFullProcessImageNameW(handle, 0, buffer, ctypes.byref(size)):
+                return None
+            return buffer.value
+        finally:
+            kernel32.CloseHandle(handle)
+
+def linux_stat(pid):
+    """Returns (state, start_time) from /proc/<pid>/stat, or None if there is no such process."""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            data = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses, the fields after the last ')' do not
+    fields = data[data.rindex(")") + 2:].split()
+    return fields[0], fields[19]
+
+def start_time(pid):
+    """An opaque process start time used to tell a tracked process from a reused PID."""
+    if IS_LINUX:
+        stat = linux_stat(pid)
+        return stat[1] if stat else None
+    if IS_WINDOWS:
+        handle = open_process(pid, PROCESS_QUERY_LIMITED_INFORMATION)
+        if not handle:
+            return None
+        try:
+            creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+            if not kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exit_time),
+                                            ctypes.byref(kernel), ctypes.byref(user)):
+                return None
+            return str((creation.dwHighDateTime << 32) | creation.dwLowDateTime)
+        finally:
+            kernel32.CloseHandle(handle)
+    return None  # macOS has no cheap equivalent without spawning ps
+
+def is_alive(pid, started=None):
+    if pid in children and children[pid].poll() is not None:
+        del children[pid]
+        return False
+    if IS_LINUX:
+        stat = linux_stat(pid)
+        if not stat or stat[0] in ("Z", "X"):
+            return False
+        return started is None or stat[1] == started
+    if IS_WINDOWS:
+        handle = open_process(pid, PROCESS_QUERY_LIMITED_INFORMATION)
+        if not handle:
+            return False
+        try:
+            code = wintypes.DWORD()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)) or code.value != STILL_ACTIVE:
+                return False
+        finally:
+            kernel32.CloseHandle(handle)
+        return started is None or start_time(pid) == started
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def request_exit(pid):
+    if IS_WINDOWS:
+        # Without /F taskkill asks the window to close, the only polite request Windows offers
+        subprocess.run(["taskkill", "/PID", str(pid)], capture_output=True, check=False)
+    else:
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except OSError:
+            pass
+
+def force_exit(pid):
+    if IS_WINDOWS:
+        handle = open_process(pid, PROCESS_TERMINATE)
+        if handle:
+            kernel32.TerminateProcess(handle, 1)
+            kernel32.CloseHandle(handle)
+    else:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+def wait_for_exit(entries, timeout):
+    """Waits until every entry has exited or timeout passes. Returns those still alive."""
+    deadline = time.monotonic() + timeout
+    alive = [e for e in entries if is_alive(e["pid"], e.get("started"))]
+    while alive and time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        alive = [e for e in alive if is_alive(e["pid"], e.get("started"))]
+    return alive
+
+# ---------- Registry ----------
+def entry_path(pid, registry_dir=REGISTRY_DIR):
+    return os.path.join(registry_dir, f"{pid}.json")
+
+def register(pid, role, path, registry_dir=REGISTRY_DIR):
+    entry = {"pid": pid, "role": role, "path": os.path.abspath(path),
+             "started": start_time(pid), "launched": time.time()}
+    Echo_archive.write_json_atomic(entry_path(pid, registry_dir), entry)
+    return entry
+
+def unregister(pid, registry_dir=REGISTRY_DIR):
+    try:
+        os.remove(entry_path(pid, registry_dir))
+    except OSError:
+        pass
+
+def launch(args, role, cwd=None, registry_dir=REGISTRY_DIR):
+    """Starts args like subprocess.Popen and records the process under role."""
+    process = subprocess.Popen(args, cwd=cwd)
+    children[process.pid] = process
+    register(process.pid, role, args[0] if isinstance(args, (list, tuple)) else args, registry_dir)
+    return process
+
+def tracked(roles=None, registry_dir=REGISTRY_DIR):
+    """Live tracked processes, optionally limited to roles. Entries for processes that
+    have exited, or whose PID now belongs to another process, are dropped."""
+    if not os.path.isdir(registry_dir):
+        return []
+    entries = []
+    for name in os.listdir(registry_dir):
+        if not name.endswith(".json"):
+            continue
+        entry = Echo_archive.read_json(os.path.join(registry_dir, name))
+        if not entry:
+            continue
+        if not is_alive(entry["pid"], entry.get("started")):
+            unregister(entry["pid"], registry_dir)
+        elif roles is None or entry["role"] in roles:
+            entries.append(entry)
+    return entries
+
+def status(registry_dir=REGISTRY_DIR):
+    """Returns {role: [pid, ...]} for every live tracked process."""
+    result = {}
+    for entry in tracked(registry_dir=registry_dir):
+        result.setdefault(entry["role"], []).append(entry["pid"])
+    return result
+
+def is_running(role, registry_dir=REGISTRY_DIR):
+    return bool(tracked((role,), registry_dir))
+
+def running_executables():
+    """(pid, executable path) of every process we may inspect, on Linux and Windows."""
+    if IS_LINUX:
+        for name in os.listdir("/proc"):
+            if not name.isdigit():
+                continue
+            try:
+                yield int(name), os.readlink(f"/proc/{name}/exe")
+            except OSError:
+                continue  # Gone, or owned by another user
+    elif IS_WINDOWS:
+        for pid in windows_pids():
+            exe = windows_exe(pid)
+            if exe:
+                yield pid, exe
+
+def processes_under(root_dir):
+    """Untracked processes whose executable lives under root_dir, such as a runner started
+    from a file manager or Explorer. Matches on the executable path, never the name."""
+    root_dir = os.path.normcase(os.path.realpath(root_dir)) + os.sep
+    entries = []
+    for pid, exe in running_executables():
+        if os.path.normcase(exe).startswith(root_dir):
+            entries.append({"pid": pid, "role": "untracked", "path": exe, "started": start_time(pid)})
+    return entries
+
+def terminate(entries, grace_timeout=GRACE_TIMEOUT, kill_timeout=KILL_TIMEOUT, registry_dir=REGISTRY_DIR):
+    """Asks each process to exit, then forces whatever is left after grace_timeout.
+
+    Returns {"closed": count, "killed": count, "remaining": [pid, ...]}.
+    """
+    for entry in entries:
+        request_exit(entry["pid"])
+    alive = wait_for_exit(entries, grace_timeout)
+    for entry in alive:
+        force_exit(entry["pid"])
+    remaining = wait_for_exit(alive, kill_timeout)
+    for entry in entries:
+        if entry not in remaining:
+            unregister(entry["pid"], registry_dir)
+    return {"closed": len(entries) - len(alive), "killed": len(alive) - len(remaining),
+            "remaining": [e["pid"] for e in remaining]}
+
+def terminate_roles(roles, root_dir=None, grace_timeout=GRACE_TIMEOUT, kill_timeout=KILL_TIMEOUT,
+                    registry_dir=REGISTRY_DIR):
+    """Terminates tracked processes in roles plus, if root_dir is given, untracked ones
+    running from it. Returns immediately when nothing is running."""
+    entries = tracked(roles, registry_dir)
+    if root_dir:
+        known = {e["pid"] for e in entries}
+        entries.extend(e for e in processes_under(root_dir) if e["pid"] not in known and e["pid"] != os.getpid())
+    if not entries:
+        return {"closed": 0, "killed": 0, "remaining": []}
+    return terminate(entries, grace_timeout, kill_timeout, registry_dir)
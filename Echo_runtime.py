@@ -0,0 +1,118 @@
+# Jack Murray
+# Nova Foundry / Echo Runtime
+# v1.4.0
+
+import os
+import shutil
+import fnmatch
+import Echo_archive
+import Echo_snapshots
+
+# ---------- CONFIG ----------
+RUNTIME_MANIFEST_NAME = "Runtime_manifest.txt"
+# Author content, never written by a repair whatever the manifest says
+PROTECTED_DIRS = ("Text/", "Finishing/", "Tutorial/", "Save/")
+
+# ---------- Manifest ----------
+def load_runtime_manifest(base_dir):
+    """Returns the runtime patterns declared in base_dir/Runtime_manifest.txt."""
+    path = os.path.join(base_dir, RUNTIME_MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"'{path}' not found, the runtime files cannot be identified")
+    patterns = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                patterns.append(line)
+    return patterns
+
+def is_runtime(arcname, patterns):
+    if arcname.startswith(PROTECTED_DIRS):
+        return False
+    for pattern in patterns:
+        if "/" not in pattern and "/" in arcname:
+            continue
+        if fnmatch.fnmatchcase(arcname, pattern):
+            return True
+    return False
+
+def runtime_files(root_dir, patterns):
+    """Returns {arcname: full_path} for the runtime files under root_dir."""
+    if not os.path.isdir(root_dir):
+        return {}
+    return {arcname: full_path for full_path, arcname in Echo_archive.collect_members(root_dir)
+            if is_runtime(arcname, patterns)}
+
+# ---------- Repair ----------
+def same_content(path_a, path_b):
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    return Echo_snapshots.hash_file(path_a) == Echo_snapshots.hash_file(path_b)
+
+def plan_runtime_repair(base_dir, project_dir):
+    """Compares the runtime files of base_dir and project_dir.
+
+    Returns {"missing", "changed", "obsolete": [arcname, ...], "unchanged": count}.
+    Obsolete files match the manifest but no longer ship with the engine.
+    """
+    patterns = load_runtime_manifest(base_dir)
+    base = runtime_files(base_dir, patterns)
+    project = runtime_files(project_dir, patterns)
+    plan = {"missing": [], "changed": [], "obsolete": sorted(set(project) - set(base)), "unchanged": 0}
+    for arcname, full_path in sorted(base.items()):
+        if arcname not in project:
+            plan["missing"].append(arcname)
+        elif not same_content(full_path, project[arcname]):
+            plan["changed"].append(arcname)
+        else:
+            plan["unchanged"] += 1
+    return plan
+
+def install_file(src, dest, link=False):
+    """Replaces dest with src atomically, hard linking instead of copying if asked and possible."""
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    tmp_path = dest + ".runtime"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    if link:
+        try:
+            os.link(src, tmp_path)
+            os.replace(tmp_path, dest)
+            return
+        except OSError:
+            pass  # Different volume or no hard link support, copy instead
+    shutil.copy2(src, tmp_path)
+    os.replace(tmp_path, dest)
+
+def repair_runtime(base_dir, project_dir, progress=None, link=False, plan=None):
+    """Brings the runtime files of project_dir in line with base_dir. Returns the plan.
+
+    progress, if given, is called as progress(description, count, total).
+    """
+    plan = plan or plan_runtime_repair(base_dir, project_dir)
+    total = len(plan["missing"]) + len(plan["changed"]) + len(plan["obsolete"])
+    count = 0
+    for arcname in plan["missing"] + plan["changed"]:
+        count += 1
+        parts = arcname.split("/")
+        install_file(os.path.join(base_dir, *parts), os.path.join(project_dir, *parts), link)
+        if progress:
+            progress(f"Updating {arcname}", count, total)
+    for arcname in plan["obsolete"]:
+        count += 1
+        os.remove(os.path.join(project_dir, *arcname.split("/")))
+        if progress:
+            progress(f"Removing {arcname}", count, total)
+    Echo_archive.remove_empty_dirs(project_dir, plan["obsolete"])
+    return plan
+
+def format_runtime_plan(plan, limit=5):
+    lines = [f"{len(plan['missing'])} missing, {len(plan['changed'])} outdated, "
+             f"{len(plan['obsolete'])} obsolete, {plan['unchanged']} up to date"]
+    for key, label in (("missing", "+"), ("changed", "~"), ("obsolete", "-")):
+        names = plan[key] if limit is None else plan[key][:limit]
+        lines.extend(f"  {label} {name}" for name in names)
+        if len(plan[key]) > len(names):
+            lines.append(f"  ... {len(plan[key]) - len(names)} more")
+    return "\n".join(lines)
@@ -0,0 +1,264 @@
+# Jack Murray
+# Nova Foundry / Echo Save
+# v1.4.0
+
+import os
+import json
+import atexit
+import threading
+import time
+import traceback
+import Echo_model
+
+# ---------- CONFIG ----------
+STATUS_INTERVAL = 0.1  # Seconds between progress updates sent to the UI
+JOURNAL_FLUSH_INTERVAL = 0.25  # Seconds of edits a crash can lose
+JOURNAL_COMPACT_INTERVAL = 60  # Seconds between autosaves that fold the journal into the room folders
+
+# ---------- Save Queue ----------
+class WriteFailed(Exception):
+    """Raised by a write that got through only part of its snapshot, details says what failed."""
+    def __init__(self, message, details):
+        super().__init__(message)
+        self.details = details
+
+class SaveQueue:
+    """Runs the editor's saves one at a time on a writer thread.
+
+    The Tk thread takes a snapshot of what to write and hands it over with
+    submit(name, label, snapshot, write, done). write(snapshot, progress) runs on the
+    writer thread and must not touch widgets, progress(count, total) reports how far it
+    got. A job submitted while one of the same name is still waiting is folded into it
+    with merge(waiting, newer), or replaces its snapshot if there is no merge, so repeated
+    saves coalesce into one write. A job that is already running always finishes first.
+
+    done(snapshot, result, error) and on_status(text, fraction) are passed to post, e.g.
+    lambda fn: app.after(0, fn), so they run on the Tk thread. fraction is None once the
+    queue is idle. A job with requires=(names...) fails without running if the last run
+    of any of those jobs failed.
+    """
+    def __init__(self, post, on_status=None):
+        self.post = post
+        self.on_status = on_status
+        self.lock = threading.Lock()
+        self.waiting = []
+        self.worker = None
+        self.failed = set()  # Only touched by the writer thread
+        self.last_status = 0
+
+    def submit(self, name, label, snapshot, write, done=None, merge=None, requires=()):
+        with self.lock:
+            for job in self.waiting:
+                if job["name"] == name:
+                    job["snapshot"] = merge(job["snapshot"], snapshot) if merge else snapshot
+                    job.update(label=label, write=write, done=done, requires=requires)
+                    break
+            else:
+                self.waiting.append({"name": name, "label": label, "snapshot": snapshot, "write": write,
+                                     "done": done, "requires": requires})
+            if self.worker is None:
+                # Not a daemon, so closing the editor still lets queued saves finish
+                self.worker = threading.Thread(target=self.run, name="Echo save writer")
+                self.worker.start()
+            # Statuses are posted under the lock so they reach the UI in order
+            self.status(f"Saving... ({len(self.waiting)} queued)", 0)
+
+    def busy(self):
+        with self.lock:
+            return self.worker is not None
+
+    def send(self, fn):
+        # Once the window is gone post raises (TclError, RuntimeError), the queue keeps draining
+        try:
+            self.post(fn)
+        except Exception:
+            pass
+
+    def status(self, text, fraction):
+        if self.on_status:
+            self.send(lambda: self.on_status(text, fraction))
+
+    def run(self):
+        while True:
+            with self.lock:
+                if not self.waiting:
+                    self.worker = None
+                    self.status("Save failed" if self.failed else "All changes saved", None)
+                    break
+                job = self.waiting.pop(0)
+            self.status(f"Saving {job['label']}...", 0)
+            result = error = None
+            try:
+                blocked = self.failed.intersection(job["requires"])
+                if blocked:
+                    raise RuntimeError(f"Skipped because saving {', '.join(sorted(blocked))} failed")
+                result = job["write"](job["snapshot"], lambda count, total, job=job: self.progress(job, count, total))
+                self.failed.discard(job["name"])
+            except Exception as e:
+                print(f"[Echo Save] {job['label']} failed:")
+                traceback.print_exc()
+                self.failed.add(job["name"])
+                error = e
+            if job["done"]:
+                self.send(lambda job=job, result=result, error=error: job["done"](job["snapshot"], result, error))
+
+    def progress(self, job, count, total):
+        now = time.monotonic()
+        if count < total and now - self.last_status < STATUS_INTERVAL:
+            return
+        self.last_status = now
+        self.status(f"Saving {job['label']}... {count}/{total}", count / total if total else 1)
+
+# ---------- Edit Journal ----------
+class EditJournal:
+    """Append-only log of RoomMap edits, so a crash loses at most the last flush interval.
+
+    Every edit is queued as one JSON line and a flusher thread writes and fsyncs the queue
+    every JOURNAL_FLUSH_INTERVAL seconds. Entries describe the resulting state, not the
+    operation, so replaying them over a room folder that was only partly saved is safe:
+      ["put", f, y, x, {field: value}]   the room at (f, y, x) now reads like this
+      ["remove", f, y, x]                there is no room at (f, y, x)
+      ["floors", count, [[f, [[y, x, {field: value}], ...]], ...]]
+                                         floor_count is count and floor f holds exactly these rooms
+    A save calls rotate() when it takes its snapshot, which moves the entries so far into
+    the numbered segment <path>.<n>, and compacted(n) once it is on disk. Until then the
+    segment stays, and replay() reads the segments in order, then path.
+    """
+    def __init__(self, room_map, path):
+        self.room_map = room_map
+        self.path = path
+        self.lock = threading.Lock()       # Guards pending, held only for a list swap
+        self.file_lock = threading.Lock()  # Guards the file, held through write and fsync
+        self.pending = []
+        self.edits = 0  # Entries since the last rotate()
+        self.replaying = False
+        self.generation = max(self.segments() or [(0, None)])[0]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+        self.stop = threading.Event()
+        self.flusher = threading.Thread(target=self.run, name="Echo journal flusher", daemon=True)
+        self.flusher.start()
+        atexit.register(self.close)
+        room_map.subscribe(self.on_event)
+
+    def segments(self):
+        """[(n, path)] of the segments left by saves that are not on disk yet, oldest first."""
+        folder, name = os.path.split(self.path)
+        found = []
+        if os.path.isdir(folder):
+            for entry in os.listdir(folder):
+                number = entry[len(name) + 1:]
+                if entry.startswith(name + ".") and number.isdigit():
+                    found.append((int(number), os.path.join(folder, entry)))
+        return sorted(found)
+
+    # ----- Recording -----
+    def on_event(self, event, key, room):
+        if self.replaying or event == "reset":
+            return
+        if event in ("add", "change"):
+            entry = ["put", *key, room_fields(room)]
+        elif event == "remove":
+            entry = ["remove", *key]
+        else:
+            entry = ["floors", self.room_map.floor_count,
+                     [[f, [[y, x, room_fields(self.room_map.get((f, y, x)))] for y, x in self.room_map.floor_rooms(f)]]
+                      for f in key]]
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self.lock:
+            self.pending.append(line)
+        self.edits += 1
+
+    def flush(self):
+        with self.file_lock:
+            with self.lock:
+                lines, self.pending = self.pending, []
+            if lines and not self.file.closed:
+                self.file.write("".join(lines))
+                self.file.flush()
+                os.fsync(self.file.fileno())
+
+    def run(self):
+        while not self.stop.wait(JOURNAL_FLUSH_INTERVAL):
+            try:
+                self.flush()
+            except OSError:
+                traceback.print_exc()
+
+    def close(self):
+        self.stop.set()
+        self.flush()
+        with self.file_lock:
+            self.file.close()
+
+    # ----- Compaction -----
+    def rotate(self):
+        """Seals the entries so far into a new segment and returns its number."""
+        with self.file_lock:
+            with self.lock:
+                lines, self.pending = self.pending, []
+            self.file.write("".join(lines))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            self.generation += 1
+            os.replace(self.path, f"{self.path}.{self.generation}")
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.edits = 0
+        return self.generation
+
+    def compacted(self, generation):
+        """The save that took rotate() number generation is on disk, drops segments up to it."""
+        for number, path in self.segments():
+            if number <= generation:
+                os.remove(path)
+
+    def replay(self):
+        """Applies the journal to the room map, after it was loaded from disk. Returns the
+        number of entries applied; a torn line from a crash ends the whole replay, since
+        anything after it would be applied on top of a gap."""
+        self.flush()
+        count = 0
+        self.replaying = True
+        try:
+            for path in [path for _, path in self.segments()] + [self.path]:
+                if not os.path.exists(path):
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            print(f"[Echo Save] Stopping the replay at a torn journal entry in {path}")
+                            return count
+                        apply_entry(self.room_map, entry)
+                        count += 1
+        finally:
+            self.replaying = False
+        return count
+
+def room_fields(room):
+    return {field: room.get(field) for field in Echo_model.MAIN_FIELDS if room.get(field)}
+
+def apply_entry(room_map, entry):
+    op = entry[0]
+    if op == "put":
+        _, f, y, x, fields = entry
+        if (f, y, x) not in room_map:
+            room_map.add_room((f, y, x), Echo_model.Room(**{"name": "", **fields}))
+        else:
+            for field in Echo_model.MAIN_FIELDS:
+                room_map.set_field((f, y, x), field, fields.get(field, ""))
+    elif op == "remove":
+        room_map.remove_room(tuple(entry[1:]))
+    elif op == "floors":
+        _, count, floors = entry
+        while room_map.floor_count < count:
+            room_map.add_floor()
+        if room_map.floor_count > count:
+            room_map.remove_floors_from(count)
+        for f, rooms in floors:
+            for y, x in list(room_map.floor_rooms(f)):
+                room_map.remove_room((f, y, x))
+            for y, x, fields in rooms:
+                room_map.add_room((f, y, x), Echo_model.Room(**{"name": "", **fields}))
@@ -0,0 +1,204 @@
+# Jack Murray
+# Nova Foundry / Echo Snapshots
+# v1.4.0
+
+import os
+import time
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import Echo_archive
+
+# ---------- CONFIG ----------
+# Snapshots hold user data, so they live outside the disposable Cache directory
+SNAPSHOT_DIR = "Snapshots"
+OBJECTS_DIR = "Objects"
+MANIFESTS_DIR = "Manifests"
+SNAPSHOT_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+DEFAULT_KEEP = 20
+
+# ---------- Blob Store ----------
+def object_path(digest, store_dir=SNAPSHOT_DIR):
+    return os.path.join(store_dir, OBJECTS_DIR, digest[:2], digest[2:])
+
+def hash_file(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                return sha.hexdigest()
+            sha.update(chunk)
+
+def store_blob(full_path, store_dir=SNAPSHOT_DIR):
+    """Copies a file into the store, hashing as it goes. Returns the digest of what was stored."""
+    tmp_dir = os.path.join(store_dir, OBJECTS_DIR, "tmp")
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, f"{os.getpid()}_{hashlib.sha1(full_path.encode('utf-8')).hexdigest()}")
+    sha = hashlib.sha256()
+    with open(full_path, "rb") as src, open(tmp_path, "wb") as dest:
+        while True:
+            chunk = src.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            sha.update(chunk)
+            dest.write(chunk)
+    digest = sha.hexdigest()
+    final_path = object_path(digest, store_dir)
+    if os.path.exists(final_path):
+        os.remove(tmp_path)
+    else:
+        os.makedirs(os.path.dirname(final_path), exist_ok=True)
+        os.replace(tmp_path, final_path)
+    return digest
+
+def snapshot_file(full_path, known_digest, store_dir=SNAPSHOT_DIR):
+    """Returns the digest of full_path, storing its content only if the store lacks it."""
+    if known_digest and os.path.exists(object_path(known_digest, store_dir)):
+        return known_digest
+    digest = hash_file(full_path)
+    if os.path.exists(object_path(digest, store_dir)):
+        return digest
+    return store_blob(full_path, store_dir)
+
+# ---------- Manifests ----------
+def manifest_path(snapshot_id, store_dir=SNAPSHOT_DIR):
+    return os.path.join(store_dir, MANIFESTS_DIR, f"{snapshot_id}.json")
+
+def load_snapshot(snapshot_id, store_dir=SNAPSHOT_DIR):
+    manifest = Echo_archive.read_json(manifest_path(snapshot_id, store_dir))
+    if not manifest or manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Snapshot '{snapshot_id}' is missing or unreadable")
+    return manifest
+
+def list_snapshots(store_dir=SNAPSHOT_DIR):
+    """Snapshot manifests, newest first."""
+    manifests_dir = os.path.join(store_dir, MANIFESTS_DIR)
+    if not os.path.isdir(manifests_dir):
+        return []
+    snapshots = []
+    for name in os.listdir(manifests_dir):
+        if name.endswith(".json"):
+            manifest = Echo_archive.read_json(os.path.join(manifests_dir, name))
+            if manifest and manifest.get("version") == SNAPSHOT_VERSION:
+                snapshots.append(manifest)
+    return sorted(snapshots, key=lambda m: m["created"], reverse=True)
+
+def latest_snapshot(workspace, store_dir=SNAPSHOT_DIR):
+    for manifest in list_snapshots(store_dir):
+        if manifest.get("workspace") == workspace:
+            return manifest
+    return None
+
+def format_snapshot(manifest):
+    created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(manifest["created"]))
+    size = sum(entry["size"] for entry in manifest["files"].values())
+    return (f"{created}  {manifest['reason']}  [{manifest['workspace']}] '{manifest['title']}', "
+            f"{len(manifest['files'])} files, {Echo_archive.format_size(size)}")
+
+# ---------- Snapshot / Restore / Prune ----------
+def take_snapshot(source_dir, reason, workspace="", title="", jobs=None, store_dir=SNAPSHOT_DIR):
+    """Records source_dir in the store and returns the snapshot id, or None if it is empty.
+
+    Files whose size and mtime match the previous snapshot of the same workspace are not
+    re-read, and content the store already holds is not copied again. If nothing changed
+    since that snapshot, its id is returned instead of recording a duplicate.
+    """
+    members = Echo_archive.collect_members(source_dir) if os.path.isdir(source_dir) else []
+    if not members:
+        return None
+    previous = latest_snapshot(workspace, store_dir)
+    previous_files = previous["files"] if previous else {}
+    def snapshot_member(member):
+        full_path, arcname = member
+        st = os.stat(full_path)
+        known = previous_files.get(arcname)
+        known_digest = None
+        if known and known["size"] == st.st_size and known["mtime_ns"] == st.st_mtime_ns:
+            known_digest = known["sha256"]
+        digest = snapshot_file(full_path, known_digest, store_dir)
+        return arcname, {"sha256": digest, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    with ThreadPoolExecutor(max_workers=max(1, jobs or Echo_archive.DEFAULT_JOBS)) as pool:
+        files = dict(pool.map(snapshot_member, members))
+    if previous and {a: e["sha256"] for a, e in files.items()} == {a: e["sha256"] for a, e in previous_files.items()}:
+        return previous["id"]
+    snapshot_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{reason}"
+    suffix = 1
+    while os.path.exists(manifest_path(snapshot_id, store_dir)):
+        suffix += 1
+        snapshot_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{reason}-{suffix}"
+    Echo_archive.write_json_atomic(manifest_path(snapshot_id, store_dir), {
+        "version": SNAPSHOT_VERSION,
+        "id": snapshot_id,
+        "created": time.time(),
+        "reason": reason,
+        "workspace": workspace,
+        "title": title,
+        "files": files,
+    })
+    return snapshot_id
+
+def restore_snapshot(snapshot_id, dest_dir, progress=None, store_dir=SNAPSHOT_DIR):
+    """Brings dest_dir back to the snapshot, rewriting only files that differ.
+
+    progress, if given, is called as progress(description, count, total).
+    Returns {"restored": count, "removed": count, "unchanged": count}.
+    """
+    manifest = load_snapshot(snapshot_id, store_dir)
+    files = manifest["files"]
+    current = {arcname: full_path for full_path, arcname in Echo_archive.collect_members(dest_dir)} \
+        if os.path.isdir(dest_dir) else {}
+    removed = sorted(set(current) - set(files))
+    total = len(files) + len(removed)
+    result = {"restored": 0, "removed": 0, "unchanged": 0}
+    count = 0
+    for arcname, entry in sorted(files.items()):
+        count += 1
+        full_path = os.path.join(dest_dir, *arcname.split("/"))
+        if (arcname in current and os.path.getsize(full_path) == entry["size"]
+                and hash_file(full_path) == entry["sha256"]):
+            result["unchanged"] += 1
+            continue
+        blob = object_path(entry["sha256"], store_dir)
+        if not os.path.exists(blob):
+            raise FileNotFoundError(f"Snapshot '{snapshot_id}' is missing the content of {arcname}")
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        tmp_path = full_path + ".restore"
+        shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, full_path)
+        result["restored"] += 1
+        if progress:
+            progress(f"Restoring {arcname}", count, total)
+    for arcname in removed:
+        count += 1
+        os.remove(current[arcname])
+        result["removed"] += 1
+        if progress:
+            progress(f"Removing {arcname}", count, total)
+    Echo_archive.remove_empty_dirs(dest_dir, removed)
+    Echo_archive.remove_journals(dest_dir)
+    return result
+
+def prune_snapshots(keep=DEFAULT_KEEP, store_dir=SNAPSHOT_DIR):
+    """Deletes all but the newest keep snapshots, then every blob no snapshot references.
+
+    Returns {"snapshots": count removed, "blobs": count removed, "freed": bytes}.
+    """
+    snapshots = list_snapshots(store_dir)
+    for manifest in snapshots[keep:]:
+        os.remove(manifest_path(manifest["id"], store_dir))
+    referenced = {entry["sha256"] for manifest in snapshots[:keep] for entry in manifest["files"].values()}
+    result = {"snapshots": len(snapshots[keep:]), "blobs": 0, "freed": 0}
+    objects_dir = os.path.join(store_dir, OBJECTS_DIR)
+    if not os.path.isdir(objects_dir):
+        return result
+    for prefix in os.listdir(objects_dir):
+        prefix_dir = os.path.join(objects_dir, prefix)
+        for name in os.listdir(prefix_dir):
+            if prefix == "tmp" or prefix + name not in referenced:
+                blob = os.path.join(prefix_dir, name)
+                result["freed"] += os.path.getsize(blob)
+                os.remove(blob)
+                result["blobs"] += 1
+    return result
@@ -0,0 +1,102 @@
+# Jack Murray
+# Nova Foundry / Echo Thumbnails
+# v1.4.0
+
+import os
+import hashlib
+import threading
+from PIL import Image, PngImagePlugin
+
+# ---------- CONFIG ----------
+THUMBNAIL_CACHE_DIR = os.path.join("Cache", "Thumbnails")  # Relative to the hub directory
+
+rebuilding = set()
+rebuilding_lock = threading.Lock()
+
+# ---------- Cache ----------
+def source_sha1(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def size_spec(max_size=None, scale=None):
+    if scale is not None:
+        return f"s{scale}"
+    if isinstance(max_size, int):
+        max_size = (max_size, max_size)
+    return f"{max_size[0]}x{max_size[1]}"
+
+def thumbnail_path(key, spec, cache_dir=THUMBNAIL_CACHE_DIR):
+    return os.path.join(cache_dir, hashlib.sha1(f"{key}|{spec}".encode("utf-8")).hexdigest() + ".png")
+
+def scale_image(image, max_size=None, scale=None):
+    """Fits image inside max_size (an int or (width, height)) or multiplies it by scale."""
+    if scale is not None:
+        new_size = (max(1, int(image.width * scale)), max(1, int(image.height * scale)))
+    else:
+        if isinstance(max_size, int):
+            max_size = (max_size, max_size)
+        ratio = min(max_size[0] / image.width, max_size[1] / image.height)
+        new_size = (max(1, int(image.width * ratio)), max(1, int(image.height * ratio)))
+    return image.resize(new_size, Image.LANCZOS)
+
+def build_thumbnail(path, cache_path, max_size=None, scale=None):
+    """Decodes and scales the source, then writes it to cache_path. Returns the image."""
+    st = os.stat(path)
+    with Image.open(path) as source:
+        source.load()
+        image = scale_image(source.convert("RGBA"), max_size, scale)
+    info = PngImagePlugin.PngInfo()
+    info.add_text("source_size", str(st.st_size))
+    info.add_text("source_mtime_ns", str(st.st_mtime_ns))
+    info.add_text("source_sha1", source_sha1(path))
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        image.save(tmp_path, "PNG", pnginfo=info)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"Could not cache thumbnail: {e}")
+    return image
+
+def rebuild_in_background(path, cache_path, max_size, scale):
+    with rebuilding_lock:
+        if cache_path in rebuilding:
+            return
+        rebuilding.add(cache_path)
+    def rebuild_task():
+        try:
+            build_thumbnail(path, cache_path, max_size, scale)
+        except Exception as e:
+            print(f"Could not rebuild thumbnail: {e}")
+        finally:
+            with rebuilding_lock:
+                rebuilding.discard(cache_path)
+    threading.Thread(target=rebuild_task, daemon=True).start()
+
+def get_thumbnail(path, max_size=None, scale=None, key=None, cache_dir=THUMBNAIL_CACHE_DIR):
+    """Returns a scaled PIL image of path, or None if the source does not exist.
+
+    Thumbnails are cached as PNGs keyed by key (the absolute path by default) and the
+    target size, with the source's size, mtime and SHA-1 stored inside. A cached copy
+    whose source changed is still returned at once and rebuilt on a background thread,
+    so only a first sighting pays for the full decode and LANCZOS resize.
+    """
+    if not os.path.exists(path):
+        return None
+    spec = size_spec(max_size, scale)
+    cache_path = thumbnail_path(key or os.path.abspath(path), spec, cache_dir)
+    try:
+        with Image.open(cache_path) as cached:
+            cached.load()
+            meta = cached.text
+            image = cached.copy()
+    except (OSError, ValueError, SyntaxError):
+        return build_thumbnail(path, cache_path, max_size, scale)
+    st = os.stat(path)
+    fresh = meta.get("source_size") == str(st.st_size) and (
+        meta.get("source_mtime_ns") == str(st.st_mtime_ns)
+        # Same size, new mtime: a freshly extracted copy (e.g. a one-file build) often has identical bytes
+        or meta.get("source_sha1") == source_sha1(path))
+    if not fresh:
+        rebuild_in_background(path, cache_path, max_size, scale)
+    return image
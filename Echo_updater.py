@@ -0,0 +1,197 @@
+# Jack Murray
+# Nova Foundry / Echo Updater
+# v1.4.0
+
+import os
+import json
+import time
+import hashlib
+import http.client
+import urllib.error
+import urllib.request
+import Echo_archive
+
+# ---------- CONFIG ----------
+RELEASES_URL = "https://api.github.com/repos/DirectedHunt42/EchoEngine/releases/latest"
+UPDATE_CACHE_PATH = os.path.join(Echo_archive.CACHE_DIR, "Update_check.json")
+UPDATE_CHECK_TTL = 6 * 60 * 60  # Seconds a cached response is trusted without asking the server
+UPDATE_CHECK_TIMEOUT = 3.0  # Seconds, so a slow network never holds anything up
+REQUEST_HEADERS = {"User-Agent": "EchoHub", "Accept": "application/vnd.github.v3+json"}
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+DOWNLOAD_TIMEOUT = 15.0
+DOWNLOAD_RETRIES = 5
+RETRY_DELAY = 1.0  # Doubles after every failed attempt
+PROGRESS_INTERVAL = 0.1  # At most ten progress callbacks a second
+
+# ---------- Update Check ----------
+def load_cached_release(url, cache_path=UPDATE_CACHE_PATH):
+    cached = Echo_archive.read_json(cache_path)
+    if not cached or cached.get("url") != url or "data" not in cached:
+        return None
+    return cached
+
+def fetch_latest_release(url=RELEASES_URL, cache_path=UPDATE_CACHE_PATH, ttl=UPDATE_CHECK_TTL,
+                         timeout=UPDATE_CHECK_TIMEOUT, now=None):
+    """Returns (release_data, source) for the latest release.
+
+    source is "cache" when the stored response is younger than ttl and the network was
+    not touched, "not-modified" when a conditional request confirmed it, "network" for
+    a fresh response and "stale" when the server could not be reached but an older
+    response was on disk. Raises if there is neither a response nor a cached copy.
+    """
+    now = time.time() if now is None else now
+    cached = load_cached_release(url, cache_path)
+    if cached and 0 <= now - cached.get("fetched", 0) < ttl:
+        return cached["data"], "cache"
+    headers = dict(REQUEST_HEADERS)
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+    try:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            data = json.loads(response.read().decode("utf-8"))
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        source = "network"
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not cached:
+            if cached:
+                return cached["data"], "stale"
+            raise
+        data, etag, last_modified = cached["data"], cached.get("etag"), cached.get("last_modified")
+        source = "not-modified"
+    except (OSError, ValueError):
+        if cached:
+            return cached["data"], "stale"
+        raise
+    Echo_archive.write_json_atomic(cache_path, {"url": url, "fetched": now, "etag": etag,
+                                                "last_modified": last_modified, "data": data})
+    return data, source
+
+def release_version(data):
+    """Version string from a release named "Release <version>", or None."""
+    title = data.get("name", "") or ""
+    if not title.startswith("Release "):
+        return None
+    return title[len("Release "):].strip()
+
+# ---------- Download ----------
+def asset_sha256(data, asset, timeout=UPDATE_CHECK_TIMEOUT):
+    """The published SHA-256 of an asset: GitHub's "digest" field, or else a companion
+    "<name>.sha256" asset in the same release. Returns None if neither exists."""
+    digest = asset.get("digest") or ""
+    if digest.startswith("sha256:"):
+        return digest[len("sha256:"):].lower()
+    for other in data.get("assets", []):
+        if other.get("name") == asset["name"] + ".sha256":
+            req = urllib.request.Request(other["browser_download_url"], headers={"User-Agent": "EchoHub"})
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                text = response.read().decode("utf-8").strip()
+            return text.split()[0].lower() if text else None
+    return None
+
+def file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(DOWNLOAD_CHUNK_SIZE)
+            if not chunk:
+                return sha.hexdigest()
+            sha.update(chunk)
+
+def download_file(url, dest_path, sha256=None, progress=None, chunk_size=DOWNLOAD_CHUNK_SIZE,
+                  timeout=DOWNLOAD_TIMEOUT, retries=DOWNLOAD_RETRIES, retry_delay=RETRY_DELAY,
+                  progress_interval=PROGRESS_INTERVAL):
+    """Downloads url to dest_path through dest_path + ".part", resuming with Range requests.
+
+    A dropped connection resumes from the bytes already on disk, up to retries times
+    in a row, and a .part left by an earlier run of the same url is resumed as well,
+    with If-Range so the server sends the whole file if it changed since. If sha256 is
+    given the finished file must match it. A file that does not is downloaded once more
+    from byte 0, and if that fails too it is deleted and ValueError is raised.
+    progress, if given, is called as progress(done_bytes, total_bytes or None), at most
+    once per progress_interval seconds plus once at the end.
+    """
+    part_path = dest_path + ".part"
+    meta_path = part_path + ".json"  # {"url", "validator"} of the response the .part came from
+    for attempt in range(2):
+        fetch_part(url, part_path, meta_path, progress, chunk_size, timeout, retries, retry_delay,
+                   progress_interval)
+        if not sha256:
+            break
+        actual = file_sha256(part_path)
+        if actual == sha256.lower():
+            break
+        os.remove(part_path)
+        remove_file(meta_path)
+        if attempt:
+            raise ValueError(f"Checksum mismatch for {os.path.basename(dest_path)}: expected {sha256}, got {actual}")
+        print("[Echo Updater] Download failed its checksum, downloading it again from the start")
+    os.replace(part_path, dest_path)
+    remove_file(meta_path)
+    return dest_path
+
+def fetch_part(url, part_path, meta_path, progress, chunk_size, timeout, retries, retry_delay, progress_interval):
+    """The transfer half of download_file: fills part_path with url, resuming what is there."""
+    total = None
+    failures = 0
+    last_report = 0.0
+    while True:
+        done = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        meta = Echo_archive.read_json(meta_path) or {}
+        if done and meta.get("url") != url:
+            done = 0  # Left by a download of another file
+        headers = {"User-Agent": "EchoHub"}
+        if done:
+            headers["Range"] = f"bytes={done}-"
+            if meta.get("validator"):
+                headers["If-Range"] = meta["validator"]
+        try:
+            req = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                if done and response.status != 206:
+                    done = 0  # The server ignored the range or the file changed, start over
+                if not done:
+                    # If-Range only accepts a strong ETag, Last-Modified is the fallback
+                    etag = response.headers.get("ETag", "")
+                    validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+                    Echo_archive.write_json_atomic(meta_path, {"url": url, "validator": validator})
+                content_range = response.headers.get("Content-Range", "")
+                if content_range.rpartition("/")[2].isdigit():
+                    total = int(content_range.rpartition("/")[2])
+                elif response.headers.get("Content-Length", "").isdigit():
+                    total = done + int(response.headers["Content-Length"])
+                with open(part_path, "ab" if done else "wb") as f:
+                    while True:
+                        chunk = response.read(chunk_size)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        done += len(chunk)
+                        failures = 0
+                        if progress and time.monotonic() - last_report >= progress_interval:
+                            last_report = time.monotonic()
+                            progress(done, total)
+            if total is not None and done < total:
+                raise ConnectionError(f"Connection closed at {done} of {total} bytes")
+            break
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and done:
+                break  # Nothing left to fetch, the .part is already complete
+            raise
+        except (OSError, http.client.HTTPException) as e:
+            failures += 1
+            if failures > retries:
+                raise
+            print(f"[Echo Updater] Download interrupted ({e}), resuming in {retry_delay * 2 ** (failures - 1):.1f}s")
+            time.sleep(retry_delay * 2 ** (failures - 1))
+    if progress:
+        progress(done, total or done)
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
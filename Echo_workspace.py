@@ -0,0 +1,124 @@
+# Jack Murray
+# Nova Foundry / Echo Workspace
+# v1.4.0
+
+import os
+import re
+import Echo_archive
+
+# ---------- CONFIG ----------
+# The active workspace always lives at Working_game, so the editor, the runner and
+# every relative path into the project keep working unchanged. Parked workspaces sit
+# under Workspaces/ and switching is two directory renames on the same filesystem.
+WORKSPACE_ROOT = "Working_game"
+WORKSPACES_DIR = "Workspaces"
+ACTIVE_POINTER = os.path.join(WORKSPACES_DIR, "Active.txt")
+DEFAULT_WORKSPACE = "Default"
+NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9 _\-]{0,63}$")
+
+# ---------- Pointer File ----------
+def read_pointer():
+    try:
+        with open(ACTIVE_POINTER, "r", encoding="utf-8") as f:
+            return [line.strip() for line in f.read().splitlines() if line.strip()]
+    except OSError:
+        return []
+
+def write_pointer(*names):
+    os.makedirs(WORKSPACES_DIR, exist_ok=True)
+    tmp_path = ACTIVE_POINTER + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("\n".join(names) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, ACTIVE_POINTER)
+
+def parked_path(name):
+    return os.path.join(WORKSPACES_DIR, name)
+
+def recover():
+    """Finishes or rolls back a switch that was interrupted part way.
+
+    While switching, the pointer holds "target\\nprevious". Which renames happened
+    can be told from what exists on disk.
+    """
+    lines = read_pointer()
+    if len(lines) != 2:
+        return
+    target, previous = lines
+    if os.path.isdir(WORKSPACE_ROOT) and not os.path.isdir(parked_path(target)):
+        write_pointer(target)  # Both renames happened
+        print(f"[Echo Workspace] Finished an interrupted switch to '{target}'")
+    elif os.path.isdir(WORKSPACE_ROOT):
+        write_pointer(previous)  # Nothing was renamed
+        print(f"[Echo Workspace] Rolled back an interrupted switch to '{target}'")
+    elif os.path.isdir(parked_path(previous)):
+        os.rename(parked_path(previous), WORKSPACE_ROOT)  # Only the first rename happened
+        write_pointer(previous)
+        print(f"[Echo Workspace] Rolled back an interrupted switch to '{target}'")
+    else:
+        write_pointer(previous)  # Working_game was empty and nothing was parked yet
+        print(f"[Echo Workspace] Rolled back an interrupted switch to '{target}'")
+
+# ---------- Workspaces ----------
+def get_active():
+    recover()
+    lines = read_pointer()
+    return lines[0] if lines else DEFAULT_WORKSPACE
+
+def list_workspaces():
+    """Active workspace first, then the parked ones alphabetically."""
+    active = get_active()
+    parked = []
+    if os.path.isdir(WORKSPACES_DIR):
+        parked = sorted(entry.name for entry in os.scandir(WORKSPACES_DIR)
+                        if entry.is_dir() and entry.name != active)
+    return [active] + parked
+
+def validate_name(name):
+    if not NAME_PATTERN.match(name or ""):
+        raise ValueError("Workspace names may use letters, digits, spaces, '-' and '_' (up to 64 characters)")
+
+def create_workspace(name):
+    """Creates an empty parked workspace."""
+    validate_name(name)
+    if name in list_workspaces():
+        raise ValueError(f"Workspace '{name}' already exists")
+    os.makedirs(parked_path(name))
+
+def move_crc_index(src_dir, dest_dir, cache_dir):
+    """Keeps delta-import CRC caches with the files they describe."""
+    src = Echo_archive.crc_index_path(src_dir, cache_dir)
+    dest = Echo_archive.crc_index_path(dest_dir, cache_dir)
+    try:
+        os.replace(src, dest)
+    except FileNotFoundError:
+        try:
+            os.remove(dest)
+        except FileNotFoundError:
+            pass
+
+def switch_workspace(name, cache_dir=Echo_archive.CACHE_DIR):
+    """Makes name the active workspace. No project files are copied or rewritten."""
+    active = get_active()
+    if name == active:
+        return
+    validate_name(name)
+    if not os.path.isdir(parked_path(name)):
+        raise ValueError(f"Workspace '{name}' does not exist")
+    if os.path.exists(parked_path(active)):
+        raise OSError(f"'{parked_path(active)}' already exists, cannot park '{active}'")
+    write_pointer(name, active)
+    if os.path.isdir(WORKSPACE_ROOT):
+        os.rename(WORKSPACE_ROOT, parked_path(active))
+    else:
+        os.makedirs(parked_path(active))  # Nothing was in the working directory yet
+    try:
+        os.rename(parked_path(name), WORKSPACE_ROOT)
+    except OSError:
+        os.rename(parked_path(active), WORKSPACE_ROOT)
+        write_pointer(active)
+        raise
+    write_pointer(name)
+    move_crc_index(WORKSPACE_ROOT, parked_path(active), cache_dir)
+    move_crc_index(parked_path(name), WORKSPACE_ROOT, cache_dir)
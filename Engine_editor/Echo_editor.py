@@ -10,8 +10,8 @@ import shutil
 import webbrowser
 import tkinter as tk
 import traceback
+import time
 from tkinter import font as tkFont, filedialog, Toplevel, Label
-from collections import deque
 import sys
 import platform
 try:
@@ -31,6 +31,13 @@ except Exception:
 resource_base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
 # Base path for saving/loading dynamic files (EXE dir for bundled, script dir otherwise)
 save_base_path = os.path.dirname(sys.executable) if getattr(sys, 'frozen', False) else os.path.dirname(os.path.abspath(__file__))
+# Shared modules live next to Echo_hub (bundled into the EXE at build time)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import Echo_export
+import Echo_model
+import Echo_process
+import Echo_save
+import Echo_thumbnails
 # ---------------- Help resources (assumptions)
 # Default help webpage URL (assumption: replace with real URL if you have one)
 HELP_URL = "https://github.com/DirectedHunt42/EchoEngine/wiki"
@@ -40,6 +47,9 @@ HELP_PDF_DEFAULT = os.path.join(resource_base_path, "Docs", "Help", "Help.pdf")
 os_name = platform.system().lower()
 HUB_PATH = "Echo_hub.exe" if os_name == "windows" else "Echo_hub"
 RUNNER_PATH = os.path.join("..", "Working_game", "Echo_runner.exe") if os_name == "windows" else os.path.join("..", "Working_game", "Echo_runner")
+PROCESS_REGISTRY_DIR = os.path.join(save_base_path, "..", Echo_process.REGISTRY_DIR)
+THUMBNAIL_CACHE_DIR = os.path.join(save_base_path, "..", Echo_thumbnails.THUMBNAIL_CACHE_DIR)
+EDITOR_TIMING = bool(os.environ.get("ECHO_EDITOR_TIMING"))  # Print grid redraw times to the console
 # ========================= Tooltip Helper =========================
 class ToolTip:
     def __init__(self, widget, text):
@@ -77,6 +87,258 @@ class ToolTip:
         if self.tip_window:
             self.tip_window.destroy()
             self.tip_window = None
+# ========================= Room Grid Canvas =========================
+class RoomGridView:
+    """Draws one floor of an unbounded room map as items on a single Canvas.
+
+    Only cells inside the canvas, plus MARGIN_CELLS around it, have items. They are made as
+    cells scroll into view and deleted as they leave, so a redraw costs what is on screen
+    rather than the size of the map. What a cell shows is asked of the tab through
+    room_at(x, y) -> (name, text colour) or None, placeholder_at(x, y) -> "adjacent",
+    "vertical" or None and marker_at(x, y) -> bool. Clicks are hit-tested from the pointer
+    position and passed on as on_select(x, y), on_place(x, y) or on_remove(x, y).
+    Drag with the right or middle button or scroll to pan, Ctrl+scroll zooms.
+    """
+    ROOM_FILL = "#333333"
+    BORDER_COLOR = "white"
+    PLACEHOLDER_HOVER = {"adjacent": "#555555", "vertical": "#666666"}
+    MARKER_FILL = "#661111"
+    MARKER_HOVER = "#881111"
+    ZOOM_LEVELS = (16, 24, 32, 40, 56, 72)  # Cell sizes in pixels
+    DEFAULT_ZOOM = 3  # 40 px, the size of the old fixed grid
+    MARGIN_CELLS = 2
+    HOME_CELLS = 2  # The start room is shown this many cells in from the top left corner
+    SCROLL_CELLS = 3
+    LABEL_MIN_SIZE = 24  # Smaller cells are drawn without room names, they would not fit
+    def __init__(self, canvas, font_family, room_at, placeholder_at, marker_at,
+                 on_select, on_place, on_remove, border_width=2):
+        self.canvas = canvas
+        self.font_family = font_family
+        self.border_width = border_width
+        self.room_at = room_at
+        self.placeholder_at = placeholder_at
+        self.marker_at = marker_at
+        self.on_select = on_select
+        self.on_place = on_place
+        self.on_remove = on_remove
+        self.rooms = {}         # (x, y) -> (rect, text)
+        self.placeholders = {}  # (x, y) -> (kind, rect, text)
+        self.markers = {}       # (x, y) -> (rect, text)
+        self.hover = None
+        self.bounds = (0, 0, 0, 0)  # Cells with items: x0 <= x < x1, y0 <= y < y1
+        self.pan_from = None
+        self.set_zoom(self.DEFAULT_ZOOM, redraw=False)
+        self.home(redraw=False)
+        canvas.bind("<Button-1>", self.on_click)
+        canvas.bind("<Motion>", self.on_motion)
+        canvas.bind("<Leave>", lambda e: self.set_hover(None))
+        canvas.bind("<Configure>", lambda e: self.update_bounds())
+        for button in (2, 3):
+            canvas.bind(f"<ButtonPress-{button}>", self.on_pan_start)
+            canvas.bind(f"<B{button}-Motion>", self.on_pan)
+            canvas.bind(f"<ButtonRelease-{button}>", lambda e: setattr(self, "pan_from", None))
+        canvas.bind("<MouseWheel>", self.on_wheel)
+        canvas.bind("<Button-4>", self.on_wheel)
+        canvas.bind("<Button-5>", self.on_wheel)
+    # ----- Geometry -----
+    def cell_at(self, px, py):
+        return int((px + self.origin_x) // self.cell_size), int((py + self.origin_y) // self.cell_size)
+    def cell_box(self, x, y, size=None):
+        size = size or self.cell_size
+        left = x * self.cell_size - self.origin_x + (self.cell_size - size) // 2
+        top = y * self.cell_size - self.origin_y + (self.cell_size - size) // 2
+        return left, top, left + size, top + size
+    def visible_bounds(self):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        x0, y0 = self.cell_at(0, 0)
+        x1, y1 = self.cell_at(width, height)
+        m = self.MARGIN_CELLS
+        return x0 - m, y0 - m, x1 + 1 + m, y1 + 1 + m
+    def in_bounds(self, x, y):
+        x0, y0, x1, y1 = self.bounds
+        return x0 <= x < x1 and y0 <= y < y1
+    # ----- Drawing -----
+    def clear(self):
+        self.canvas.delete("all")
+        self.rooms.clear()
+        self.placeholders.clear()
+        self.markers.clear()
+    def redraw(self):
+        """Rebuilds every item in view, after the floor, the mode or the zoom changed."""
+        self.clear()
+        self.bounds = self.visible_bounds()
+        x0, y0, x1, y1 = self.bounds
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                self.draw_cell(x, y)
+    def refresh(self, x, y):
+        """Redraws one cell after its room or frontier state changed, if it is in view."""
+        if self.in_bounds(x, y):
+            self.drop_cell((x, y))
+            self.draw_cell(x, y)
+    def refresh_markers(self):
+        """Re-asks marker_at for every room in view, as one removal can change many."""
+        for x, y in list(self.rooms):
+            if self.marker_at(x, y):
+                self.draw_marker(x, y)
+            else:
+                self.remove_marker((x, y))
+    def update_bounds(self):
+        """Draws cells that came into view and drops those that left, after a pan or resize."""
+        bounds = self.visible_bounds()
+        if bounds == self.bounds:
+            return
+        old, self.bounds = self.bounds, bounds
+        for items in (self.rooms, self.placeholders, self.markers):
+            for cell in [c for c in items if not self.in_bounds(*c)]:
+                self.drop_cell(cell)
+        ox0, oy0, ox1, oy1 = old
+        x0, y0, x1, y1 = bounds
+        for y in range(y0, y1):
+            for x in range(x0, x1):
+                if not (ox0 <= x < ox1 and oy0 <= y < oy1):
+                    self.draw_cell(x, y)
+    def draw_cell(self, x, y):
+        room = self.room_at(x, y)
+        if room:
+            self.draw_room(x, y, *room)
+            if self.marker_at(x, y):
+                self.draw_marker(x, y)
+        else:
+            kind = self.placeholder_at(x, y)
+            if kind:
+                self.draw_placeholder(x, y, kind)
+        if (x, y) == self.hover:
+            self.set_hover(self.hover, force=True)
+    def drop_cell(self, cell):
+        self.remove_marker(cell)
+        for item in self.rooms.pop(cell, ()):
+            self.canvas.delete(item)
+        entry = self.placeholders.pop(cell, None)
+        if entry:
+            self.canvas.delete(entry[1])
+            self.canvas.delete(entry[2])
+    def draw_box(self, x, y, size=None):
+        left, top, right, bottom = self.cell_box(x, y, size)
+        half = self.border_width / 2
+        return self.canvas.create_rectangle(left + half, top + half, right - half, bottom - half,
+                                            fill=self.ROOM_FILL, outline=self.BORDER_COLOR, width=self.border_width)
+    def draw_room(self, x, y, name, text_color):
+        rect = self.draw_box(x, y)
+        left, top, right, bottom = self.cell_box(x, y)
+        text = self.canvas.create_text((left + right) / 2, (top + bottom) / 2, fill=text_color, font=self.font,
+                                       text=name if self.cell_size >= self.LABEL_MIN_SIZE else "",
+                                       width=self.cell_size - 5, justify="center")
+        self.rooms[(x, y)] = (rect, text)
+    def draw_placeholder(self, x, y, kind):
+        size = self.cell_size if kind == "adjacent" else self.cell_size // 2
+        rect = self.draw_box(x, y, size)
+        left, top, right, bottom = self.cell_box(x, y, size)
+        text = self.canvas.create_text((left + right) / 2, (top + bottom) / 2, text="+", fill="white", font=self.font)
+        self.placeholders[(x, y)] = (kind, rect, text)
+    # ----- Remove Markers -----
+    def draw_marker(self, x, y):
+        if (x, y) in self.markers or (x, y) not in self.rooms:
+            return
+        size = self.marker_size
+        left, top, right, _ = self.cell_box(x, y)
+        rect = self.canvas.create_rectangle(right - size, top, right, top + size,
+                                            fill=self.MARKER_FILL, outline="")
+        text = self.canvas.create_text(right - size / 2, top + size / 2, text="−",
+                                       fill="white", font=self.marker_font)
+        self.markers[(x, y)] = (rect, text)
+        if (x, y) == self.hover:
+            self.canvas.itemconfigure(rect, fill=self.MARKER_HOVER)
+    def remove_marker(self, cell):
+        for item in self.markers.pop(cell, ()):
+            self.canvas.delete(item)
+    def on_marker(self, cell, px, py):
+        if cell not in self.markers:
+            return False
+        left, top, right, _ = self.cell_box(*cell)
+        return px >= right - self.marker_size and py <= top + self.marker_size
+    # ----- Pan & Zoom -----
+    def pan(self, dx, dy):
+        self.origin_x += dx
+        self.origin_y += dy
+        self.canvas.move("all", -dx, -dy)
+        self.update_bounds()
+    def home(self, redraw=True):
+        """Scrolls back to the start room."""
+        self.origin_x = self.origin_y = -self.HOME_CELLS * self.cell_size
+        if redraw:
+            self.redraw()
+    def set_zoom(self, zoom, px=0, py=0, redraw=True):
+        """Switches to ZOOM_LEVELS[zoom], keeping the map point under (px, py) in place."""
+        zoom = max(0, min(len(self.ZOOM_LEVELS) - 1, zoom))
+        size = self.ZOOM_LEVELS[zoom]
+        if redraw:
+            if zoom == self.zoom:
+                return
+            self.origin_x = (px + self.origin_x) * size / self.cell_size - px
+            self.origin_y = (py + self.origin_y) * size / self.cell_size - py
+        self.zoom, self.cell_size = zoom, size
+        self.marker_size = size // 2
+        self.font = (self.font_family, max(7, size // 4))
+        self.marker_font = (self.font_family, max(8, size * 3 // 10))
+        if redraw:
+            self.redraw()
+    def zoom_by(self, steps):
+        self.set_zoom(self.zoom + steps, self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2)
+    def on_pan_start(self, event):
+        self.pan_from = (event.x, event.y)
+    def on_pan(self, event):
+        if self.pan_from is None:
+            return
+        (fx, fy), self.pan_from = self.pan_from, (event.x, event.y)
+        self.pan(fx - event.x, fy - event.y)
+    def on_wheel(self, event):
+        # <Button-4>/<Button-5> on X11, <MouseWheel> with a signed delta elsewhere
+        step = -1 if event.num == 4 or getattr(event, "delta", 0) > 0 else 1
+        if event.state & 0x0004:  # Control
+            self.set_zoom(self.zoom - step, event.x, event.y)
+        elif event.state & 0x0001:  # Shift
+            self.pan(step * self.SCROLL_CELLS * self.cell_size, 0)
+        else:
+            self.pan(0, step * self.SCROLL_CELLS * self.cell_size)
+    # ----- Pointer -----
+    def set_hover(self, cell, force=False):
+        if cell == self.hover and not force:
+            return
+        if self.hover in self.placeholders:
+            self.canvas.itemconfigure(self.placeholders[self.hover][1], fill=self.ROOM_FILL)
+        if self.hover in self.markers:
+            self.canvas.itemconfigure(self.markers[self.hover][0], fill=self.MARKER_FILL)
+        self.hover = cell
+        if cell in self.placeholders:
+            kind, rect, _ = self.placeholders[cell]
+            self.canvas.itemconfigure(rect, fill=self.PLACEHOLDER_HOVER[kind])
+        if cell in self.markers:
+            self.canvas.itemconfigure(self.markers[cell][0], fill=self.MARKER_HOVER)
+    def on_motion(self, event):
+        self.set_hover(self.cell_at(event.x, event.y))
+    def on_click(self, event):
+        cell = self.cell_at(event.x, event.y)
+        if self.on_marker(cell, event.x, event.y):
+            self.on_remove(*cell)
+        elif cell in self.rooms:
+            self.on_select(*cell)
+        elif cell in self.placeholders:
+            self.on_place(*cell)
+    def item_count(self):
+        return len(self.canvas.find_all())
+def add_view_controls(parent, view, font_family):
+    """Zoom and home buttons for a RoomGridView, packed into parent."""
+    controls = ctk.CTkFrame(parent, fg_color="transparent")
+    for text, command in (("−", lambda: view.zoom_by(-1)), ("+", lambda: view.zoom_by(1)),
+                          ("Start Room", view.home)):
+        ctk.CTkButton(controls, text=text, width=30 if len(text) == 1 else 90, font=(font_family, 14),
+                      fg_color="#444444", hover_color="#666666", command=command).pack(side="left", padx=(0, 5))
+    return controls
+def report_timing(what, started, view):
+    if EDITOR_TIMING:
+        print(f"[Echo Editor] {what}: {len(view.rooms)} rooms, {view.item_count()} canvas items "
+              f"in {(time.perf_counter() - started) * 1000:.1f} ms")
 # ========================= Main App =========================
 app = ctk.CTk()
 app.title("🛠️ Echo Editor")
@@ -105,10 +367,12 @@ except tk.TclError:
     custom_font_family = test_font.actual("family")
 # ========================= Helper Functions =========================
 def display_image_scaled(img_path, parent, scale=0.2):
-    img_orig = Image.open(img_path)
-    new_w = max(1, int(img_orig.width * scale))
-    new_h = max(1, int(img_orig.height * scale))
-    img_resized = img_orig.resize((new_w, new_h), Image.LANCZOS)
+    # Keyed relative to the resources so a one-file build's fresh temp dir still hits the cache
+    img_resized = Echo_thumbnails.get_thumbnail(img_path, scale=scale, cache_dir=THUMBNAIL_CACHE_DIR,
+                                                key=os.path.relpath(img_path, resource_base_path))
+    if img_resized is None:
+        return None
+    new_w, new_h = img_resized.size
     tk_img = ImageTk.PhotoImage(img_resized)
     canvas = ctk.CTkCanvas(parent, width=new_w, height=new_h, bg=getattr(parent, "_fg_color", "#222222"), highlightthickness=0)
     canvas.pack(pady=10)
@@ -125,6 +389,28 @@ def setup_main_ui():
                               segmented_button_selected_color="#333333",
                               segmented_button_unselected_color="#555555")
     tab_view.pack(expand=True, fill="both")
+    # ---------- Save Status ----------
+    # Saves run on a writer thread, this line shows what it is doing
+    save_status_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+    save_status_frame.pack(side="bottom", fill="x", padx=10, pady=(0, 5))
+    save_status_label = ctk.CTkLabel(save_status_frame, text="", font=(custom_font_family, 12), text_color="#AAAAAA")
+    save_status_label.pack(side="left")
+    save_progress_bar = ctk.CTkProgressBar(save_status_frame, width=200)
+    def show_save_status(text, fraction):
+        save_status_label.configure(text=text)
+        if fraction is None:
+            save_progress_bar.pack_forget()
+            return
+        save_progress_bar.set(fraction)
+        if not save_progress_bar.winfo_ismapped():
+            save_progress_bar.pack(side="left", padx=10)
+    save_queue = Echo_save.SaveQueue(lambda fn: app.after(0, fn), show_save_status)
+    # Room saves hand over (folder, SaveTracker changes), a waiting one absorbs newer changes
+    def write_rooms(snapshot, progress):
+        root_dir, changes = snapshot
+        return Echo_model.write_changes(root_dir, changes, progress)
+    def merge_room_saves(older, newer):
+        return newer[0], Echo_model.merge_changes(older[1], newer[1])
     SAVE_COLOR = "#90EE90"
     SAVE_HOVER = "#6ECC6E"
     TEST_COLOR = "#FFB347"
@@ -459,16 +745,69 @@ def setup_main_ui():
                 else:
                     errors.append(f"{key}: must provide either file or text.")
         return errors
-    def save_game_setup():
+    def write_game_setup(ops, progress):
+        # Writer thread half of save_game_setup: performs the file operations it listed
+        failures = []
+        for count, (key, action, source, path) in enumerate(ops, start=1):
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True) # Ensure folder exists
+                if action == "write":
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(source)
+                elif action == "copy":
+                    shutil.copy(source, path)
+                elif action == "text":
+                    # Instead of copying, read text and save it
+                    with open(source, "r", encoding="utf-8") as f_in, open(path, "w", encoding="utf-8") as f_out:
+                        f_out.write(f_in.read())
+                elif action == "music":
+                    subprocess.run(
+                        ["ffmpeg", "-y", "-i", source, path],
+                        check=True,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL
+                    )
+                elif action == "icon":
+                    img = Image.open(source)
+                    img.save(path, "PNG")
+                elif action == "remove":
+                    if os.path.exists(path):
+                        os.remove(path)
+            except Exception as e:
+                what = {"music": "convert music", "icon": "convert icon"}.get(action, "save")
+                failures.append((key, f"failed to {what} - {e}"))
+            progress(count, len(ops))
+        if failures:
+            # Raised so the queue counts the save as failed and an export waiting on it is skipped
+            raise Echo_save.WriteFailed(f"{len(failures)} game setup files could not be saved", failures)
+    def game_setup_saved(errors, quiet):
+        def done(ops, result, error):
+            failures = error.details if isinstance(error, Echo_save.WriteFailed) else []
+            for key, message in failures:
+                errors.append(f"{key}: {message}")
+                if isinstance(inputs[key], ctk.CTkEntry):
+                    inputs[key].configure(fg_color="#661111")
+            if error and not failures:
+                show_msg("Error", f"Unexpected error during save:\n{error}", icon="cancel")
+            elif errors:
+                show_msg("Validation Error", "\n".join(errors), icon="cancel")
+            else:
+                # On successful save, update the colors to green
+                load_and_highlight_existing()
+                if not quiet:
+                    show_msg("Success", "All fields validated and saved!", icon="check")
+        return done
+    def save_game_setup(quiet=False):
         try:
             # Define which entry fields must always be enetered
             required_file_fields = []
             optional_file_fields = ["Font", "Music", "Icon"]
             errors = []
+            # (key, action, source or text, path) for the writer thread, see write_game_setup
+            ops = []
             print("[Echo Editor] save_game_setup invoked")
             for key, widget in inputs.items():
                 path = os.path.join(save_base_path, save_paths[key])
-                os.makedirs(os.path.dirname(path), exist_ok=True) # Ensure folder exists
                 # --- Entries ---
                 if isinstance(widget, ctk.CTkEntry):
                     value = widget.get().strip()
@@ -491,9 +830,7 @@ def setup_main_ui():
                             widget.configure(fg_color="#661111")
                             continue
                         # If valid, format for saving (one per line)
-                        save_value = "\n".join(coords)
-                        with open(path, "w", encoding="utf-8") as f:
-                            f.write(save_value)
+                        ops.append((key, "write", "\n".join(coords), path))
                         widget.configure(fg_color="#444444")
                         continue
                     elif key in ["Win Items", "Tutorial Items"]:
@@ -501,9 +838,7 @@ def setup_main_ui():
                         items = [item.strip() for item in value.split(',')]
                         # Filter out any empty strings that might result from trailing commas or spaces
                         valid_items = [item for item in items if item]
-                        save_value = "\n".join(valid_items)
-                        with open(path, "w", encoding="utf-8") as f:
-                            f.write(save_value)
+                        ops.append((key, "write", "\n".join(valid_items), path))
                         widget.configure(fg_color="#444444")
                         continue
                     # Old logic for other fields (no changes here)
@@ -516,11 +851,9 @@ def setup_main_ui():
                                 widget.configure(fg_color="#661111")
                                 continue
                         widget.configure(fg_color="#444444")
-                        with open(path, "w", encoding="utf-8") as f:
-                            f.write(value)
+                        ops.append((key, "write", value, path))
                     else:
-                        with open(path, "w", encoding="utf-8") as f:
-                            f.write("")
+                        ops.append((key, "write", "", path))
                         widget.configure(fg_color="#444444")
                     # ---------- Required File ----------
                     if key in required_file_fields:
@@ -539,41 +872,25 @@ def setup_main_ui():
                             widget.configure(fg_color="#444444")
                             if key == "Music":
                                 if value.lower().endswith('.wav'):
-                                    shutil.copy(value, path)
+                                    ops.append((key, "copy", value, path))
                                 else:
                                     if shutil.which("ffmpeg") is not None:
-                                        try:
-                                            subprocess.run(
-                                                ["ffmpeg", "-y", "-i", value, path],
-                                                check=True,
-                                                stdout=subprocess.DEVNULL,
-                                                stderr=subprocess.DEVNULL
-                                            )
-                                        except Exception as e:
-                                            errors.append(f"{key}: failed to convert music - {e}")
-                                            widget.configure(fg_color="#661111")
+                                        ops.append((key, "music", value, path))
                                     else:
                                         errors.append(f"{key}: ffmpeg not found, cannot convert {os.path.splitext(value)[1]} to .wav. Please provide .wav file or install ffmpeg.")
                                         widget.configure(fg_color="#661111")
                             elif key == "Icon":
-                                try:
-                                    img = Image.open(value)
-                                    img.save(path, "PNG")
-                                except Exception as e:
-                                    errors.append(f"{key}: failed to convert icon - {e}")
-                                    widget.configure(fg_color="#661111")
+                                ops.append((key, "icon", value, path))
                             else:
-                                shutil.copy(value, path)
+                                ops.append((key, "copy", value, path))
                         else:
-                            if os.path.exists(path):
-                                os.remove(path)
+                            ops.append((key, "remove", None, path))
                             widget.configure(fg_color="#444444")
                     # ---------- Default to plain text (optional) ----------
                     else:
                         if value:
                             widget.configure(fg_color="#444444")
-                            with open(path, "w", encoding="utf-8") as f:
-                                f.write(value)
+                            ops.append((key, "write", value, path))
                         else:
                             widget.configure(fg_color="#444444")
                 # --- Text sections ---
@@ -592,28 +909,20 @@ def setup_main_ui():
                                 path_entry.configure(fg_color="#661111")
                                 err_path_lbl.configure(text="Invalid file type")
                                 continue
-                            # Instead of copying, read text and save it
-                            with open(src, "r", encoding="utf-8") as f_in, open(path, "w", encoding="utf-8") as f_out:
-                                f_out.write(f_in.read())
+                            ops.append((key, "text", src, path))
                             path_entry.configure(fg_color="#444444")
                             err_path_lbl.configure(text="")
                         else:
-                            with open(path, "w", encoding="utf-8") as f:
-                                f.write("")
+                            ops.append((key, "write", "", path))
                             path_entry.configure(fg_color="#444444")
                             err_path_lbl.configure(text="")
                     elif text_var.get():
                         txt = textbox.get("1.0","end").strip()
-                        with open(path, "w", encoding="utf-8") as f:
-                            f.write(txt)
+                        ops.append((key, "write", txt, path))
                         textbox.configure(fg_color="#444444")
                         err_text_lbl.configure(text="")
-            if errors:
-                show_msg("Validation Error", "\n".join(errors), icon="cancel")
-            else:
-                # On successful save, update the colors to green
-                load_and_highlight_existing()
-                show_msg("Success", "All fields validated and saved!", icon="check")
+            # The ops list is a full snapshot of the tab, so a newer one simply replaces a waiting one
+            save_queue.submit("setup", "game setup", ops, write_game_setup, game_setup_saved(errors, quiet))
         except Exception as e:
             # Surface any unexpected exceptions so they are not silent
             print("[Echo Editor] Unexpected error in save_game_setup:")
@@ -636,49 +945,29 @@ def setup_main_ui():
     save_main_level_button.place(relx=0.5, rely=1.0, anchor="s", y=-10)
    # ========================= Tutorial Tab =========================
     def setup_tutorial_tab(parent_tab, custom_font_family):
-        # Single-floor grid editor (right: grid)
-        GRID_SIZE = 40
-        GRID_DIM_X, GRID_DIM_Y = 33, 20
-        # Simplified data structure for a single floor
-        grid_state = [[None for _ in range(GRID_DIM_X)] for _ in range(GRID_DIM_Y)]
-        plus_buttons = {}
+        # Single-floor grid editor (right: grid), unbounded in every direction
+        # Room data lives in the model, the canvas below only mirrors it
+        room_map = Echo_model.RoomMap(Echo_model.TUTORIAL_FIELDS, vertical=False)
+        # Subscribed before the view, so they are current by the time the view hears of an edit
+        frontier = Echo_model.Frontier(room_map)
+        removability = Echo_model.Removability(room_map)
+        saver = Echo_model.SaveTracker(room_map)
         # Info display on the right side of the editor
         info_display_frame = None
-    
+
         # --- CONSTANT FOR BACKGROUND/ROOM COLOR ---
         BACKGROUND_COLOR = "#333333"
         current_room = [None, None]
         FILLED_COLOR = "green"
-        directions_2d = [(0,1),(0,-1),(1,0),(-1,0)]
         # NEW: Track the current mode (True for Add Mode, False for Remove Mode)
         is_add_mode = [True]
         def can_remove_tutorial(rx, ry):
-            if rx == 0 and ry == 0:
-                return False
-            total_rooms = sum(1 for row in grid_state for c in row if c is not None)
-            if total_rooms <= 1:
-                return False
-            temp = grid_state[ry][rx]
-            grid_state[ry][rx] = None
-            visited = set()
-            q = deque([(0,0)])
-            visited.add((0,0))
-            while q:
-                x, y = q.popleft()
-                for dx, dy in directions_2d:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < GRID_DIM_X and 0 <= ny < GRID_DIM_Y and grid_state[ny][nx] is not None and (nx, ny) not in visited:
-                        visited.add((nx, ny))
-                        q.append((nx, ny))
-            connected = len(visited)
-            grid_state[ry][rx] = temp
-            return connected == total_rooms - 1
+            return (0, ry, rx) in removability.rooms()
         def remove_room_tutorial(grid_x, grid_y):
             if not can_remove_tutorial(grid_x, grid_y):
                 return
-            grid_state[grid_y][grid_x]['frame'].destroy()
-            grid_state[grid_y][grid_x] = None
-            show_adjacent_placeholders_tutorial()
+            room_map.remove_room((0, grid_y, grid_x))
+            grid_view.refresh_markers()
         def clear_info_display_frame_tutorial():
             nonlocal info_display_frame
             if info_display_frame is None:
@@ -689,37 +978,18 @@ def setup_main_ui():
                 except Exception:
                     pass
         def update_room_name_tutorial(entry_widget, grid_x, grid_y):
-            nonlocal grid_state
-            new_name = entry_widget.get()
-            if not grid_state:
-                return
-            cell = grid_state[grid_y][grid_x]
-            if cell is None:
-                return
-            cell['name'] = new_name
-            if 'label' in cell and cell['label']:
-                try:
-                    cell['label'].configure(text=new_name)
-                    all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items'])
-                    cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
-                except Exception:
-                    pass
+            room_map.set_field((0, grid_y, grid_x), 'name', entry_widget.get())
         def display_room_details_tutorial(grid_x, grid_y):
             nonlocal info_display_frame
-            nonlocal grid_state
-            nonlocal current_room
             if info_display_frame is None:
                 return
             clear_info_display_frame_tutorial()
             current_room[:] = [grid_x, grid_y]
-        
-            if not grid_state:
-                return
-               
-            cell = grid_state[grid_y][grid_x]
+            key = (0, grid_y, grid_x)
+            cell = room_map.get(key)
             if cell is None:
                 return
-            current_name = cell.get('name', '')
+            current_name = cell.name
             room_details_content_frame = ctk.CTkFrame(info_display_frame, fg_color="#333333", corner_radius=10)
             room_details_content_frame.pack(fill="both", expand=True, padx=5, pady=5)
             room_title = ctk.CTkLabel(room_details_content_frame,
@@ -752,7 +1022,7 @@ def setup_main_ui():
                                     height=100,
                                     font=(custom_font_family, 14),
                                     fg_color="#444444")
-            desc = cell.get('desc', '')
+            desc = cell.desc
             desc_text.insert("1.0", desc)
             desc_text.pack(padx=15, pady=(0, 10))
             if desc:
@@ -768,7 +1038,7 @@ def setup_main_ui():
                                     width=250,
                                     font=(custom_font_family, 14),
                                     placeholder_text="Enter items, separated by commas")
-            items = cell.get('findable_items', '')
+            items = cell.findable_items
             items_entry.insert(0, items)
             items_entry.pack(padx=15, pady=(0, 10))
             if items:
@@ -778,13 +1048,9 @@ def setup_main_ui():
             name_entry.bind("<Return>", lambda event: update_room_name_tutorial(name_entry, grid_x, grid_y))
             name_entry.bind("<FocusOut>", lambda event: update_room_name_tutorial(name_entry, grid_x, grid_y))
             def update_desc(event=None):
-                cell['desc'] = desc_text.get("1.0", "end").strip()
-                all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items'])
-                cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
+                room_map.set_field(key, 'desc', desc_text.get("1.0", "end").strip())
             def update_items(event=None):
-                cell['findable_items'] = items_entry.get().strip()
-                all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items'])
-                cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
+                room_map.set_field(key, 'findable_items', items_entry.get().strip())
             desc_text.bind("<FocusOut>", update_desc)
             items_entry.bind("<FocusOut>", update_items)
             placeholder_text = ctk.CTkLabel(room_details_content_frame,
@@ -793,152 +1059,84 @@ def setup_main_ui():
                                             text_color="#AAAAAA",
                                             wraplength=info_display_frame.winfo_width() - 30)
             placeholder_text.pack(pady=(5, 10), padx=10)
-        def show_remove_btn_tutorial(grid_x, grid_y):
-            cell = grid_state[grid_y][grid_x]
-            if 'remove_btn' in cell and cell['remove_btn'] is not None:
+        def room_text_color(cell):
+            return FILLED_COLOR if cell.is_complete(Echo_model.TUTORIAL_FIELDS) else "white"
+        # What the grid view shows for a cell, it only asks about cells on screen
+        def room_at_tutorial(grid_x, grid_y):
+            cell = room_map.get((0, grid_y, grid_x))
+            return (cell.name, room_text_color(cell)) if cell else None
+        def placeholder_at_tutorial(grid_x, grid_y):
+            return frontier.kind((0, grid_y, grid_x)) if is_add_mode[0] else None
+        def marker_at_tutorial(grid_x, grid_y):
+            return not is_add_mode[0] and can_remove_tutorial(grid_x, grid_y)
+        def apply_frontier_changes_tutorial():
+            # Only cells whose frontier state changed are touched, nothing is rescanned
+            for f, y, x in frontier.pop_changes():
+                if is_add_mode[0]:
+                    grid_view.refresh(x, y)
+        def on_room_map_event(event, key, cell):
+            if event == "reset":
+                redraw_grid_tutorial()
                 return
-            btn = ctk.CTkButton(cell['frame'], text="−", width=20, height=20,
-                                corner_radius=0, fg_color="#661111", hover_color="#881111",
-                                command=lambda: remove_room_tutorial(grid_x, grid_y))
-            btn.place(relx=1.0, rely=0.0, anchor="ne")
-            cell['remove_btn'] = btn
-        def hide_remove_btn_tutorial(grid_x, grid_y):
-            cell = grid_state[grid_y][grid_x]
-            if 'remove_btn' in cell and cell['remove_btn'] is not None:
-                cell['remove_btn'].destroy()
-                cell['remove_btn'] = None
-        def hide_all_remove_buttons_tutorial():
-            for y in range(GRID_DIM_Y):
-                for x in range(GRID_DIM_X):
-                    cell = grid_state[y][x]
-                    if cell and 'remove_btn' in cell and cell['remove_btn'] is not None:
-                        cell['remove_btn'].destroy()
-                        cell['remove_btn'] = None
-        def show_all_remove_buttons_tutorial():
-            for y in range(GRID_DIM_Y):
-                for x in range(GRID_DIM_X):
-                    if grid_state[y][x] is not None:
-                        if can_remove_tutorial(x, y):
-                            show_remove_btn_tutorial(x, y)
-                        else:
-                            hide_remove_btn_tutorial(x, y)
-        def add_room_tutorial(grid_x, grid_y, is_immovable=False, initial_name="Room"):
-            nonlocal grid_state
-            room = ctk.CTkFrame(grid_container, width=GRID_SIZE, height=GRID_SIZE,
-                                fg_color=BACKGROUND_COLOR, border_width=2,
-                                border_color="white", corner_radius=0)
-            room.place(x=grid_x * GRID_SIZE + grid_canvas.winfo_x(),
-                    y=grid_y * GRID_SIZE + grid_canvas.winfo_y())
-            cell = grid_state[grid_y][grid_x] or {'name': initial_name}
-            all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items'])
-            text_color = FILLED_COLOR if all_filled else "white"
-            lbl = ctk.CTkLabel(room, text=cell.get('name', initial_name), fg_color="transparent",
-                            font=(custom_font_family, 10), wraplength=GRID_SIZE-5, text_color=text_color)
-            lbl.pack(fill="both", expand=True)
-            grid_state[grid_y][grid_x] = cell
-            cell['frame'] = room
-            cell['label'] = lbl
-            try:
-                lbl.bind("<Button-1>", lambda e, x=grid_x, y=grid_y: display_room_details_tutorial(x, y))
-            except Exception:
-                pass
-            if not is_immovable:
-                def on_room_enter(e, x=grid_x, y=grid_y):
-                    if is_add_mode[0]:
-                        show_adjacent_placeholders_tutorial()
-                room.bind("<Enter>", on_room_enter)
-                lbl.bind("<Enter>", on_room_enter)
+            _, y, x = key
+            grid_view.refresh(x, y)
+            apply_frontier_changes_tutorial()
+        room_map.subscribe(on_room_map_event)
         def place_room_tutorial(grid_x, grid_y):
-            add_room_tutorial(grid_x, grid_y, initial_name=f"Room {grid_x}-{grid_y}")
-            show_adjacent_placeholders_tutorial()
-        def show_adjacent_placeholders_tutorial():
-            nonlocal grid_state
-            nonlocal plus_buttons
-            # Clear old buttons
-            for b in list(plus_buttons.values()):
-                try:
-                    b.destroy()
-                except Exception:
-                    pass
-            plus_buttons.clear()
-       
-            if not is_add_mode[0]: # Remove Mode
-                show_all_remove_buttons_tutorial()
-                return
-       
-            # Add Mode: Show green "+" buttons around existing rooms
-            directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-            for y in range(GRID_DIM_Y):
-                for x in range(GRID_DIM_X):
-                    if grid_state[y][x] is not None:
-                        for dx, dy in directions:
-                            nx, ny = x + dx, y + dy
-                            if 0 <= nx < GRID_DIM_X and 0 <= ny < GRID_DIM_Y and grid_state[ny][nx] is None:
-                                key = (nx, ny)
-                                if key not in plus_buttons:
-                                    btn = ctk.CTkButton(grid_container, text="+", width=GRID_SIZE, height=GRID_SIZE,
-                                                        corner_radius=0, fg_color=BACKGROUND_COLOR, hover_color="#555555",
-                                                        border_width=2, border_color="white",
-                                                        command=lambda gx=nx, gy=ny: place_room_tutorial(gx, gy))
-                                    btn.place(x=nx * GRID_SIZE + grid_canvas.winfo_x(),
-                                              y=ny * GRID_SIZE + grid_canvas.winfo_y())
-                                    plus_buttons[key] = btn
+            room_map.add_room((0, grid_y, grid_x), Echo_model.Room(name=f"Room {grid_x}-{grid_y}"))
         def redraw_grid_tutorial():
-            nonlocal grid_state
-            for w in grid_container.winfo_children():
-                if w != grid_canvas:
-                    try:
-                        w.destroy()
-                    except Exception:
-                        pass
-            if not grid_state:
-                return
-            for y in range(GRID_DIM_Y):
-                for x in range(GRID_DIM_X):
-                    cell = grid_state[y][x]
-                    if cell is not None:
-                        add_room_tutorial(x, y, is_immovable=True, initial_name=cell.get('name', 'Room'))
-            show_adjacent_placeholders_tutorial()
-        def setup_grid_tutorial(event=None):
-            grid_canvas.delete("all")
-            grid_width = GRID_DIM_X * GRID_SIZE
-            grid_height = GRID_DIM_Y * GRID_SIZE
-            grid_canvas.place(x=0, y=0, width=grid_width, height=grid_height)
-            show_adjacent_placeholders_tutorial()
+            # Add Mode shows "+" placeholders on the frontier, Remove Mode the remove markers
+            started = time.perf_counter()
+            frontier.pop_changes()
+            grid_view.redraw()
+            report_timing("Tutorial redraw", started, grid_view)
         # NEW: Toggle button for Add/Remove Mode
         def toggle_mode_tutorial():
             is_add_mode[0] = not is_add_mode[0]
             toggle_button.configure(text="Remove Mode" if is_add_mode[0] else "Add Mode",
                                 fg_color="#444444" if is_add_mode[0] else "#661111",
                                 hover_color="#666666" if is_add_mode[0] else "#881111")
-            if is_add_mode[0]:
-                hide_all_remove_buttons_tutorial()
-            show_adjacent_placeholders_tutorial()
+            redraw_grid_tutorial()
         # UI layout
         main_frame = ctk.CTkFrame(parent_tab, fg_color="#2b2b2b")
         main_frame.pack(fill="both", expand=True, padx=20, pady=(20, 60))
-   
+
         # NEW: Add toggle button above grid
         toggle_button = ctk.CTkButton(main_frame, text="Remove Mode", font=(custom_font_family, 14),
                                     fg_color="#444444", hover_color="#666666",
                                     command=toggle_mode_tutorial)
         toggle_button.pack(anchor="ne", padx=10, pady=(0, 5))
-   
+
         info_display_frame = ctk.CTkFrame(main_frame, fg_color="transparent", width=300)
         info_display_frame.pack(side="right", fill="y", padx=(10, 0), pady=10)
-   
+
         grid_container = ctk.CTkFrame(main_frame, fg_color="transparent")
         grid_container.pack(side="left", fill="both", expand=True, padx=(0, 10), pady=10)
-   
+
         grid_canvas = ctk.CTkCanvas(grid_container, bg=BACKGROUND_COLOR, highlightthickness=0)
+        grid_view = RoomGridView(grid_canvas, custom_font_family, room_at_tutorial, placeholder_at_tutorial,
+                                 marker_at_tutorial, on_select=display_room_details_tutorial,
+                                 on_place=place_room_tutorial, on_remove=remove_room_tutorial)
+        add_view_controls(grid_container, grid_view, custom_font_family).pack(anchor="w", pady=(0, 5))
         grid_canvas.pack(fill="both", expand=True)
-        grid_container.bind("<Configure>", setup_grid_tutorial)
-        # Initialize
-        setup_grid_tutorial()
-        def save_tutorial():
-            nonlocal current_room
+        def tutorial_dir():
+            return os.path.join(save_base_path, "..", "Working_game", "Text", "Room_descriptions", "Tutorial")
+        # Every edit is journaled, so a crash only loses what the last flush had not written
+        journal = Echo_save.EditJournal(room_map, tutorial_dir() + ".journal")
+        def tutorial_saved(quiet, generation):
+            def done(snapshot, summary, error):
+                if error:
+                    saver.failed(snapshot[1])
+                    CTkMessagebox(title="Error", message=f"Failed to save tutorial floors:\n{error}", icon="cancel")
+                    return
+                print(f"Tutorial saved: {summary['rooms']} rooms changed, {summary['written']} files written, "
+                      f"{summary['removed']} removed")
+                journal.compacted(generation)
+                if not quiet:
+                    CTkMessagebox(title="Success", message="Tutorial floors saved!", icon="check")
+            return done
+        def save_tutorial(quiet=False):
             nonlocal info_display_frame
-            nonlocal grid_state
             if current_room[0] is not None:
                 x, y = current_room
                 frame = info_display_frame.winfo_children()[0] if info_display_frame.winfo_children() else None
@@ -948,140 +1146,62 @@ def setup_main_ui():
                         name_entry = children[2]
                         desc_text = children[4]
                         items_entry = children[6]
-                        cell = grid_state[y][x]
-                        if cell:
-                            cell['name'] = name_entry.get().strip()
-                            cell['desc'] = desc_text.get("1.0", "end").strip()
-                            cell['findable_items'] = items_entry.get().strip()
-            script_dir = save_base_path
-            root_folder = os.path.join(script_dir, "..", "Working_game")
-            tutorial_dir = os.path.join(root_folder, "Text", "Room_descriptions", "Tutorial")
-            if os.path.exists(tutorial_dir):
-                shutil.rmtree(tutorial_dir)
-            os.makedirs(tutorial_dir)
-            for y in range(GRID_DIM_Y):
-                for x in range(GRID_DIM_X):
-                    cell = grid_state[y][x]
-                    if cell is not None:
-                        room_dir = os.path.join(tutorial_dir, f"y{y+1}_x{x+1}")
-                        os.makedirs(room_dir)
-                        name = cell.get('name', '')
-                        desc = cell.get('desc', '')
-                        with open(os.path.join(room_dir, "Description.txt"), "w", encoding="utf-8") as f:
-                            f.write(f"{name}\n-----\n{desc}")
-                        items_str = cell.get('findable_items', '')
-                        if items_str:
-                            items = [item.strip() for item in items_str.split(',')]
-                            with open(os.path.join(room_dir, "Items.txt"), "w", encoding="utf-8") as f:
-                                f.write("\n".join(items))
-                        exits = []
-                        directions = {
-                            "north": (x, y-1),
-                            "south": (x, y+1),
-                            "east": (x+1, y),
-                            "west": (x-1, y),
-                        }
-                        for dir_name, (nx, ny) in directions.items():
-                            if 0 <= nx < GRID_DIM_X and 0 <= ny < GRID_DIM_Y and grid_state[ny][nx] is not None:
-                                exits.append(dir_name)
-                        if exits:
-                            with open(os.path.join(room_dir, "Exits.txt"), "w", encoding="utf-8") as f:
-                                f.write("\n".join(exits))
-            load_tutorial_data()
-            if current_room[0] is not None:
-                display_room_details_tutorial(current_room[0], current_room[1])
-            CTkMessagebox(title="Success", message="Tutorial floors saved!", icon="check")
+                        key = (0, y, x)
+                        room_map.set_field(key, 'name', name_entry.get().strip())
+                        room_map.set_field(key, 'desc', desc_text.get("1.0", "end").strip())
+                        room_map.set_field(key, 'findable_items', items_entry.get().strip())
+            queue_tutorial_save(quiet)
+        def queue_tutorial_save(quiet):
+            # The journal so far is sealed with the snapshot and dropped once it is on disk
+            generation = journal.rotate()
+            save_queue.submit("tutorial", "tutorial", (tutorial_dir(), saver.take_changes()), write_rooms,
+                              tutorial_saved(quiet, generation), merge=merge_room_saves)
+        def compact_tutorial_journal():
+            if journal.edits:
+                queue_tutorial_save(quiet=True)
+            app.after(Echo_save.JOURNAL_COMPACT_INTERVAL * 1000, compact_tutorial_journal)
         def load_tutorial_data():
-            nonlocal grid_state
-            script_dir = save_base_path
-            tutorial_dir = os.path.join(script_dir, "..", "Working_game", "Text", "Room_descriptions", "Tutorial")
-            grid_state = [[None for _ in range(GRID_DIM_X)] for _ in range(GRID_DIM_Y)]
-            if os.path.exists(tutorial_dir):
-                for room_folder in os.listdir(tutorial_dir):
-                    room_path = os.path.join(tutorial_dir, room_folder)
-                    if os.path.isdir(room_path) and '_' in room_folder:
-                        try:
-                            y_str, x_str = room_folder.split('_')
-                            y = int(y_str[1:]) - 1
-                            x = int(x_str[1:]) - 1
-                            if 0 <= y < GRID_DIM_Y and 0 <= x < GRID_DIM_X:
-                                cell = {}
-                                desc_path = os.path.join(room_path, "Description.txt")
-                                if os.path.exists(desc_path):
-                                    with open(desc_path, 'r', encoding='utf-8') as f:
-                                        content = f.read().split('-----')
-                                        if len(content) >= 2:
-                                            cell['name'] = content[0].strip()
-                                            cell['desc'] = '-----'.join(content[1:]).strip()
-                                        else:
-                                            cell['name'] = content[0].strip()
-                                            cell['desc'] = ''
-                                items_path = os.path.join(room_path, "Items.txt")
-                                if os.path.exists(items_path):
-                                    with open(items_path, 'r', encoding='utf-8') as f:
-                                        items = f.read().splitlines()
-                                        cell['findable_items'] = ','.join(items)
-                                grid_state[y][x] = cell
-                        except ValueError:
-                            pass
-            redraw_grid_tutorial()
+            Echo_model.load_rooms(room_map, tutorial_dir(), saver)
+            # Edits an earlier session journaled but never saved, folded into the folders right away
+            if journal.replay():
+                queue_tutorial_save(quiet=True)
         def check_tutorial_rooms():
             errors = []
-            for y in range(GRID_DIM_Y):
-                for x in range(GRID_DIM_X):
-                    cell = grid_state[y][x]
-                    if cell is not None:
-                        if not cell.get('name', '').strip():
-                            errors.append(f"Tutorial Room ({x}, {y}): Name is missing.")
-                        if not cell.get('desc', '').strip():
-                            errors.append(f"Tutorial Room ({x}, {y}): Description is missing.")
-                        if not cell.get('findable_items', '').strip():
-                            errors.append(f"Tutorial Room ({x}, {y}): Findable Items is missing.")
+            for key in sorted(room_map):
+                _, y, x = key
+                cell = room_map.get(key)
+                if not cell.name.strip():
+                    errors.append(f"Tutorial Room ({x}, {y}): Name is missing.")
+                if not cell.desc.strip():
+                    errors.append(f"Tutorial Room ({x}, {y}): Description is missing.")
+                if not cell.findable_items.strip():
+                    errors.append(f"Tutorial Room ({x}, {y}): Findable Items is missing.")
             return errors
         load_tutorial_data()
+        app.after(Echo_save.JOURNAL_COMPACT_INTERVAL * 1000, compact_tutorial_journal)
         return save_tutorial, load_tutorial_data, check_tutorial_rooms
     def setup_main_level_tab(parent_tab, custom_font_family):
-        GRID_SIZE = 40
-        GRID_DIM_X, GRID_DIM_Y = 33, 20
         BACKGROUND_COLOR = "#333333"
         BORDER_WIDTH = 2
-        BORDER_COLOR = "white"
-        floors = {}
+        # Room data lives in the model, the canvas below only mirrors the current floor
+        room_map = Echo_model.RoomMap(Echo_model.MAIN_FIELDS, vertical=True)
+        # Subscribed before the view, so they are current by the time the view hears of an edit
+        frontier = Echo_model.Frontier(room_map)
+        removability = Echo_model.Removability(room_map)
+        saver = Echo_model.SaveTracker(room_map)
         current_floor = [0]
         info_display_frame = None
         current_room = [None, None]
         FILLED_COLOR = "green"
-        directions_3d = [(0,0,1),(0,0,-1),(0,1,0),(0,-1,0),(1,0,0),(-1,0,0)]
         # NEW: Track the current mode (True for Add Mode, False for Remove Mode)
         is_add_mode = [True]
         def can_remove_main(rfloor, rx, ry):
-            if rfloor == 0 and rx == 0 and ry == 0:
-                return False
-            total = sum(sum(1 for row in floors[f]["grid_state"] for c in row if c is not None) for f in floors)
-            if total <= 1:
-                return False
-            temp = floors[rfloor]["grid_state"][ry][rx]
-            floors[rfloor]["grid_state"][ry][rx] = None
-            visited = set()
-            q = deque([(0,0,0)])
-            visited.add((0,0,0))
-            while q:
-                f, y, x = q.popleft()
-                for df, dy, dx in directions_3d:
-                    nf, ny, nx = f + df, y + dy, x + dx
-                    if nf in floors and 0 <= ny < GRID_DIM_Y and 0 <= nx < GRID_DIM_X and floors[nf]["grid_state"][ny][nx] is not None and (nf, ny, nx) not in visited:
-                        visited.add((nf, ny, nx))
-                        q.append((nf, ny, nx))
-            connected = len(visited)
-            floors[rfloor]["grid_state"][ry][rx] = temp
-            return connected == total - 1
+            return (rfloor, ry, rx) in removability.rooms()
         def remove_room_main(grid_x, grid_y):
             if not can_remove_main(current_floor[0], grid_x, grid_y):
                 return
-            floor = floors[current_floor[0]]
-            floor["grid_state"][grid_y][grid_x]['frame'].destroy()
-            floor["grid_state"][grid_y][grid_x] = None
-            show_adjacent_placeholders()
+            room_map.remove_room((current_floor[0], grid_y, grid_x))
+            grid_view.refresh_markers()
         def clear_info_display_frame_main():
             nonlocal info_display_frame
             if info_display_frame is None:
@@ -1092,37 +1212,18 @@ def setup_main_ui():
                 except Exception:
                     pass
         def update_room_name_main(entry_widget, grid_x, grid_y):
-            new_name = entry_widget.get()
-            floor = floors.get(current_floor[0])
-            if not floor:
-                return
-            grid_state = floor["grid_state"]
-            cell = grid_state[grid_y][grid_x]
-            if cell is None:
-                return
-            cell['name'] = new_name
-            if 'label' in cell and cell['label']:
-                try:
-                    cell['label'].configure(text=new_name)
-                    all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items', 'usable_item', 'item_used_text', 'item_found', 'damage_text'])
-                    cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
-                except Exception:
-                    pass
+            room_map.set_field((current_floor[0], grid_y, grid_x), 'name', entry_widget.get())
         def display_room_details_main(grid_x, grid_y):
             nonlocal info_display_frame
             if info_display_frame is None:
                 return
             clear_info_display_frame_main()
-            nonlocal current_room
             current_room[:] = [grid_x, grid_y]
-            floor = floors.get(current_floor[0])
-            if not floor:
-                return
-            grid_state = floor["grid_state"]
-            cell = grid_state[grid_y][grid_x]
+            key = (current_floor[0], grid_y, grid_x)
+            cell = room_map.get(key)
             if cell is None:
                 return
-            current_name = cell.get('name', '')
+            current_name = cell.name
             room_details_content_frame = ctk.CTkFrame(info_display_frame, fg_color="#333333", corner_radius=10)
             room_details_content_frame.pack(fill="both", expand=True, padx=5, pady=5)
             room_title = ctk.CTkLabel(room_details_content_frame,
@@ -1155,7 +1256,7 @@ def setup_main_ui():
                                     height=100,
                                     font=(custom_font_family, 14),
                                     fg_color="#444444")
-            desc = cell.get('desc', '')
+            desc = cell.desc
             desc_text.insert("1.0", desc)
             desc_text.pack(padx=15, pady=(0, 10))
             if desc:
@@ -1171,7 +1272,7 @@ def setup_main_ui():
                                     width=250,
                                     font=(custom_font_family, 14),
                                     placeholder_text="Enter items, separated by commas")
-            findable_items = cell.get('findable_items', '')
+            findable_items = cell.findable_items
             items_entry.insert(0, findable_items)
             items_entry.pack(padx=15, pady=(0, 10))
             if findable_items:
@@ -1187,7 +1288,7 @@ def setup_main_ui():
                                             width=250,
                                             font=(custom_font_family, 14),
                                             placeholder_text="Enter item")
-            usable_item = cell.get('usable_item', '')
+            usable_item = cell.usable_item
             usable_items_entry.insert(0, usable_item)
             usable_items_entry.pack(padx=15, pady=(0, 10))
             if usable_item:
@@ -1204,7 +1305,7 @@ def setup_main_ui():
                                             height=100,
                                             font=(custom_font_family, 14),
                                             fg_color="#444444")
-            item_used_text = cell.get('item_used_text', '')
+            item_used_text = cell.item_used_text
             item_used_text_entry.insert("1.0", item_used_text)
             item_used_text_entry.pack(padx=15, pady=(0, 10))
             if item_used_text:
@@ -1220,7 +1321,7 @@ def setup_main_ui():
                                             width=250,
                                             font=(custom_font_family, 14),
                                             placeholder_text="Enter item")
-            item_found = cell.get('item_found', '')
+            item_found = cell.item_found
             items_found_entry.insert(0, item_found)
             items_found_entry.pack(padx=15, pady=(0, 10))
             if item_found:
@@ -1237,7 +1338,7 @@ def setup_main_ui():
                                             height=100,
                                             font=(custom_font_family, 14),
                                             fg_color="#444444")
-            damage_text = cell.get('damage_text', '')
+            damage_text = cell.damage_text
             damage_text_entry.insert("1.0", damage_text)
             damage_text_entry.pack(padx=15, pady=(0, 10))
             if damage_text:
@@ -1247,29 +1348,17 @@ def setup_main_ui():
             name_entry.bind("<Return>", lambda event: update_room_name_main(name_entry, grid_x, grid_y))
             name_entry.bind("<FocusOut>", lambda event: update_room_name_main(name_entry, grid_x, grid_y))
             def update_desc(event=None):
-                cell['desc'] = desc_text.get("1.0", "end").strip()
-                all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items', 'usable_item', 'item_used_text', 'item_found', 'damage_text'])
-                cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
+                room_map.set_field(key, 'desc', desc_text.get("1.0", "end").strip())
             def update_items(event=None):
-                cell['findable_items'] = items_entry.get().strip()
-                all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items', 'usable_item', 'item_used_text', 'item_found', 'damage_text'])
-                cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
+                room_map.set_field(key, 'findable_items', items_entry.get().strip())
             def update_usable(event=None):
-                cell['usable_item'] = usable_items_entry.get().strip()
-                all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items', 'usable_item', 'item_used_text', 'item_found', 'damage_text'])
-                cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
+                room_map.set_field(key, 'usable_item', usable_items_entry.get().strip())
             def update_used_text(event=None):
-                cell['item_used_text'] = item_used_text_entry.get("1.0", "end").strip()
-                all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items', 'usable_item', 'item_used_text', 'item_found', 'damage_text'])
-                cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
+                room_map.set_field(key, 'item_used_text', item_used_text_entry.get("1.0", "end").strip())
             def update_found(event=None):
-                cell['item_found'] = items_found_entry.get().strip()
-                all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items', 'usable_item', 'item_used_text', 'item_found', 'damage_text'])
-                cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
+                room_map.set_field(key, 'item_found', items_found_entry.get().strip())
             def update_damage(event=None):
-                cell['damage_text'] = damage_text_entry.get("1.0", "end").strip()
-                all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items', 'usable_item', 'item_used_text', 'item_found', 'damage_text'])
-                cell['label'].configure(text_color=FILLED_COLOR if all_filled else "white")
+                room_map.set_field(key, 'damage_text', damage_text_entry.get("1.0", "end").strip())
             desc_text.bind("<FocusOut>", update_desc)
             items_entry.bind("<FocusOut>", update_items)
             usable_items_entry.bind("<FocusOut>", update_usable)
@@ -1282,48 +1371,12 @@ def setup_main_ui():
                                             text_color="#AAAAAA",
                                             wraplength=info_display_frame.winfo_width() - 30)
             placeholder_text.pack(pady=(5, 10), padx=10)
-        def show_remove_btn_main(grid_x, grid_y):
-            floor = floors[current_floor[0]]
-            grid_state = floor["grid_state"]
-            cell = grid_state[grid_y][grid_x]
-            if 'remove_btn' in cell and cell['remove_btn'] is not None:
-                return
-            btn = ctk.CTkButton(cell['frame'], text="−", width=20, height=20,
-                                corner_radius=0, fg_color="#661111", hover_color="#881111",
-                                command=lambda: remove_room_main(grid_x, grid_y))
-            btn.place(relx=1.0, rely=0.0, anchor="ne")
-            cell['remove_btn'] = btn
-        def hide_remove_btn_main(grid_x, grid_y):
-            floor = floors[current_floor[0]]
-            grid_state = floor["grid_state"]
-            cell = grid_state[grid_y][grid_x]
-            if 'remove_btn' in cell and cell['remove_btn'] is not None:
-                cell['remove_btn'].destroy()
-                cell['remove_btn'] = None
-        def hide_all_remove_buttons_main():
-            for floor_idx in floors:
-                grid_state = floors[floor_idx]["grid_state"]
-                for y in range(GRID_DIM_Y):
-                    for x in range(GRID_DIM_X):
-                        cell = grid_state[y][x]
-                        if cell and 'remove_btn' in cell and cell['remove_btn'] is not None:
-                            cell['remove_btn'].destroy()
-                            cell['remove_btn'] = None
-        def show_all_remove_buttons_main():
-            grid_state = floors[current_floor[0]]["grid_state"]
-            for y in range(GRID_DIM_Y):
-                for x in range(GRID_DIM_X):
-                    if grid_state[y][x] is not None:
-                        if can_remove_main(current_floor[0], x, y):
-                            show_remove_btn_main(x, y)
-                        else:
-                            hide_remove_btn_main(x, y)
         def refresh_floor_list():
             for widget in floor_list_frame.winfo_children():
                 widget.destroy()
             header = ctk.CTkLabel(floor_list_frame, text="Floors", font=(custom_font_family,16,"bold"))
             header.pack(pady=(10,5))
-            for i in range(len(floors)):
+            for i in range(room_map.floor_count):
                 floor_frame = ctk.CTkFrame(floor_list_frame, fg_color="transparent")
                 floor_frame.pack(fill="x", pady=2, padx=5)
                 floor_btn = ctk.CTkButton(floor_frame,
@@ -1333,8 +1386,8 @@ def setup_main_ui():
                                         hover_color="#321FDD" if i == current_floor[0] else "#444444",
                                         text_color="white")
                 floor_btn.pack(side="left", expand=True, fill="x", padx=(5,5))
-                if len(floors) > 1:
-                    tooltip_text = "Warning: Removing this floor will also remove all floors above it!" if i < len(floors) - 1 else None
+                if room_map.floor_count > 1:
+                    tooltip_text = "Warning: Removing this floor will also remove all floors above it!" if i < room_map.floor_count - 1 else None
                     try:
                         remove_btn = ctk.CTkButton(floor_frame,
                                                 text="×",
@@ -1358,18 +1411,15 @@ def setup_main_ui():
             add_btn.pack(pady=10)
         def switch_floor(floor_index):
             current_floor[0] = floor_index
-            if floor_index not in floors:
-                floors[floor_index] = {
-                    "grid_state": [[None for _ in range(GRID_DIM_X)] for _ in range(GRID_DIM_Y)],
-                    "plus_buttons": {},
-                }
+            while room_map.floor_count <= floor_index:
+                room_map.add_floor()
             refresh_floor_list()
             redraw_floor()
         drag_data = {"start_y": 0, "source_idx": None}
         def start_drag(event, floor_idx):
             drag_data["start_y"] = event.y_root
             drag_data["source_idx"] = floor_idx
-        
+
         def handle_drag(event, floor_idx):
             if drag_data["source_idx"] is None:
                 return
@@ -1391,14 +1441,7 @@ def setup_main_ui():
         def reorder_floors(old_idx, new_idx):
             if old_idx == new_idx:
                 return
-            floors_list = [(i, data) for i, data in sorted(floors.items())]
-            floor_to_move = floors_list.pop(old_idx)
-            floors_list.insert(new_idx, floor_to_move)
-            floors.clear()
-            new_floors = {}
-            for new_idx_key, (_, data) in enumerate(floors_list):
-                new_floors[new_idx_key] = data
-            floors.update(new_floors)
+            room_map.move_floor(old_idx, new_idx)
             if current_floor[0] == old_idx:
                 current_floor[0] = new_idx
             elif old_idx < new_idx:
@@ -1408,173 +1451,61 @@ def setup_main_ui():
                 if current_floor[0] >= new_idx and current_floor[0] < old_idx:
                     current_floor[0] += 1
             refresh_floor_list()
+            redraw_floor()  # The floors above and below may have changed
         def remove_floor(floor_idx):
-            if len(floors) <= 1:
+            if room_map.floor_count <= 1:
                 return
-            floors_to_keep = {}
-            for idx, data in sorted(floors.items()):
-                if idx < floor_idx:
-                    floors_to_keep[idx] = data
-            floors.clear()
-            floors.update(floors_to_keep)
-            new_floors = {}
-            for new_idx, (_, data) in enumerate(sorted(floors.items())):
-                new_floors[new_idx] = data
-            floors.clear()
-            floors.update(new_floors)
+            room_map.remove_floors_from(floor_idx)
             if current_floor[0] >= floor_idx:
-                current_floor[0] = max(0, len(floors) - 1)
+                current_floor[0] = max(0, room_map.floor_count - 1)
             refresh_floor_list()
             redraw_floor()
         def add_new_floor():
-            new_index = len(floors)
-            floors[new_index] = {
-                "grid_state": [[None for _ in range(GRID_DIM_X)] for _ in range(GRID_DIM_Y)],
-                "plus_buttons": {},
-            }
+            new_index = room_map.add_floor()
             refresh_floor_list()
             switch_floor(new_index)
-        def add_room_to_floor(grid_x, grid_y, is_immovable=False, initial_name="Room"):
-            floor = floors[current_floor[0]]
-            grid_state = floor["grid_state"]
-            room = ctk.CTkFrame(grid_container, width=GRID_SIZE, height=GRID_SIZE,
-                                fg_color=BACKGROUND_COLOR, border_width=BORDER_WIDTH,
-                                border_color=BORDER_COLOR, corner_radius=0)
-            room.place(x=grid_x * GRID_SIZE + grid_canvas.winfo_x(),
-                    y=grid_y * GRID_SIZE + grid_canvas.winfo_y())
-            cell = grid_state[grid_y][grid_x] or {'name': initial_name}
-            all_filled = all(cell.get(k, '').strip() for k in ['name', 'desc', 'findable_items', 'usable_item', 'item_used_text', 'item_found', 'damage_text'])
-            text_color = FILLED_COLOR if all_filled else "white"
-            lbl = ctk.CTkLabel(room, text=cell.get('name', initial_name), fg_color="transparent",
-                            font=(custom_font_family, 10), wraplength=GRID_SIZE-5, text_color=text_color)
-            lbl.pack(fill="both", expand=True)
-            grid_state[grid_y][grid_x] = cell
-            cell['frame'] = room
-            cell['label'] = lbl
-            try:
-                lbl.bind("<Button-1>", lambda e, x=grid_x, y=grid_y: display_room_details_main(x, y))
-            except Exception:
-                pass
-            if not is_immovable:
-                def on_room_enter(e, x=grid_x, y=grid_y):
-                    if is_add_mode[0]:
-                        show_adjacent_placeholders()
-                room.bind("<Enter>", on_room_enter)
-                lbl.bind("<Enter>", on_room_enter)
+        def room_text_color(cell):
+            return FILLED_COLOR if cell.is_complete(Echo_model.MAIN_FIELDS) else "white"
+        # What the grid view shows for a cell of the current floor, it only asks about cells on screen
+        def room_at_main(grid_x, grid_y):
+            cell = room_map.get((current_floor[0], grid_y, grid_x))
+            return (cell.name, room_text_color(cell)) if cell else None
+        def placeholder_at_main(grid_x, grid_y):
+            return frontier.kind((current_floor[0], grid_y, grid_x)) if is_add_mode[0] else None
+        def marker_at_main(grid_x, grid_y):
+            return not is_add_mode[0] and can_remove_main(current_floor[0], grid_x, grid_y)
+        def apply_frontier_changes():
+            # Only cells whose frontier state changed are touched, nothing is rescanned
+            for f, y, x in frontier.pop_changes():
+                if is_add_mode[0] and f == current_floor[0]:
+                    grid_view.refresh(x, y)
+        def on_room_map_event(event, key, cell):
+            if event in ("reset", "floors"):
+                return  # The caller redraws once it has settled the current floor
+            floor, y, x = key
+            if floor == current_floor[0]:
+                grid_view.refresh(x, y)
+            apply_frontier_changes()
+        room_map.subscribe(on_room_map_event)
         def place_room_on_floor(grid_x, grid_y):
-            add_room_to_floor(grid_x, grid_y, initial_name=f"Room {grid_x}-{grid_y}")
-            show_adjacent_placeholders()
-        def show_adjacent_placeholders():
-            floor = floors[current_floor[0]]
-            grid_state = floor["grid_state"]
-            plus_buttons = floor["plus_buttons"]
-            for b in list(plus_buttons.values()):
-                try:
-                    b.destroy()
-                except Exception:
-                    pass
-            plus_buttons.clear()
-       
-            if not is_add_mode[0]: # Remove Mode
-                show_all_remove_buttons_main()
-                return
-       
-            # Add Mode
-            # Add based on floor below
-            floor_below_idx = current_floor[0] - 1
-            if floor_below_idx in floors:
-                floor_below = floors[floor_below_idx]["grid_state"]
-                for y in range(GRID_DIM_Y):
-                    for x in range(GRID_DIM_X):
-                        if floor_below[y][x] is not None:
-                            if grid_state[y][x] is None:
-                                btn = ctk.CTkButton(grid_container, text="+", width=20, height=20,
-                                                    corner_radius=0, fg_color=BACKGROUND_COLOR, hover_color="#666666",
-                                                    border_width=BORDER_WIDTH, border_color=BORDER_COLOR,
-                                                    command=lambda gx=x, gy=y: place_room_on_floor(gx, gy))
-                                btn.place(x=x * GRID_SIZE + grid_canvas.winfo_x() + GRID_SIZE//2 - 10,
-                                        y=y * GRID_SIZE + grid_canvas.winfo_y() + GRID_SIZE//2 - 10)
-                                plus_buttons[f"below_{x}_{y}"] = btn
-            # Add based on floor above
-            floor_above_idx = current_floor[0] + 1
-            if floor_above_idx in floors:
-                floor_above = floors[floor_above_idx]["grid_state"]
-                for y in range(GRID_DIM_Y):
-                    for x in range(GRID_DIM_X):
-                        if floor_above[y][x] is not None:
-                            if grid_state[y][x] is None:
-                                btn = ctk.CTkButton(grid_container, text="+", width=20, height=20,
-                                                    corner_radius=0, fg_color=BACKGROUND_COLOR, hover_color="#666666",
-                                                    border_width=BORDER_WIDTH, border_color=BORDER_COLOR,
-                                                    command=lambda gx=x, gy=y: place_room_on_floor(gx, gy))
-                                btn.place(x=x * GRID_SIZE + grid_canvas.winfo_x() + GRID_SIZE//2 - 10,
-                                        y=y * GRID_SIZE + grid_canvas.winfo_y() + GRID_SIZE//2 - 10)
-                                plus_buttons[f"above_{x}_{y}"] = btn
-            # Add plus buttons around existing rooms on current floor
-            directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-            for y in range(GRID_DIM_Y):
-                for x in range(GRID_DIM_X):
-                    if grid_state[y][x] is not None:
-                        for dx, dy in directions:
-                            nx, ny = x + dx, y + dy
-                            if 0 <= nx < GRID_DIM_X and 0 <= ny < GRID_DIM_Y and grid_state[ny][nx] is None:
-                                key = (nx, ny)
-                                if key not in plus_buttons:
-                                    btn = ctk.CTkButton(grid_container, text="+", width=GRID_SIZE, height=GRID_SIZE,
-                                                        corner_radius=0, fg_color=BACKGROUND_COLOR, hover_color="#555555",
-                                                        border_width=BORDER_WIDTH, border_color=BORDER_COLOR,
-                                                        command=lambda gx=nx, gy=ny: place_room_on_floor(gx, gy))
-                                    btn.place(x=nx * GRID_SIZE + grid_canvas.winfo_x(),
-                                            y=ny * GRID_SIZE + grid_canvas.winfo_y())
-                                    plus_buttons[key] = btn
+            room_map.add_room((current_floor[0], grid_y, grid_x), Echo_model.Room(name=f"Room {grid_x}-{grid_y}"))
         def redraw_floor():
-            for w in grid_container.winfo_children():
-                if w != grid_canvas:
-                    try:
-                        w.destroy()
-                    except Exception:
-                        pass
-            floor = floors.get(current_floor[0], None)
-            if not floor:
-                return
-            grid_state = floor["grid_state"]
-            for y in range(GRID_DIM_Y):
-                for x in range(GRID_DIM_X):
-                    cell = grid_state[y][x]
-                    if cell is not None:
-                        add_room_to_floor(x, y, is_immovable=True, initial_name=cell.get('name', 'Room'))
-            show_adjacent_placeholders()
-        def setup_grid_main(event=None):
-            grid_canvas.delete("all")
-            grid_width = GRID_DIM_X * GRID_SIZE
-            grid_height = GRID_DIM_Y * GRID_SIZE
-            grid_canvas.place(x=0, y=0, width=grid_width, height=grid_height)
-            if not floors:
-                floors[0] = {"grid_state": [[None for _ in range(GRID_DIM_X)] for _ in range(GRID_DIM_Y)],
-                            "plus_buttons": {}}
-            if 0 in floors:
-                original_floor = current_floor[0]
-                current_floor[0] = 0
-                if floors[0]["grid_state"][0][0] is None:
-                    add_room_to_floor(0, 0, is_immovable=True, initial_name="Start Room")
-                current_floor[0] = original_floor
-            for idx in list(floors.keys()):
-                if len(floors[idx]["grid_state"]) != GRID_DIM_Y or len(floors[idx]["grid_state"][0]) != GRID_DIM_X:
-                    floors[idx]["grid_state"] = [[None for _ in range(GRID_DIM_X)] for _ in range(GRID_DIM_Y)]
-                    floors[idx]["plus_buttons"] = {}
-                    if idx == 0 and floors[0]["grid_state"][0][0] is None:
-                        add_room_to_floor(0, 0, is_immovable=True, initial_name="Start Room")
-            redraw_floor()
-            refresh_floor_list()
+            # Add Mode: the frontier covers rooms beside this one and on the floors below and above,
+            # Remove Mode shows the remove markers instead
+            started = time.perf_counter()
+            frontier.pop_changes()
+            grid_view.redraw()
+            report_timing(f"Floor {current_floor[0]} redraw", started, grid_view)
+        def ensure_start_room():
+            if Echo_model.START_ROOM not in room_map:
+                room_map.add_room(Echo_model.START_ROOM, Echo_model.Room(name="Start Room"))
         # NEW: Toggle button for Add/Remove Mode
         def toggle_mode_main():
             is_add_mode[0] = not is_add_mode[0]
             toggle_button.configure(text="Remove Mode" if is_add_mode[0] else "Add Mode",
                                 fg_color="#444444" if is_add_mode[0] else "#661111",
                                 hover_color="#666666" if is_add_mode[0] else "#881111")
-            if is_add_mode[0]:
-                hide_all_remove_buttons_main()
-            show_adjacent_placeholders()
+            redraw_floor()
         # UI layout
         main_frame = ctk.CTkFrame(parent_tab, fg_color="#2b2b2b")
         main_frame.pack(fill="both", expand=True, padx=20, pady=(20, 60))
@@ -1590,16 +1521,31 @@ def setup_main_ui():
         grid_container = ctk.CTkFrame(main_frame, fg_color="transparent")
         grid_container.pack(side="left", fill="both", expand=True, padx=10, pady=10)
         grid_canvas = ctk.CTkCanvas(grid_container, bg=BACKGROUND_COLOR, highlightthickness=0)
+        grid_view = RoomGridView(grid_canvas, custom_font_family, room_at_main, placeholder_at_main,
+                                 marker_at_main, on_select=display_room_details_main,
+                                 on_place=place_room_on_floor, on_remove=remove_room_main,
+                                 border_width=BORDER_WIDTH)
+        add_view_controls(grid_container, grid_view, custom_font_family).pack(anchor="w", pady=(0, 5))
         grid_canvas.pack(fill="both", expand=True)
-        grid_container.bind("<Configure>", setup_grid_main)
-        # Initialize
-        setup_grid_main()
-        def save_main_level():
-            nonlocal current_room
+        def main_dir():
+            return os.path.join(save_base_path, "..", "Working_game", "Text", "Room_descriptions", "Main")
+        # Every edit is journaled, so a crash only loses what the last flush had not written
+        journal = Echo_save.EditJournal(room_map, main_dir() + ".journal")
+        def main_level_saved(quiet, generation):
+            def done(snapshot, summary, error):
+                if error:
+                    saver.failed(snapshot[1])
+                    CTkMessagebox(title="Error", message=f"Failed to save main levels:\n{error}", icon="cancel")
+                    return
+                print(f"Main levels saved: {summary['rooms']} rooms changed, {summary['written']} files written, "
+                      f"{summary['removed']} removed")
+                journal.compacted(generation)
+                if not quiet:
+                    CTkMessagebox(title="Success", message="Main levels saved!", icon="check")
+            return done
+        def save_main_level(quiet=False):
             nonlocal info_display_frame
             if current_room[0] is not None:
-                floor = floors[current_floor[0]]
-                grid_state = floor["grid_state"]
                 x, y = current_room
                 frame = info_display_frame.winfo_children()[0] if info_display_frame.winfo_children() else None
                 if frame:
@@ -1612,145 +1558,46 @@ def setup_main_ui():
                         item_used_text_entry = children[10]
                         items_found_entry = children[12]
                         damage_text_entry = children[14]
-                        cell = grid_state[y][x]
-                        if cell:
-                            cell['name'] = name_entry.get().strip()
-                            cell['desc'] = desc_text.get("1.0", "end").strip()
-                            cell['findable_items'] = items_entry.get().strip()
-                            cell['usable_item'] = usable_items_entry.get().strip()
-                            cell['item_used_text'] = item_used_text_entry.get("1.0", "end").strip()
-                            cell['item_found'] = items_found_entry.get().strip()
-                            cell['damage_text'] = damage_text_entry.get("1.0", "end").strip()
-            script_dir = save_base_path
-            root_folder = os.path.join(script_dir, "..", "Working_game")
-            main_dir = os.path.join(root_folder, "Text", "Room_descriptions", "Main")
-            if os.path.exists(main_dir):
-                shutil.rmtree(main_dir)
-            os.makedirs(main_dir)
-            for floor_idx in sorted(floors.keys()):
-                floor_num = floor_idx + 1
-                floor_dir = os.path.join(main_dir, f"Floor_{floor_num}")
-                os.makedirs(floor_dir)
-                grid_state = floors[floor_idx]["grid_state"]
-                for y in range(GRID_DIM_Y):
-                    for x in range(GRID_DIM_X):
-                        cell = grid_state[y][x]
-                        if cell is not None:
-                            room_dir = os.path.join(floor_dir, f"y{y+1}_x{x+1}")
-                            os.makedirs(room_dir)
-                            name = cell.get('name', '')
-                            desc = cell.get('desc', '')
-                            with open(os.path.join(room_dir, "Description.txt"), "w", encoding="utf-8") as f:
-                                f.write(f"{name}\n-----\n{desc}")
-                            items_str = cell.get('findable_items', '')
-                            if items_str:
-                                items = [item.strip() for item in items_str.split(',')]
-                                with open(os.path.join(room_dir, "Items.txt"), "w", encoding="utf-8") as f:
-                                    f.write("\n".join(items))
-                            damage_text = cell.get('damage_text', '')
-                            if damage_text:
-                                with open(os.path.join(room_dir, "Strange_occerance.txt"), "w", encoding="utf-8") as f:
-                                    f.write(damage_text)
-                            usable_item = cell.get('usable_item', '')
-                            item_used_text = cell.get('item_used_text', '')
-                            item_found = cell.get('item_found', '')
-                            if usable_item or item_used_text or item_found:
-                                with open(os.path.join(room_dir, "Usable_Items.txt"), "w", encoding="utf-8") as f:
-                                    f.write(f"{usable_item}\n{item_used_text}\n{item_found}")
-                            exits = []
-                            directions = {
-                                "north": (x, y-1, floor_idx),
-                                "south": (x, y+1, floor_idx),
-                                "east": (x+1, y, floor_idx),
-                                "west": (x-1, y, floor_idx),
-                                "up": (x, y, floor_idx + 1),
-                                "down": (x, y, floor_idx - 1),
-                            }
-                            for dir_name, (nx, ny, nf) in directions.items():
-                                if nf in floors:
-                                    gs = floors[nf]["grid_state"]
-                                    if 0 <= nx < GRID_DIM_X and 0 <= ny < GRID_DIM_Y and gs[ny][nx] is not None:
-                                        exits.append(dir_name)
-                            if exits:
-                                with open(os.path.join(room_dir, "Exits.txt"), "w", encoding="utf-8") as f:
-                                    f.write("\n".join(exits))
-            load_main_level_data()
-            if current_room[0] is not None:
-                display_room_details_main(current_room[0], current_room[1])
-            CTkMessagebox(title="Success", message="Main levels saved!", icon="check")
+                        key = (current_floor[0], y, x)
+                        room_map.set_field(key, 'name', name_entry.get().strip())
+                        room_map.set_field(key, 'desc', desc_text.get("1.0", "end").strip())
+                        room_map.set_field(key, 'findable_items', items_entry.get().strip())
+                        room_map.set_field(key, 'usable_item', usable_items_entry.get().strip())
+                        room_map.set_field(key, 'item_used_text', item_used_text_entry.get("1.0", "end").strip())
+                        room_map.set_field(key, 'item_found', items_found_entry.get().strip())
+                        room_map.set_field(key, 'damage_text', damage_text_entry.get("1.0", "end").strip())
+            queue_main_save(quiet)
+        def queue_main_save(quiet):
+            # The journal so far is sealed with the snapshot and dropped once it is on disk
+            generation = journal.rotate()
+            save_queue.submit("main", "main levels", (main_dir(), saver.take_changes()), write_rooms,
+                              main_level_saved(quiet, generation), merge=merge_room_saves)
+        def compact_main_journal():
+            if journal.edits:
+                queue_main_save(quiet=True)
+            app.after(Echo_save.JOURNAL_COMPACT_INTERVAL * 1000, compact_main_journal)
         def load_main_level_data():
-            script_dir = save_base_path
-            main_dir = os.path.join(script_dir, "..", "Working_game", "Text", "Room_descriptions", "Main")
-            floors.clear()
-            if os.path.exists(main_dir):
-                floor_folders = sorted(os.listdir(main_dir))
-                for floor_folder in floor_folders:
-                    if floor_folder.startswith("Floor_"):
-                        try:
-                            floor_idx = int(floor_folder.split('_')[1]) - 1
-                            floor_path = os.path.join(main_dir, floor_folder)
-                            grid_state = [[None for _ in range(GRID_DIM_X)] for _ in range(GRID_DIM_Y)]
-                            for room_folder in os.listdir(floor_path):
-                                room_path = os.path.join(floor_path, room_folder)
-                                if os.path.isdir(room_path) and '_' in room_folder:
-                                    try:
-                                        y_str, x_str = room_folder.split('_')
-                                        y = int(y_str[1:]) - 1
-                                        x = int(x_str[1:]) - 1
-                                        if 0 <= y < GRID_DIM_Y and 0 <= x < GRID_DIM_X:
-                                            cell = {}
-                                            desc_path = os.path.join(room_path, "Description.txt")
-                                            if os.path.exists(desc_path):
-                                                with open(desc_path, 'r', encoding='utf-8') as f:
-                                                    content = f.read().split('-----')
-                                                    if len(content) >= 2:
-                                                        cell['name'] = content[0].strip()
-                                                        cell['desc'] = '-----'.join(content[1:]).strip()
-                                                    else:
-                                                        cell['name'] = content[0].strip()
-                                                        cell['desc'] = ''
-                                            items_path = os.path.join(room_path, "Items.txt")
-                                            if os.path.exists(items_path):
-                                                with open(items_path, 'r', encoding='utf-8') as f:
-                                                    items = f.read().splitlines()
-                                                    cell['findable_items'] = ','.join(items)
-                                            damage_path = os.path.join(room_path, "Strange_occerance.txt")
-                                            if os.path.exists(damage_path):
-                                                with open(damage_path, 'r', encoding='utf-8') as f:
-                                                    cell['damage_text'] = f.read().strip()
-                                            usable_path = os.path.join(room_path, "Usable_Items.txt")
-                                            if os.path.exists(usable_path):
-                                                with open(usable_path, 'r', encoding='utf-8') as f:
-                                                    lines = f.read().splitlines()
-                                                    if len(lines) >= 3:
-                                                        cell['usable_item'] = lines[0]
-                                                        cell['item_used_text'] = lines[1]
-                                                        cell['item_found'] = lines[2]
-                                            grid_state[y][x] = cell
-                                    except ValueError:
-                                        pass
-                            floors[floor_idx] = {"grid_state": grid_state, "plus_buttons": {}}
-                        except ValueError:
-                            pass
-            if 0 not in floors:
-                floors[0] = {"grid_state": [[None for _ in range(GRID_DIM_X)] for _ in range(GRID_DIM_Y)], "plus_buttons": {}}
-                floors[0]["grid_state"][0][0] = {'name': 'Start Room', 'desc': '', 'findable_items': '', 'usable_item': '', 'item_used_text': '', 'item_found': '', 'damage_text': ''}
+            Echo_model.load_rooms(room_map, main_dir(), saver)
+            # Edits an earlier session journaled but never saved, folded into the folders right away
+            replayed = journal.replay()
+            if current_floor[0] >= room_map.floor_count:
+                current_floor[0] = 0
+            ensure_start_room()
+            if replayed:
+                queue_main_save(quiet=True)
             refresh_floor_list()
             redraw_floor()
         def check_main_rooms():
             errors = []
-            for floor_idx in sorted(floors.keys()):
-                grid_state = floors[floor_idx]["grid_state"]
-                for y in range(GRID_DIM_Y):
-                    for x in range(GRID_DIM_X):
-                        cell = grid_state[y][x]
-                        if cell is not None:
-                            fields = ['name', 'desc', 'findable_items', 'usable_item', 'item_used_text', 'item_found', 'damage_text']
-                            for field in fields:
-                                if not cell.get(field, '').strip():
-                                    errors.append(f"Main Floor {floor_idx+1} Room ({x}, {y}): {field.replace('_', ' ').title()} is missing.")
+            for key in sorted(room_map):
+                floor_idx, y, x = key
+                cell = room_map.get(key)
+                for field in Echo_model.MAIN_FIELDS:
+                    if not cell.get(field).strip():
+                        errors.append(f"Main Floor {floor_idx+1} Room ({x}, {y}): {field.replace('_', ' ').title()} is missing.")
             return errors
         load_main_level_data()
+        app.after(Echo_save.JOURNAL_COMPACT_INTERVAL * 1000, compact_main_journal)
         return save_main_level, load_main_level_data, check_main_rooms
     # Initialize the Tutorial tab (single-layer grid) so it shows content
     save_tutorial, load_tutorial_data, check_tutorial = setup_tutorial_tab(tutorial_tab, custom_font_family)
@@ -1801,7 +1648,9 @@ def setup_main_ui():
                 return
             if os_name != 'windows':
                 os.chmod(exe_path, 0o755)
-            subprocess.Popen([exe_path], cwd=os.path.dirname(exe_path))
+            # Recorded so the hub can close it before import, clear or update
+            Echo_process.launch([exe_path], "runner", cwd=os.path.dirname(exe_path),
+                                registry_dir=PROCESS_REGISTRY_DIR)
         except Exception as e:
             show_msg("Error", f"Failed to launch Test App:\n{e}", icon="cancel")
     # ---------------- Help helpers ----------------
@@ -1873,6 +1722,13 @@ def setup_main_ui():
     browse_button = ctk.CTkButton(path_frame, text="📂", width=30, fg_color="#444444", hover_color="#666666", command=browse_export_path)
     browse_button.pack(side="right")
 
+    profile_label = ctk.CTkLabel(export_container, text="Export Profile:", font=(custom_font_family, 16))
+    profile_label.pack(pady=(10,5))
+    # release leaves out debug builds, symbols, engine sources and play-testing saves; debug copies it all
+    profile_combo = ctk.CTkComboBox(export_container, values=list(Echo_export.EXPORT_PROFILES), state="readonly")
+    profile_combo.pack(pady=(0,10))
+    profile_combo.set(Echo_export.DEFAULT_PROFILE)
+
     # --- Platform selection removed ---
     # platform_label = ctk.CTkLabel(export_container, text="Platform:", font=(custom_font_family, 16))
     # platform_label.pack(pady=(10,5))
@@ -1909,6 +1765,37 @@ def setup_main_ui():
     # platform_combo.bind("<<ComboBoxSelected>>", update_instructions)
     # update_instructions()
 
+    def write_export(snapshot, progress):
+        # Runs on the writer thread once the saves queued ahead of it are on disk
+        working_game_dir, dest_dir, profile = snapshot
+        if not os.path.exists(working_game_dir):
+            raise FileNotFoundError("Working_game directory not found. Please save your work first.")
+        if os.path.exists(dest_dir):
+            shutil.rmtree(dest_dir)
+
+        summary = Echo_export.export_game_files(working_game_dir, dest_dir, profile,
+                                                progress=lambda arcname, count, total: progress(count, total))
+
+        # --- Adjust the runner logic simplified for Windows-only export ---
+        current_runner = os.path.join(dest_dir, "Echo_runner.exe" if os_name == "windows" else "Echo_runner")
+        target_runner = os.path.join(dest_dir, "Echo_runner.exe") # Always target .exe
+
+        if os.path.exists(current_runner):
+            os.rename(current_runner, target_runner)
+            # --- Linux-specific chmod logic removed ---
+            # if platform_choice == "Linux" and os_name != "windows":
+            #     os.chmod(target_runner, 0o755)
+        return summary
+
+    def export_done(snapshot, summary, error):
+        if error:
+            CTkMessagebox(title="Error", message=f"Failed to export game:\n{error}", icon="cancel")
+            return
+        print("[Echo Editor] Export:")
+        print(Echo_export.format_export_report(summary))
+        CTkMessagebox(title="Success", icon="check", width=520,
+                      message=f"Game exported successfully to:\n{snapshot[1]}\n\n{Echo_export.format_export_report(summary)}")
+
     def export_game():
         export_path = export_path_entry.get().strip()
         if not export_path:
@@ -1923,38 +1810,14 @@ def setup_main_ui():
             CTkMessagebox(title="Validation Error", message="\n".join(errors), icon="cancel")
             return
 
-        save_game_setup()
-        save_tutorial()
-        save_main_level()
-
-        try:
-            script_dir = save_base_path
-            working_game_dir = os.path.join(script_dir, "..", "Working_game")
-            if not os.path.exists(working_game_dir):
-                CTkMessagebox(title="Error", message="Working_game directory not found. Please save your work first.", icon="cancel")
-                return
-
-            dest_dir = os.path.join(export_path, "Echo_Game_Export")
-            if os.path.exists(dest_dir):
-                progress_bar = ctk.CTkProgressBar(export_container, mode="indeterminate", width=300)
-                progress_bar.pack(pady=(10,10))
-                shutil.rmtree(dest_dir)
-
-            shutil.copytree(working_game_dir, dest_dir)
-
-            # --- Adjust the runner logic simplified for Windows-only export ---
-            current_runner = os.path.join(dest_dir, "Echo_runner.exe" if os_name == "windows" else "Echo_runner")
-            target_runner = os.path.join(dest_dir, "Echo_runner.exe") # Always target .exe
-
-            if os.path.exists(current_runner):
-                os.rename(current_runner, target_runner)
-                # --- Linux-specific chmod logic removed ---
-                # if platform_choice == "Linux" and os_name != "windows":
-                #     os.chmod(target_runner, 0o755)
-
-            CTkMessagebox(title="Success", message=f"Game exported successfully to:\n{dest_dir}", icon="check")
-        except Exception as e:
-            CTkMessagebox(title="Error", message=f"Failed to export game:\n{e}", icon="cancel")
+        # Queued in order on the writer thread, the export only runs if all three saves succeed
+        save_game_setup(quiet=True)
+        save_tutorial(quiet=True)
+        save_main_level(quiet=True)
+        working_game_dir = os.path.join(save_base_path, "..", "Working_game")
+        dest_dir = os.path.join(export_path, "Echo_Game_Export")
+        save_queue.submit("export", "export", (working_game_dir, dest_dir, profile_combo.get()), write_export,
+                          export_done, requires=("setup", "tutorial", "main"))
 
     export_button = ctk.CTkButton(export_container, text="Export Game", font=(custom_font_family, 16),
                                 fg_color=SAVE_COLOR, hover_color=SAVE_HOVER, text_color="black", command=export_game)
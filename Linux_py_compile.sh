@@ -11,6 +11,7 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" &> /dev/null && pwd)"
 COMPILE_ECHO_HUB="YES"
 COMPILE_ASCII="YES"
 COMPILE_EDITOR="YES"
+COMPILE_CLI="YES"
 
 # Main Directories
 OUTPUT_DIR="$SCRIPT_DIR/dist"
@@ -46,6 +47,9 @@ ASCII_BUILD_NAME="Ascii_generator"
 EDITOR_SCRIPT="Engine_editor/Echo_editor.py"
 EDITOR_BUILD_NAME="Echo_editor"
 
+CLI_SCRIPT="Echo_cli.py"
+CLI_BUILD_NAME="echo-hub"
+
 # --- Hidden Imports (CRITICAL for CustomTkinter/Pillow) ---
 # Explicitly including modules that PyInstaller often misses when linking PIL/tkinter
 # and core parts of customtkinter to prevent runtime ModuleNotFoundError.
@@ -220,6 +224,7 @@ if [ "$COMPILE_EDITOR" = "YES" ]; then
         --icon \""$EDITOR_ICON_PNG"\" \
         --clean \
         $HIDDEN_IMPORT_ARGS \
+        --paths \""$SCRIPT_DIR"\" \
         --add-data=\"$DATA_1\" \
         --add-data=\"$DATA_2\" \
         "$EDITOR_EXTRA_ARGS" \
@@ -243,6 +248,36 @@ else
     echo "--- Skipping Echo Editor (toggle not set to YES) ---"
 fi
 
+# --- 4. Compile Echo CLI ---
+if [ "$COMPILE_CLI" = "YES" ]; then
+    echo
+    echo "---------------------------------"
+    echo "Compiling $CLI_SCRIPT..."
+    echo "---------------------------------"
+
+    # Headless: console build, no icon or Tk data files
+    pyinstaller --noconfirm --onefile --console \
+        --name "$CLI_BUILD_NAME" \
+        --clean \
+        --distpath "$OUTPUT_DIR" \
+        --workpath "$LOG_DIR/build/$CLI_BUILD_NAME" \
+        --specpath "$LOG_DIR" \
+        "$SCRIPT_DIR/$CLI_SCRIPT"
+
+    if [ $? -ne 0 ]; then
+        echo -e "\n\n\342\226\210\342\226\210\342\226\210 ERROR: Failed to compile $CLI_SCRIPT$. See output above. \342\226\210\342\226\210\342\226\210"
+        exit 1
+    fi
+    echo "Successfully compiled $CLI_SCRIPT -> $OUTPUT_DIR"
+    if [ -f "$OUTPUT_DIR/$CLI_BUILD_NAME" ]; then
+        chmod +x "$OUTPUT_DIR/$CLI_BUILD_NAME"
+        echo "Set executable permission on $OUTPUT_DIR/$CLI_BUILD_NAME"
+    fi
+else
+    echo
+    echo "--- Skipping Echo CLI (toggle not set to YES) ---"
+fi
+
 # ===================================================================
 # ========================== FINAL CLEANUP ==========================
 # ===================================================================
@@ -259,6 +294,7 @@ echo "Build Toggles:"
 echo "  - Echo Hub:   [$COMPILE_ECHO_HUB]"
 echo "  - Ascii Gen:  [$COMPILE_ASCII]"
 echo "  - Echo Editor: [$COMPILE_EDITOR]"
+echo "  - Echo CLI:    [$COMPILE_CLI]"
 echo
 echo "Executables: $OUTPUT_DIR"
 echo "Logs and temporary build files: $LOG_DIR"
@@ -15,6 +15,7 @@ REM   Set to "YES" to compile, any other value to skip
 set "COMPILE_ECHO_HUB=YES"
 set "COMPILE_ASCII=YES"
 set "COMPILE_EDITOR=YES"
+set "COMPILE_CLI=YES"
 
 REM  Main Directories 
 set "OUTPUT_DIR=%SCRIPT_DIR%\dist"
@@ -44,6 +45,10 @@ set "EDITOR_BUILD_NAME=Echo_editor"
     set "EDITOR_DATA_3=%SCRIPT_DIR%\Engine_editor\Fonts;Fonts"
     set "EDITOR_DATA_4="
 
+REM  Script 4: Echo CLI (headless, console window) 
+set "CLI_SCRIPT=Echo_cli.py"
+set "CLI_BUILD_NAME=echo-hub"
+
 REM  Shared Data Files 
 REM   These will be added to ALL compiled executables.
 REM *** FIX: Using simple destination folders (e.g., Icons) ***
@@ -153,6 +158,7 @@ if /I "%COMPILE_EDITOR%" == "YES" (
     pyinstaller --noconfirm --onefile --windowed ^
         --icon "%EDITOR_ICON%" ^
         --clean ^
+        --paths "%SCRIPT_DIR%" ^
         --add-data "%DATA_1%" ^
         --add-data "%DATA_2%" ^
         !EDITOR_EXTRA_ARGS! ^
@@ -174,6 +180,33 @@ if /I "%COMPILE_EDITOR%" == "YES" (
     echo  Skipping Echo Editor (toggle not set to YES) 
 )
 
+REM  4. Compile Echo CLI 
+if /I "%COMPILE_CLI%" == "YES" (
+    echo.
+    echo 
+    echo Compiling %CLI_SCRIPT%...
+    echo 
+    pyinstaller --noconfirm --onefile --console ^
+        --name "%CLI_BUILD_NAME%" ^
+        --clean ^
+        --distpath "%OUTPUT_DIR%" ^
+        --workpath "%LOG_DIR%\build\%CLI_BUILD_NAME%" ^
+        --specpath "%LOG_DIR%" ^
+        "%SCRIPT_DIR%\%CLI_SCRIPT%"
+
+    REM Check for failure
+    if %errorlevel% neq 0 (
+        echo.
+        echo ▩▩▩ ERROR: Failed to compile %CLI_SCRIPT%. See output above. ▩▩▩
+        pause
+        goto :eof
+    )
+    echo Successfully compiled %CLI_SCRIPT% -> %OUTPUT_DIR%
+) else (
+    echo.
+    echo  Skipping Echo CLI (toggle not set to YES) 
+)
+
 REM  Final 
 echo.
 echo ===============================
@@ -183,6 +216,7 @@ echo Build Toggles:
 echo   - Echo Hub:   [%COMPILE_ECHO_HUB%]
 echo   - Ascii Gen:  [%COMPILE_ASCII%]
 echo   - Echo Editor: [%COMPILE_EDITOR%]
+echo   - Echo CLI:    [%COMPILE_CLI%]
 echo.
 echo Executables: %OUTPUT_DIR%
 echo Logs and temporary build files: %LOG_DIR%
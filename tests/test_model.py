@@ -0,0 +1,56 @@
+# Jack Murray
+# Nova Foundry / Echo Model tests
+# v1.4.0
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Echo_model
+
+# ---------- CONFIG ----------
+SEEDS = range(20)
+GRID_SIZE = 7  # Rooms per side of a floor
+FLOORS = 3
+FILL = 0.55  # Chance of a room in each cell
+
+def random_map(rng, vertical):
+    room_map = Echo_model.RoomMap(vertical=vertical)
+    room_map.add_room(Echo_model.START_ROOM)
+    for f in range(FLOORS if vertical else 1):
+        for y in range(-GRID_SIZE // 2, GRID_SIZE // 2 + 1):
+            for x in range(-GRID_SIZE // 2, GRID_SIZE // 2 + 1):
+                if rng.random() < FILL:
+                    room_map.add_room((f, y, x))
+    return room_map
+
+def oracle(room_map):
+    return {key for key in room_map if Echo_model.can_remove(room_map, key)}
+
+class RemovabilityTest(unittest.TestCase):
+    def test_removable_rooms_matches_can_remove(self):
+        for vertical in (False, True):
+            for seed in SEEDS:
+                with self.subTest(vertical=vertical, seed=seed):
+                    room_map = random_map(random.Random(seed), vertical)
+                    self.assertEqual(Echo_model.removable_rooms(room_map), oracle(room_map))
+
+    def test_removability_tracks_edits(self):
+        for seed in SEEDS:
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                room_map = random_map(rng, True)
+                removability = Echo_model.Removability(room_map)
+                for _ in range(30):
+                    key = (rng.randrange(FLOORS), rng.randint(-GRID_SIZE // 2, GRID_SIZE // 2),
+                           rng.randint(-GRID_SIZE // 2, GRID_SIZE // 2))
+                    if key in room_map:
+                        room_map.remove_room(key)
+                    else:
+                        room_map.add_room(key)
+                    self.assertEqual(removability.rooms(), oracle(room_map))
+
+if __name__ == "__main__":
+    unittest.main()
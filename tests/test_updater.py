@@ -0,0 +1,202 @@
+# Jack Murray
+# Nova Foundry / Echo Updater tests
+# v1.4.0
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+import unittest
+import http.server
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Echo_updater
+
+# ---------- CONFIG ----------
+BODY = bytes(range(256)) * 400  # 100 KiB, several chunks
+CHUNK_SIZE = 8 * 1024
+ETAG = '"v2"'
+RELEASE_PATH = "/releases/latest"
+RELEASE = {"name": "Release 4", "assets": []}
+
+# ---------- Test Server ----------
+class Handler(http.server.BaseHTTPRequestHandler):
+    """Serves BODY with Range and If-Range support; the server's mode breaks it on purpose:
+      "drop"          the first response stops halfway and closes the connection
+      "ignore-range"  every response is a plain 200 with the whole body
+      "corrupt-first" the first response has one byte flipped
+    RELEASE_PATH answers with RELEASE, or 304 when If-None-Match carries the ETag.
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        if self.path == RELEASE_PATH:
+            return self.send_release()
+        server.requests.append(dict(self.headers))
+        first = len(server.requests) == 1
+        body = server.body
+        if server.mode == "corrupt-first" and first:
+            body = bytes([body[0] ^ 0xFF]) + body[1:]
+        start = 0
+        byte_range = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if server.mode != "ignore-range" and byte_range and if_range in (None, server.etag):
+            start = int(byte_range[len("bytes="):].rstrip("-"))
+        self.send_response(206 if start else 200)
+        if start:
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        self.send_header("Content-Length", str(len(body) - start))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        if server.mode == "drop" and first:
+            self.wfile.write(body[start:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body[start:])
+
+    def send_release(self):
+        server = self.server
+        server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == server.etag:
+            self.send_response(304)
+            self.send_header("ETag", server.etag)
+            self.end_headers()
+            return
+        body = json.dumps(RELEASE).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", server.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+class Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, mode=None, body=BODY, etag=ETAG):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.mode = mode
+        self.body = body
+        self.etag = etag
+        self.requests = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def url(self, path="/Echo_setup.exe"):
+        return f"http://127.0.0.1:{self.server_port}{path}"
+
+# ---------- Tests ----------
+class DownloadTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.dest = os.path.join(self.dir, "Echo_setup.exe")
+        self.sha256 = hashlib.sha256(BODY).hexdigest()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def serve(self, mode=None):
+        server = Server(mode)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def download(self, server, sha256=None):
+        return Echo_updater.download_file(server.url(), self.dest, sha256=sha256 or self.sha256,
+                                          chunk_size=CHUNK_SIZE, retry_delay=0)
+
+    def assert_downloaded(self):
+        with open(self.dest, "rb") as f:
+            self.assertEqual(f.read(), BODY)
+        self.assertEqual(os.listdir(self.dir), ["Echo_setup.exe"])
+
+    def leave_part(self, server, data, validator):
+        with open(self.dest + ".part", "wb") as f:
+            f.write(data)
+        Echo_updater.Echo_archive.write_json_atomic(self.dest + ".part.json",
+                                                    {"url": server.url(), "validator": validator})
+
+    def test_resumes_after_a_dropped_connection(self):
+        server = self.serve("drop")
+        self.download(server)
+        self.assert_downloaded()
+        self.assertEqual(len(server.requests), 2)
+        self.assertNotIn("Range", server.requests[0])
+        self.assertTrue(server.requests[1]["Range"].startswith("bytes="))
+        self.assertEqual(server.requests[1]["If-Range"], ETAG)
+
+    def test_server_ignoring_range_starts_over(self):
+        server = self.serve("ignore-range")
+        self.leave_part(server, BODY[:1000], ETAG)
+        self.download(server)
+        self.assert_downloaded()
+        self.assertEqual(server.requests[0]["Range"], "bytes=1000-")
+
+    def test_changed_file_is_fetched_whole(self):
+        server = self.serve()
+        self.leave_part(server, b"older release" * 100, '"v1"')
+        self.download(server)
+        self.assert_downloaded()
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(server.requests[0]["If-Range"], '"v1"')
+
+    def test_part_from_another_url_is_not_resumed(self):
+        server = self.serve()
+        with open(self.dest + ".part", "wb") as f:
+            f.write(b"older release" * 100)
+        self.download(server)
+        self.assert_downloaded()
+        self.assertNotIn("Range", server.requests[0])
+
+    def test_corrupt_first_response_is_downloaded_again(self):
+        server = self.serve("corrupt-first")
+        self.download(server)
+        self.assert_downloaded()
+        self.assertEqual(len(server.requests), 2)
+        self.assertNotIn("Range", server.requests[1])
+
+    def test_checksum_mismatch_raises_after_one_retry(self):
+        server = self.serve()
+        with self.assertRaises(ValueError):
+            self.download(server, sha256="0" * 64)
+        self.assertEqual(len(server.requests), 2)
+        self.assertEqual(os.listdir(self.dir), [])
+
+class ReleaseCheckTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache_path = os.path.join(self.dir, "Update_check.json")
+        self.server = Server()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = self.server.url(RELEASE_PATH)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def fetch(self, now):
+        return Echo_updater.fetch_latest_release(self.url, self.cache_path, ttl=60, now=now)
+
+    def test_cache_inside_ttl_makes_no_request(self):
+        self.assertEqual(self.fetch(1000), (RELEASE, "network"))
+        self.assertEqual(self.fetch(1059), (RELEASE, "cache"))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_stale_cache_revalidates_with_etag(self):
+        self.fetch(1000)
+        self.assertEqual(self.fetch(1100), (RELEASE, "not-modified"))
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertNotIn("If-None-Match", self.server.requests[0])
+        self.assertEqual(self.server.requests[1]["If-None-Match"], ETAG)
+        # The 304 refreshed the cache, so the next call inside the ttl stays offline
+        self.assertEqual(self.fetch(1150), (RELEASE, "cache"))
+        self.assertEqual(len(self.server.requests), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+# Jack Murray
+# Nova Foundry / Echo Workspace tests
+# v1.4.0
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Echo_workspace
+
+# ---------- CONFIG ----------
+MARKER = "Workspace.txt"  # Names the workspace a folder holds
+
+class Crash(BaseException):
+    """Stops the switch like a killed process, past its except OSError rollback."""
+
+def fill(path, name):
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, MARKER), "w", encoding="utf-8") as f:
+        f.write(name)
+
+def holds(path):
+    try:
+        with open(os.path.join(path, MARKER), "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+class SwitchCrashTest(unittest.TestCase):
+    def setUp(self):
+        self.old_cwd = os.getcwd()
+        self.root = tempfile.mkdtemp()
+        os.chdir(self.root)
+        self.cache_dir = os.path.join(self.root, "Cache")
+
+    def tearDown(self):
+        os.chdir(self.old_cwd)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def reset(self, working_game):
+        for path in (Echo_workspace.WORKSPACE_ROOT, Echo_workspace.WORKSPACES_DIR):
+            shutil.rmtree(path, ignore_errors=True)
+        if working_game:
+            fill(Echo_workspace.WORKSPACE_ROOT, "Default")
+        fill(Echo_workspace.parked_path("Other"), "Other")
+
+    def switch_crashing_at(self, step):
+        """Runs switch_workspace("Other") and crashes before its step-th rename, makedirs or
+        pointer write. Returns True if the switch got through without reaching step."""
+        calls = [0]
+        def crash_on_step(fn):
+            def wrapper(*args, **kwargs):
+                calls[0] += 1
+                if calls[0] == step:
+                    raise Crash()
+                return fn(*args, **kwargs)
+            return wrapper
+        with mock.patch.object(Echo_workspace, "write_pointer", crash_on_step(Echo_workspace.write_pointer)), \
+             mock.patch.object(Echo_workspace.os, "rename", crash_on_step(os.rename)), \
+             mock.patch.object(Echo_workspace.os, "makedirs", crash_on_step(os.makedirs)):
+            try:
+                Echo_workspace.switch_workspace("Other", cache_dir=self.cache_dir)
+            except Crash:
+                return False
+        return True
+
+    def assert_consistent(self, working_game):
+        active = Echo_workspace.get_active()
+        # A crash before the first pointer write leaves none, which reads as the default
+        self.assertIn(Echo_workspace.read_pointer(), ([active], [] if active == Echo_workspace.DEFAULT_WORKSPACE else None))
+        self.assertIn(active, ("Default", "Other"))
+        parked = "Default" if active == "Other" else "Other"
+        if active == "Other" or working_game:
+            self.assertEqual(holds(Echo_workspace.WORKSPACE_ROOT), active)
+        else:
+            self.assertIsNone(holds(Echo_workspace.WORKSPACE_ROOT))
+        if parked == "Other" or working_game:
+            self.assertEqual(holds(Echo_workspace.parked_path(parked)), parked)
+        self.assertEqual(Echo_workspace.list_workspaces()[0], active)
+
+    def test_recovers_from_a_crash_at_every_step(self):
+        for working_game in (True, False):
+            step = 1
+            while True:
+                with self.subTest(working_game=working_game, step=step):
+                    self.reset(working_game)
+                    finished = self.switch_crashing_at(step)
+                    self.assert_consistent(working_game)
+                if finished:
+                    self.assertEqual(Echo_workspace.get_active(), "Other")
+                    break
+                step += 1
+            self.assertGreater(step, 3)
+
+if __name__ == "__main__":
+    unittest.main()